@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+
+from examples.precision_benchmark import get_benchmark_chain, get_wide_table_data
+from fedot.core.data.data import InputData, train_test_data_setup
+
+
+def measure_latency(predict_func, data: InputData, repeats: int) -> float:
+    """
+    Measures the mean latency of the prediction
+
+    :return: mean time of the single call (ms)
+    """
+    predict_func(data)
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        predict_func(data)
+    return (time.perf_counter() - start_time) / repeats * 1000
+
+
+def run_inference_latency_benchmark(samples_amount: int = 2000, features_amount: int = 50,
+                                    batch_sizes=(1, 32), repeats: int = 50):
+    """
+    Compares the latency of the prediction of fitted chain and the compiled one
+    on the single rows and the small batches
+
+    :return: dict with the mean latencies (ms) of chain and compiled chain for each batch size
+    """
+    data = get_wide_table_data(samples_amount, features_amount)
+    train_data, test_data = train_test_data_setup(data)
+    chain = get_benchmark_chain()
+    chain.fit(input_data=train_data, use_cache=False)
+    compiled_chain = chain.compile()
+
+    results = {}
+    for batch_size in batch_sizes:
+        batch = test_data.subset(0, batch_size - 1)
+        assert np.allclose(chain.predict(batch).predict, compiled_chain.predict(batch).predict)
+        results[batch_size] = (measure_latency(chain.predict, batch, repeats),
+                               measure_latency(compiled_chain.predict, batch, repeats))
+
+    for batch_size, (chain_latency, compiled_latency) in results.items():
+        print(f'Batch of {batch_size} rows: chain {round(chain_latency, 2)} ms, '
+              f'compiled chain {round(compiled_latency, 2)} ms, '
+              f'speedup {round(chain_latency / compiled_latency, 2)}')
+    return results
+
+
+if __name__ == '__main__':
+    run_inference_latency_benchmark()
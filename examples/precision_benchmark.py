@@ -0,0 +1,78 @@
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.metrics import roc_auc_score as roc_auc
+
+from fedot.core.chains.chain import Chain
+from fedot.core.chains.node import PrimaryNode, SecondaryNode
+from fedot.core.data.data import InputData, train_test_data_setup
+from fedot.core.repository.dataset_types import DataTypesEnum
+from fedot.core.repository.tasks import Task, TaskTypesEnum
+from fedot.utilities.synthetic.data import classification_dataset
+
+
+def get_wide_table_data(samples_amount: int = 10000, features_amount: int = 300) -> InputData:
+    options = {
+        'informative': 20,
+        'redundant': 0,
+        'repeated': 0,
+        'clusters_per_class': 1
+    }
+    features, target = classification_dataset(samples_amount=samples_amount,
+                                              features_amount=features_amount,
+                                              classes_amount=2,
+                                              features_options=options)
+    return InputData(idx=np.arange(0, samples_amount), features=features, target=target,
+                     task=Task(TaskTypesEnum.classification),
+                     data_type=DataTypesEnum.table)
+
+
+def get_benchmark_chain():
+    first = PrimaryNode(model_type='logit')
+    second = PrimaryNode(model_type='lda')
+    final = SecondaryNode(model_type='rf',
+                          nodes_from=[first, second])
+    return Chain(final)
+
+
+def run_chain_with_precision(data: InputData, precision=None):
+    """
+    Fits and applies the benchmark chain with the features of required floating-point type
+
+    :return: tuple of ROC AUC on test sample, fit and predict time (sec) and peak memory usage (MB)
+    """
+    data = data.with_precision(precision)
+    train_data, test_data = train_test_data_setup(data)
+    chain = get_benchmark_chain()
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    chain.fit(input_data=train_data, use_cache=False)
+    predicted = chain.predict(test_data)
+    spent_time = time.perf_counter() - start_time
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    roc_auc_value = roc_auc(y_true=test_data.target, y_score=predicted.predict)
+    return roc_auc_value, spent_time, peak_memory / 1024 ** 2
+
+
+def run_precision_benchmark(samples_amount: int = 10000, features_amount: int = 300):
+    data = get_wide_table_data(samples_amount, features_amount)
+
+    results = {}
+    for precision in [np.float64, np.float32]:
+        results[precision.__name__] = run_chain_with_precision(data, precision)
+
+    for precision_name, (roc_auc_value, spent_time, peak_memory) in results.items():
+        print(f'{precision_name}: ROC AUC {round(roc_auc_value, 4)}, '
+              f'time {round(spent_time, 2)} sec, peak memory {round(peak_memory, 1)} MB')
+
+    metric_drift = abs(results['float64'][0] - results['float32'][0])
+    print(f'Metric drift: {metric_drift}')
+    return results
+
+
+if __name__ == '__main__':
+    run_precision_benchmark()
@@ -0,0 +1,62 @@
+from typing import Optional
+
+import numpy as np
+
+
+class TsHistoryBuffer:
+    """
+    Preallocated buffer with the history of time series (or exogenous variables) used for the forecasting.
+    If the capacity is defined, the buffer works as the ring buffer that keeps the last capacity values only.
+    The values are written twice (to the position and to the position + capacity),
+    so the actual window is always available as the contiguous view without copying.
+    Otherwise, the buffer is growing up to the max_len values
+
+    :param initial_values: initial history (1d or 2d array with variables in columns)
+    :param capacity: number of the last values to keep or None to keep all values
+    :param max_len: max number of values in the buffer (required if the capacity is not defined)
+    :param dtype: type of the values
+    """
+
+    def __init__(self, initial_values: np.array, capacity: Optional[int] = None,
+                 max_len: Optional[int] = None, dtype=np.float64):
+        initial_values = np.asarray(initial_values)
+        self.capacity = capacity
+        if capacity is not None:
+            storage_len = 2 * capacity
+        else:
+            if max_len is None:
+                raise ValueError('Max length of the buffer without capacity should be defined')
+            storage_len = max_len
+        self._storage = np.empty((storage_len, *initial_values.shape[1:]), dtype=dtype)
+        self._end = 0
+        self._len = 0
+        self.extend(initial_values)
+
+    def extend(self, new_values: np.array):
+        new_values = np.asarray(new_values)
+        if self.capacity is None:
+            if self._end + len(new_values) > len(self._storage):
+                raise ValueError('Buffer overflow')
+            self._storage[self._end:self._end + len(new_values)] = new_values
+            self._end += len(new_values)
+            self._len = self._end
+            return
+
+        # only the last values can be kept
+        new_values = new_values[-self.capacity:]
+        positions = (self._end + np.arange(len(new_values))) % self.capacity
+        self._storage[positions] = new_values
+        self._storage[positions + self.capacity] = new_values
+        self._end = (self._end + len(new_values)) % self.capacity
+        self._len = min(self._len + len(new_values), self.capacity)
+
+    @property
+    def values(self) -> np.array:
+        """ The view of the actual history (the oldest value first) """
+        if self.capacity is None:
+            return self._storage[:self._end]
+        start = self._end + self.capacity - self._len
+        return self._storage[start:start + self._len]
+
+    def __len__(self):
+        return self._len
@@ -2,6 +2,81 @@ from copy import copy
 from typing import List
 
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+
+def lagged_windows(buffer: np.array, rows_num: int, window_len: int) -> np.array:
+    """
+    Returns the read-only view of the buffer with sliding windows as rows:
+    row i contains buffer[i:i + window_len]
+
+    :param buffer: 1d contiguous array
+    :param rows_num: number of windows
+    :param window_len: length of window
+    """
+    if len(buffer) < rows_num + window_len - 1:
+        raise ValueError('Buffer is too short for the required windows')
+    stride = buffer.strides[0]
+    return as_strided(buffer, shape=(rows_num, window_len), strides=(stride, stride), writeable=False)
+
+
+def lagged_features_and_target(target: np.array, window_len: int, forecast_length: int,
+                               dtype=np.float64):
+    """
+    Builds the lagged features and the multi-step target using single buffer.
+    Both arrays have len(target) + 1 rows (the last row is devoted to the future prediction),
+    the features contain lag_1 ... lag_{window_len} of target and
+    the target contains the values for the steps 0 ... forecast_length - 1 ahead
+
+    :return: read-only views of the buffer for features and target
+    """
+    rows_num = len(target) + 1
+    buffer = np.full(window_len + len(target) + forecast_length, np.nan, dtype=dtype)
+    buffer[window_len:window_len + len(target)] = target
+
+    # row i contains the lags from the window_len-th to the first
+    features = lagged_windows(buffer, rows_num, window_len)[:, ::-1]
+    multistep_target = lagged_windows(buffer[window_len:], rows_num, forecast_length)
+    return features, multistep_target
+
+
+def lagged_table(variables: np.array, window_len: int, dtype=np.float64) -> np.array:
+    """
+    Builds the lagged table for the several variables (e.g. target and exogenous features) with
+    len(variables) + 1 rows and lag_1 ... lag_{window_len} for each variable in columns.
+    The table is allocated once and filled by the sliding windows
+
+    :param variables: 2d array with variables in columns
+    """
+    rows_num, variables_num = variables.shape
+    rows_num += 1
+    table = np.empty((rows_num, window_len * variables_num), dtype=dtype)
+
+    buffer = np.full(window_len + rows_num - 1, np.nan, dtype=dtype)
+    for variable_id in range(variables_num):
+        buffer[window_len:] = variables[:, variable_id]
+        table[:, variable_id * window_len:(variable_id + 1) * window_len] = \
+            lagged_windows(buffer, rows_num, window_len)[:, ::-1]
+    return table
+
+
+def panel_lagged_rows(history: np.array, window_len: int, rows_num: int) -> np.array:
+    """
+    Builds the last complete rows of the lagged tables for the panel of time series at once
+
+    :param history: 2d array with the time series in columns
+    :param window_len: length of window
+    :param rows_num: number of the last rows of the lagged table for each series
+    :return: 2d array with rows_num rows for each series (lag_1 ... lag_{window_len} in columns)
+    """
+    history_len, series_num = history.shape
+    first_value = history_len - window_len - rows_num + 1
+    if first_value < 0:
+        raise ValueError('History is too short for the required rows')
+    time_stride, series_stride = history.strides
+    windows = as_strided(history[first_value:], shape=(series_num, rows_num, window_len),
+                         strides=(series_stride, time_stride, time_stride), writeable=False)
+    return windows[:, :, ::-1].reshape(series_num * rows_num, window_len)
 
 
 def prepare_lagged_ts_for_prediction(data: 'InputData', is_for_fit: bool = True):
@@ -27,43 +102,39 @@ def _clean_nans_in_lagged_features(data: 'InputData', criteria: List[str]):
 
     data_to_clean = copy(data)
 
-    for criterion in criteria:
+    datasets_for_criterion = {
+        'features': data_to_clean.features,
+        'target': data_to_clean.target,
+        'idx': data_to_clean.idx
+    }
 
-        datasets_for_criterion = {
-            'features': data_to_clean.features,
-            'target': data_to_clean.target,
-            'idx': data_to_clean.idx
-        }
+    rows_with_nans = None
+    for criterion in criteria:
         array_with_nans = datasets_for_criterion[criterion]
-
-        if array_with_nans is not None:
-            nans = np.isnan(array_with_nans)
-            idx = data_to_clean.idx
-            features = data_to_clean.features
-            target = data_to_clean.target
-
-            # TODO try to simplify the 1D/2D logic
-            # remove all rows with nan in array_with_nans
-            if len(array_with_nans.shape) == 1:
-                if not nans.any():
-                    # if there is no nans at all, go to next criterion
-                    continue
-
-                idx = idx[~nans[0:len(idx)]]
-                features = features[~nans[0:len(features)]] if data.features is not None else features
-                target = target[~nans[0:len(target)]] if data.target is not None else target
-            elif len(array_with_nans.shape) == 2:
-                if not nans.any().any():
-                    # if there is no nans at all, go to next criterion
-                    continue
-                idx = idx[~nans.any(axis=1)[0:len(idx)]]
-                features = features[~nans.any(axis=1)[0:len(features)]] if features is not None else features
-                target = target[~nans.any(axis=1)[0:len(target)]] if target is not None else target
-            else:
-                raise NotImplementedError('Dimensionality not supported')
-
-            data_to_clean.idx = idx
-            data_to_clean.features = features
-            data_to_clean.target = target
+        if array_with_nans is None:
+            continue
+
+        nans = np.isnan(array_with_nans)
+        if len(nans.shape) == 2:
+            nans = nans.any(axis=1)
+        elif len(nans.shape) != 1:
+            raise NotImplementedError('Dimensionality not supported')
+
+        if rows_with_nans is None:
+            rows_with_nans = nans
+        else:
+            common_len = min(len(rows_with_nans), len(nans))
+            rows_with_nans = rows_with_nans[:common_len] | nans[:common_len]
+
+    if rows_with_nans is None or not rows_with_nans.any():
+        # if there is no nans at all
+        return data_to_clean
+
+    rows_to_keep = ~rows_with_nans
+    data_to_clean.idx = np.asarray(data_to_clean.idx)[rows_to_keep[0:len(data_to_clean.idx)]]
+    if data_to_clean.features is not None:
+        data_to_clean.features = data_to_clean.features[rows_to_keep[0:len(data_to_clean.features)]]
+    if data_to_clean.target is not None:
+        data_to_clean.target = data_to_clean.target[rows_to_keep[0:len(data_to_clean.target)]]
 
     return data_to_clean
@@ -1,10 +1,75 @@
+import zlib
+from collections import OrderedDict
+from typing import Callable
+
 import numpy as np
 from scipy import signal
-from statsmodels.tsa.seasonal import seasonal_decompose
 
 from fedot.core.data.data import InputData
 
 
+class TsDecompositionCache:
+    """
+    Cache of the period estimations and the trends of the seasonal decomposition of time series
+    shared between the nodes (e.g. trend and residual models of the same chain).
+    The results are keyed by the fingerprint of series. If the series is the extension of the
+    cached one (e.g. during the forecasting), only the trend for the tail of the series is recalculated.
+    The number of stored results of each kind is limited by max_size, the cache is cleared by GPComposer
+    at the start and the end of the composition run
+    """
+    _periods = OrderedDict()
+    _trends = OrderedDict()
+    max_size = 8
+
+    def period(self, variable: np.array) -> int:
+        variable = np.asarray(variable)
+        return self._cached(TsDecompositionCache._periods, _series_fingerprint(variable), variable,
+                            lambda: _estimate_period(variable))
+
+    def trend(self, target: np.array, period: int) -> np.array:
+        target = np.asarray(target)
+
+        def calculate_trend():
+            trend = self._extended_trend(target, period)
+            if trend is None:
+                trend = _decomposition_trend(target, period)
+            trend.setflags(write=False)
+            return trend
+
+        return self._cached(TsDecompositionCache._trends, (_series_fingerprint(target), period), target,
+                            calculate_trend)
+
+    def clear(self):
+        TsDecompositionCache._periods.clear()
+        TsDecompositionCache._trends.clear()
+
+    def _extended_trend(self, target: np.array, period: int):
+        """ Recalculates the tail of the cached trend if the target is the extension of the cached series """
+        # the margin covers the filter window and the points used for the trend extrapolation at the end
+        margin = 2 * period + 2
+        for (_, cached_period), (cached_target, cached_trend) in reversed(TsDecompositionCache._trends.items()):
+            if (cached_period != period or len(cached_target) <= margin or
+                    len(cached_target) >= len(target) or
+                    not np.array_equal(cached_target, target[:len(cached_target)])):
+                continue
+            tail_start = len(cached_target) - margin
+            tail_trend = _decomposition_trend(target[tail_start:], period)
+            # the beginning of the tail trend is extrapolated, so it is taken from the cached trend
+            return np.concatenate((cached_trend[:tail_start + period], tail_trend[period:]))
+        return None
+
+    def _cached(self, storage: OrderedDict, key, series: np.array, calculate: Callable):
+        # the fingerprint is fast but not collision-free, so the series is compared with the stored one
+        if key in storage and np.array_equal(storage[key][0], series):
+            storage.move_to_end(key)
+        else:
+            # the copy of series is stored to check the extensions of the series
+            storage[key] = (series.copy(), calculate())
+            while len(storage) > TsDecompositionCache.max_size:
+                storage.popitem(last=False)
+        return storage[key][1]
+
+
 def split_ts_to_components(trained_model, predict_data: InputData):
     """
     :param trained_model: in this case it is the value of period obtained during fitting
@@ -17,13 +82,61 @@ def split_ts_to_components(trained_model, predict_data: InputData):
 
     period = _estimate_max_possible_period(period, target)
 
-    decomposed_target = seasonal_decompose(target, period=period, extrapolate_trend='freq')
-    trend = decomposed_target.trend
+    trend = TsDecompositionCache().trend(target, period)
     residual = predict_data.target - trend
 
     return trend, residual
 
 
+def _decomposition_trend(target: np.array, period: int) -> np.array:
+    """
+    Obtains the trend in the same way as the additive seasonal_decompose with extrapolate_trend='freq'
+    without the calculation of seasonal component
+    """
+    target = np.asarray(target, dtype=np.float64)
+    if np.isnan(target).any():
+        raise ValueError('This function does not handle missing values')
+    if len(target) < 2 * period:
+        raise ValueError(f'x must have 2 complete cycles requires {2 * period} observations. '
+                         f'x only has {len(target)} observation(s)')
+
+    if period % 2 == 0:
+        # split weights at ends
+        trend_filter = np.array([0.5] + [1] * (period - 1) + [0.5]) / period
+    else:
+        trend_filter = np.repeat(1.0 / period, period)
+
+    # centered moving average
+    half_len = len(trend_filter) // 2
+    trend = np.full(len(target), np.nan)
+    trend[half_len:len(target) - (len(trend_filter) - half_len - 1)] = \
+        np.convolve(target, trend_filter, mode='valid')
+
+    return _extrapolate_trend(trend, points_num=period)
+
+
+def _extrapolate_trend(trend: np.array, points_num: int) -> np.array:
+    """ Replaces NaNs at the ends of trend with the linear extrapolation of the closest points_num values """
+    is_defined = ~np.isnan(trend)
+    front = np.argmax(is_defined)
+    back = len(trend) - 1 - np.argmax(is_defined[::-1])
+
+    front_last = min(front + points_num, back)
+    back_first = max(front, back - points_num)
+
+    slope, intercept = np.polyfit(np.arange(front, front_last), trend[front:front_last], 1)
+    trend[:front] = np.arange(0, front) * slope + intercept
+
+    slope, intercept = np.polyfit(np.arange(back_first, back), trend[back_first:back], 1)
+    trend[back + 1:] = np.arange(back + 1, len(trend)) * slope + intercept
+    return trend
+
+
+def _series_fingerprint(variable: np.array) -> tuple:
+    variable = np.ascontiguousarray(variable)
+    return zlib.crc32(variable.data), variable.shape, variable.dtype.str
+
+
 def _estimate_max_possible_period(current_period: int, target):
     # TODO implement better decomposition, now it is workaround for 'x must have 2 complete cycles' error
     if current_period * 2 >= len(target):
@@ -40,6 +153,10 @@ def merge_component_with_exog(component, predict_data: InputData):
 
 
 def estimate_period(variable):
+    return TsDecompositionCache().period(variable)
+
+
+def _estimate_period(variable):
     analyse_ratio = 10
     f, pxx_den = signal.welch(variable, fs=1, scaling='spectrum',
                               nfft=int(len(variable) / analyse_ratio),
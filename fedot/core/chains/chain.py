@@ -5,11 +5,13 @@ from uuid import uuid4
 
 import networkx as nx
 
+from fedot.core.chains.chain_compiled import CompiledChain
 from fedot.core.chains.chain_template import ChainTemplate
 from fedot.core.chains.node import (FittedModelCache, Node, PrimaryNode, SecondaryNode, SharedCache)
 from fedot.core.data.data import InputData
 from fedot.core.log import Log, default_log
-from fedot.core.repository.tasks import TaskTypesEnum
+from fedot.core.repository.dataset_types import DataTypesEnum
+from fedot.core.repository.tasks import Task, TaskTypesEnum
 
 ERROR_PREFIX = 'Invalid chain configuration:'
 
@@ -64,13 +66,15 @@ class Chain:
                 cache_status = False
         return cache_status
 
-    def fit(self, input_data: InputData, use_cache=True, verbose=False):
+    def fit(self, input_data: InputData, use_cache=True, verbose=False, is_output_required: bool = True):
         """
         Run training process in all nodes in chain starting with root.
 
         :param input_data: data used for model training
         :param use_cache: flag defining whether use cache information about previous executions or not, default True
         :param verbose: flag used for status printing to console, default False
+        :param is_output_required: flag defining whether the prediction of chain on train data is used or not.
+        If not, the in-sample prediction of root node is skipped and None is returned
         """
         use_cache = self.cache_status_if_new_data(new_input_data=input_data, cache_status=use_cache)
 
@@ -86,7 +90,8 @@ class Chain:
 
         if not use_cache or self.fitted_on_data is None:
             self.fitted_on_data = input_data
-        train_predicted = self.root_node.fit(input_data=input_data, verbose=verbose)
+        train_predicted = self.root_node.fit(input_data=input_data, verbose=verbose,
+                                             is_output_required=is_output_required)
         return train_predicted
 
     def predict(self, input_data: InputData, output_mode: str = 'default'):
@@ -110,9 +115,26 @@ class Chain:
         result = self.root_node.predict(input_data=input_data, output_mode=output_mode)
         return result
 
+    def compile(self, task: Optional[Task] = None, data_type: Optional[DataTypesEnum] = None) -> CompiledChain:
+        """
+        Freezes the fitted chain into the low-latency inference plan.
+        The plan must be compiled again if the chain is refitted or modified
+
+        :param task: task solved by the chain (the task of the data used in the last fitting if None)
+        :param data_type: type of the input data (the type of the data used in the last fitting if None)
+        :return: compiled chain with the same predict interface
+        """
+        if self.fitted_on_data is not None:
+            task = task or self.fitted_on_data.task
+            data_type = data_type or self.fitted_on_data.data_type
+        if task is None:
+            raise ValueError('The task must be defined to compile the chain that was not fitted in this session')
+
+        return CompiledChain(self, task=task, data_type=data_type or DataTypesEnum.table)
+
     def fine_tune_primary_nodes(self, input_data: InputData, iterations: int = 30,
                                 max_lead_time: timedelta = timedelta(minutes=5),
-                                verbose=False):
+                                verbose=False, tuner_type=None, tuning_store=None, n_jobs: int = 1):
         """
         Optimize hyperparameters in primary nodes models
 
@@ -120,6 +142,9 @@ class Chain:
         :param iterations: max number of iterations
         :param max_lead_time: max time available for tuning process
         :param verbose: flag used for status printing to console, default False
+        :param tuner_type: class of the tuner (e.g. SklearnHyperbandTuner) used instead of the default one
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         """
         # Select all primary nodes
         # Perform fine-tuning for each model in node
@@ -128,14 +153,15 @@ class Chain:
 
         all_primary_nodes = [node for node in self.nodes if isinstance(node, PrimaryNode)]
         for node in all_primary_nodes:
-            node.fine_tune(input_data, max_lead_time=max_lead_time, iterations=iterations)
+            node.fine_tune(input_data, max_lead_time=max_lead_time, iterations=iterations,
+                           tuner_type=tuner_type, tuning_store=tuning_store, n_jobs=n_jobs)
 
         if verbose:
             self.log.info('End tuning')
 
     def fine_tune_all_nodes(self, input_data: InputData, iterations: int = 30,
                             max_lead_time: timedelta = timedelta(minutes=5),
-                            verbose=False):
+                            verbose=False, tuner_type=None, tuning_store=None, n_jobs: int = 1):
         """
         Optimize hyperparameters in all nodes models
 
@@ -143,12 +169,16 @@ class Chain:
         :param iterations: max number of iterations
         :param max_lead_time: max time available for tuning process
         :param verbose: flag used for status printing to console, default False
+        :param tuner_type: class of the tuner (e.g. SklearnHyperbandTuner) used instead of the default one
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         """
         if verbose:
             self.log.info('Start tuning of chain')
 
         node = self.root_node
-        node.fine_tune(input_data, max_lead_time=max_lead_time, iterations=iterations)
+        node.fine_tune(input_data, max_lead_time=max_lead_time, iterations=iterations,
+                       tuner_type=tuner_type, tuning_store=tuning_store, n_jobs=n_jobs)
 
         if verbose:
             self.log.info('End tuning')
@@ -0,0 +1,158 @@
+from copy import copy
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+import numpy as np
+
+from fedot.core.chains.node import Node
+from fedot.core.data.data import InputData, OutputData, cast_to_precision
+from fedot.core.data.transformation import transformation_function_for_data
+from fedot.core.models.model import Model, _post_process_prediction_using_original_input
+from fedot.core.repository.dataset_types import DataTypesEnum
+from fedot.core.repository.tasks import Task
+
+if TYPE_CHECKING:
+    from fedot.core.chains.chain import Chain
+
+
+class CompiledChain:
+    """
+    Low-latency inference plan of the fitted chain.
+    The nodes are frozen into the flat list of steps in the topological order. Each step holds
+    the data transformation and the fitted preprocessor composed into one function, the evaluation strategy
+    and the direct reference to the fitted model, so the caches of nodes, the model repository
+    and the logs are not accessed in the prediction. The output of node shared by several children
+    is obtained once. The plan is not updated if the chain is refitted or modified
+
+    :param chain: fitted chain to compile
+    :param task: task solved by the chain
+    :param data_type: type of the input data of chain
+    """
+
+    def __init__(self, chain: 'Chain', task: Task, data_type: DataTypesEnum = DataTypesEnum.table):
+        if not chain.is_all_cache_actual():
+            raise ValueError('Trained model cache is not actual or empty')
+
+        self.task = task
+        self.data_type = data_type
+        self._steps: List[_CompiledStep] = []
+        self._step_ids_by_node: Dict[int, int] = {}
+        self._compile_node(chain.root_node)
+
+    def _compile_node(self, node: Node) -> int:
+        if id(node) in self._step_ids_by_node:
+            return self._step_ids_by_node[id(node)]
+
+        parent_nodes = sorted(node.nodes_from, key=lambda parent: parent.descriptive_id) if node.nodes_from else []
+        parent_ids = [self._compile_node(parent) for parent in parent_nodes]
+        is_target_from_parent = any('affects_target' in parent.model_tags for parent in parent_nodes)
+        if is_target_from_parent and len(parent_nodes) > 1:
+            raise ValueError('Chains with several target-affecting parents can not be compiled')
+
+        input_type = self._steps[parent_ids[0]].output_type if parent_ids else self.data_type
+        self._steps.append(_CompiledStep(node, self.task, input_type, parent_ids, is_target_from_parent))
+        self._step_ids_by_node[id(node)] = len(self._steps) - 1
+        return len(self._steps) - 1
+
+    def predict(self, input_data: InputData, output_mode: str = 'default') -> OutputData:
+        """
+        Run the predict process of all steps of plan
+
+        :param input_data: data for prediction
+        :param output_mode: desired form of output for the root model (see Chain.predict)
+        :return: prediction of the root model
+        """
+        outputs = []
+        root_step_id = len(self._steps) - 1
+        for step_id, step in enumerate(self._steps):
+            step_input = input_data
+            if step.parent_ids:
+                parent_outputs = [outputs[parent_id] for parent_id in step.parent_ids]
+                target = parent_outputs[0].predict if step.is_target_from_parent else input_data.target
+                step_input = InputData.from_predictions(outputs=parent_outputs, target=target)
+            outputs.append(step.predict(step_input, output_mode if step_id == root_step_id else 'default'))
+        return outputs[root_step_id]
+
+    @property
+    def length(self) -> int:
+        return len(self._steps)
+
+
+class _CompiledStep:
+    """
+    Frozen node of the compiled chain
+
+    :param node: fitted node
+    :param task: task solved by the chain
+    :param input_type: type of the input data of node
+    :param parent_ids: ids of the steps of parents in the order of their outputs in the input data
+    :param is_target_from_parent: flag defining whether the target is obtained from the parent or not
+    """
+
+    def __init__(self, node: Node, task: Task, input_type: DataTypesEnum,
+                 parent_ids: List[int], is_target_from_parent: bool):
+        cached_state = node.cache.actual_cached_state
+        self.model = node.model
+        self.fitted_model = cached_state.model
+        transformation = transformation_function_for_data(input_data_type=input_type,
+                                                          required_data_types=node.model.metadata.input_types)
+        self.output_type = node.model.output_datatype(input_type)
+        self.parent_ids = parent_ids
+        self.is_target_from_parent = is_target_from_parent
+
+        # the nested chains (e.g. atomized models) are applied by the model itself
+        self._strategies = {}
+        if type(node.model) is Model:
+            self._strategies['default'] = node.model.evaluation_strategy(task)
+        self._prediction_input = _prediction_input_function(transformation, cached_state.preprocessor,
+                                                            is_for_strategy=bool(self._strategies))
+
+    def _strategy(self, output_mode: str):
+        strategy = self._strategies.get(output_mode)
+        if strategy is None:
+            strategy = copy(self._strategies['default'])
+            strategy.output_mode = output_mode
+            self._strategies[output_mode] = strategy
+        return strategy
+
+    def predict(self, input_data: InputData, output_mode: str) -> OutputData:
+        data, model_input = self._prediction_input(input_data)
+        precision = data.precision
+
+        if self._strategies:
+            prediction = self._strategy(output_mode).predict(trained_model=self.fitted_model,
+                                                             predict_data=model_input)
+            prediction = _post_process_prediction_using_original_input(prediction=prediction, input_data=data)
+        else:
+            prediction = self.model.predict(fitted_model=self.fitted_model, data=data, output_mode=output_mode)
+
+        if isinstance(prediction, np.ndarray) and np.issubdtype(prediction.dtype, np.floating):
+            prediction = cast_to_precision(prediction, precision)
+        return OutputData(idx=input_data.idx,
+                          features=input_data.features,
+                          predict=prediction,
+                          task=input_data.task,
+                          data_type=self.output_type,
+                          precision=precision)
+
+
+def _prediction_input_function(transformation: Callable, preprocessor, is_for_strategy: bool) -> Callable:
+    """
+    Composes the data transformation, the preprocessing in the precision of data and the preparation
+    for modelling into one function
+
+    :param transformation: transformation of the input data of node
+    :param preprocessor: fitted preprocessing strategy
+    :param is_for_strategy: flag defining whether the data is prepared for the evaluation strategy or not
+    :return: function returning the preprocessed data and the data for the model
+    """
+    apply_preprocessing = preprocessor.apply
+
+    def prediction_input(input_data: InputData):
+        data = transformation(input_data)
+        precision = data.precision
+        data.features = cast_to_precision(apply_preprocessing(cast_to_precision(data.features, precision)),
+                                          precision)
+        model_input = data.prepare_for_modelling(is_for_fit=False) if is_for_strategy else data
+        return data, model_input
+
+    return prediction_input
@@ -203,6 +203,12 @@ class ChainTemplate:
                 node = PrimaryNode(model_object.model_type)
             node.model.params = model_object.params
 
+        # the parents are defined before the caching, since the cache is found by the descriptive id of node
+        nodes_from = [model_template for model_template in self.model_templates
+                      if model_template.model_id in model_object.nodes_from]
+        node.nodes_from = [self.roll_chain_structure(node_from, visited_nodes, path) for node_from
+                           in nodes_from]
+
         if hasattr(model_object, 'fitted_model_path') and model_object.fitted_model_path and path is not None:
             path_to_model = os.path.join(path, model_object.fitted_model_path)
             if not os.path.isfile(path_to_model):
@@ -215,11 +221,6 @@ class ChainTemplate:
             node.cache.append(CachedState(preprocessor=model_object.preprocessor,
                                           model=fitted_model))
 
-        nodes_from = [model_template for model_template in self.model_templates
-                      if model_template.model_id in model_object.nodes_from]
-        node.nodes_from = [self.roll_chain_structure(node_from, visited_nodes, path) for node_from
-                           in nodes_from]
-
         visited_nodes[model_object.model_id] = node
         return node
 
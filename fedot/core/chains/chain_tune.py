@@ -1,10 +1,21 @@
+from collections import OrderedDict
 from datetime import timedelta
 
+import numpy as np
+from hyperopt import STATUS_FAIL, STATUS_OK, Trials, fmin, hp, space_eval, tpe
+from sklearn.metrics import mean_squared_error as mse, roc_auc_score as roc_auc
+
 from fedot.core.chains.chain import Chain
-from fedot.core.chains.node import PrimaryNode
-from fedot.core.data.data import InputData
+from fedot.core.chains.node import Node, PrimaryNode
+from fedot.core.data.data import InputData, OutputData, train_test_data_setup
 from fedot.core.log import Log, default_log, start_end_log_decorator
 from fedot.core.chains.chain_template import ChainTemplate, ModelTemplate, extract_subtree_root
+from fedot.core.models.model import DEFAULT_PARAMS_STUB
+from fedot.core.models.tuning.hyperparams import params_range_by_model
+from fedot.core.repository.tasks import TaskTypesEnum
+
+# separator of the node index and the name of hyperparameter in the joint search space
+_NODE_PARAM_SEPARATOR = '__'
 
 
 class Tune:
@@ -18,7 +29,8 @@ class Tune:
     @start_end_log_decorator(start_msg='Starting tuning primary nodes',
                              end_msg='Primary nodes tuning is finished')
     def fine_tune_primary_nodes(self, input_data: InputData, iterations: int = 30,
-                                max_lead_time: timedelta = timedelta(minutes=5)):
+                                max_lead_time: timedelta = timedelta(minutes=5), tuner_type=None,
+                                tuning_store=None, n_jobs: int = 1):
         """
         Optimize hyperparameters of models in primary nodes
 
@@ -26,19 +38,24 @@ class Tune:
         :param iterations: max number of iterations
         :param max_lead_time: max time available for tuning process
         :param verbose: flag used for status printing to console, default False
+        :param tuner_type: class of the tuner used instead of the default one
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         :return: updated chain object
         """
 
         all_primary_nodes = [node for node in self.chain.nodes if isinstance(node, PrimaryNode)]
         for node in all_primary_nodes:
-            node.fine_tune(input_data, max_lead_time=max_lead_time, iterations=iterations)
+            node.fine_tune(input_data, max_lead_time=max_lead_time, iterations=iterations,
+                           tuner_type=tuner_type, tuning_store=tuning_store, n_jobs=n_jobs)
 
         return self.chain
 
     @start_end_log_decorator(start_msg='Starting tuning root node',
                              end_msg='Root node tuning is finished')
     def fine_tune_root_node(self, input_data: InputData, iterations: int = 30,
-                            max_lead_time: timedelta = timedelta(minutes=5)):
+                            max_lead_time: timedelta = timedelta(minutes=5), tuner_type=None,
+                            tuning_store=None, n_jobs: int = 1):
         """
         Optimize hyperparameters in the root node
 
@@ -46,19 +63,24 @@ class Tune:
         :param iterations: max number of iterations
         :param max_lead_time: max time available for tuning process
         :param verbose: flag used for status printing to console, default False
+        :param tuner_type: class of the tuner used instead of the default one
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         :return: updated chain object
         """
 
         node = self.chain.root_node
         node.fine_tune(input_data=input_data, max_lead_time=max_lead_time,
-                       iterations=iterations, recursive=False)
+                       iterations=iterations, recursive=False, tuner_type=tuner_type,
+                       tuning_store=tuning_store, n_jobs=n_jobs)
 
         return self.chain
 
     @start_end_log_decorator(start_msg='Starting tuning all nodes',
                              end_msg='All nodes tuning is finished')
     def fine_tune_all_nodes(self, input_data: InputData, iterations: int = 30,
-                            max_lead_time: timedelta = timedelta(minutes=5)):
+                            max_lead_time: timedelta = timedelta(minutes=5), tuner_type=None,
+                            tuning_store=None, n_jobs: int = 1):
         """
         Optimize hyperparameters of models in all nodes
 
@@ -66,18 +88,23 @@ class Tune:
         :param iterations: max number of iterations
         :param max_lead_time: max time available for tuning process
         :param verbose: flag used for status printing to console, default False
+        :param tuner_type: class of the tuner used instead of the default one
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         :return: updated chain object
         """
 
         node = self.chain.root_node
-        node.fine_tune(input_data, max_lead_time=max_lead_time, iterations=iterations, recursive=True)
+        node.fine_tune(input_data, max_lead_time=max_lead_time, iterations=iterations, recursive=True,
+                       tuner_type=tuner_type, tuning_store=tuning_store, n_jobs=n_jobs)
 
         return self.chain
 
     @start_end_log_decorator(start_msg='Starting tuning chosen node',
                              end_msg='Chosen node tuning is finished')
     def fine_tune_certain_node(self, model_id, input_data: InputData, iterations: int = 30,
-                               max_lead_time: timedelta = timedelta(minutes=5)):
+                               max_lead_time: timedelta = timedelta(minutes=5), tuner_type=None,
+                               tuning_store=None, n_jobs: int = 1):
         """
         Optimize hyperparameters of models in the certain node,
         defined by model id
@@ -88,6 +115,9 @@ class Tune:
         :param iterations: max number of iterations
         :param max_lead_time: max time available for tuning process
         :param verbose: flag used for status printing to console, default False
+        :param tuner_type: class of the tuner used instead of the default one
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         :return: updated chain object
         """
 
@@ -95,11 +125,13 @@ class Tune:
         new_root = extract_subtree_root(root_model_id=model_id,
                                         chain_template=self.chain_template)
         subchain.add_node(new_root)
-        subchain.fit(input_data=input_data, use_cache=False)
+        subchain.fit(input_data=input_data, use_cache=False, is_output_required=False)
 
         updated_subchain = Tune(subchain).fine_tune_root_node(input_data=input_data,
                                                               iterations=iterations,
-                                                              max_lead_time=max_lead_time)
+                                                              max_lead_time=max_lead_time,
+                                                              tuner_type=tuner_type,
+                                                              tuning_store=tuning_store, n_jobs=n_jobs)
 
         self._update_template(model_id=model_id,
                               updated_node=updated_subchain.root_node)
@@ -109,6 +141,78 @@ class Tune:
 
         return updated_chain
 
+    @start_end_log_decorator(start_msg='Starting joint tuning of all nodes',
+                             end_msg='Joint tuning of all nodes is finished')
+    def fine_tune_jointly(self, input_data: InputData, iterations: int = 30,
+                          max_lead_time: timedelta = timedelta(minutes=5)):
+        """
+        Optimize hyperparameters of models in all nodes jointly using Tree Parzen Estimator
+        over the union of the search spaces of nodes. The candidates are fitted on the first part
+        of data and evaluated on the second one. The outputs of the nodes with unchanged
+        hyperparameters (including all their parents) are reused, so the change of the root
+        hyperparameters costs only the fit of the root model
+
+        :param input_data: data used for tuning
+        :param iterations: max number of iterations
+        :param max_lead_time: max time available for tuning process
+        :return: updated chain object fitted on the whole data
+        """
+        if input_data.task.task_type not in [TaskTypesEnum.classification, TaskTypesEnum.regression]:
+            raise NotImplementedError(f'Joint tuning is not supported for {input_data.task.task_type}')
+
+        search_space = {}
+        for node_id, node in enumerate(self.chain.nodes):
+            params_range = params_range_by_model.get(node.model.model_type, {})
+            for param_name, param_space in params_range.items():
+                label = f'{node_id}{_NODE_PARAM_SEPARATOR}{param_name}'
+                search_space[label] = hp.choice(label, list(param_space))
+        if not search_space:
+            return self.chain
+
+        train_data, validation_data = train_test_data_setup(input_data)
+        # the models fitted before (e.g. on the whole input data) must not be reused for the validation
+        self.chain._clean_model_cache()
+        evaluator = _CachedChainEvaluator(self.chain, train_data, validation_data)
+        default_params = [node.model.params for node in self.chain.nodes]
+        default_loss = evaluator.loss()
+
+        def objective(sampled_params: dict):
+            self._set_nodes_params(default_params, sampled_params)
+            try:
+                return {'loss': evaluator.loss(), 'status': STATUS_OK}
+            except Exception as ex:
+                self.log.debug(f'Joint tuning candidate is skipped because of {ex}')
+                return {'status': STATUS_FAIL}
+
+        trials = Trials()
+        fmin(fn=objective, space=search_space, algo=tpe.suggest, max_evals=iterations,
+             trials=trials, timeout=max_lead_time.seconds, show_progressbar=False)
+
+        is_tuned = any(trial['result']['status'] == STATUS_OK for trial in trials.trials)
+        if is_tuned and trials.best_trial['result']['loss'] < default_loss:
+            best_params = space_eval(search_space, {label: values[0] for label, values
+                                                    in trials.best_trial['misc']['vals'].items()})
+            self._set_nodes_params(default_params, best_params)
+        else:
+            self._set_nodes_params(default_params, {})
+
+        self.chain.fit(input_data, use_cache=False, is_output_required=False)
+        return self.chain
+
+    def _set_nodes_params(self, default_params: list, sampled_params: dict):
+        params_by_node = [{} for _ in self.chain.nodes]
+        for label, value in sampled_params.items():
+            node_id, param_name = label.split(_NODE_PARAM_SEPARATOR, 1)
+            params_by_node[int(node_id)][param_name] = value
+
+        for node, node_default_params, node_params in zip(self.chain.nodes, default_params, params_by_node):
+            if not node_params:
+                node.model.params = node_default_params
+            elif node_default_params == DEFAULT_PARAMS_STUB:
+                node.model.params = node_params
+            else:
+                node.model.params = {**node_default_params, **node_params}
+
     def _update_template(self, model_id, updated_node):
         model_template = [model_template for model_template in self.chain_template.model_templates
                           if model_template.model_id == model_id][0]
@@ -116,3 +220,67 @@ class Tune:
 
         model_template.params = update_node_template.params
         model_template.fitted_model_path = update_node_template.fitted_model_path
+
+
+class _CachedChainEvaluator:
+    """
+    Fits the chain on the train data and evaluates it on the validation data.
+    The outputs of nodes on both data are cached by their descriptive ids that include the hyperparameters
+    of the node and all its parents, so the nodes with unchanged ids are neither refitted nor re-applied
+
+    :param chain: chain to evaluate
+    :param train_data: data used to fit the chain
+    :param validation_data: data used to evaluate the chain
+    :param max_cached_outputs: max number of nodes with the cached outputs
+    """
+
+    def __init__(self, chain: Chain, train_data: InputData, validation_data: InputData,
+                 max_cached_outputs: int = 256):
+        self.chain = chain
+        self.data_by_stage = {'fit': train_data, 'predict': validation_data}
+        self.max_cached_outputs = max_cached_outputs
+        self._outputs = OrderedDict()
+
+    def loss(self) -> float:
+        self._output(self.chain.root_node, 'fit')
+        prediction = self._output(self.chain.root_node, 'predict').predict
+        real = self.data_by_stage['predict'].target
+
+        if real is not None and self.data_by_stage['predict'].task.task_type == TaskTypesEnum.classification:
+            is_multiclass = len(np.asarray(prediction).shape) > 1 and np.asarray(prediction).shape[1] > 1
+            return -roc_auc(y_true=real, y_score=prediction, multi_class='ovr' if is_multiclass else 'raise')
+        return mse(y_true=real, y_pred=prediction, squared=False)
+
+    def _output(self, node: Node, stage: str) -> OutputData:
+        # the outputs of both stages are kept and evicted together,
+        # so the prediction is never made without the fit of the node with the same params
+        outputs = self._outputs.get(node.descriptive_id, None)
+        if outputs is None:
+            outputs = {}
+            self._outputs[node.descriptive_id] = outputs
+            if len(self._outputs) > self.max_cached_outputs:
+                self._outputs.popitem(last=False)
+        else:
+            self._outputs.move_to_end(node.descriptive_id)
+        if stage in outputs:
+            return outputs[stage]
+        if stage == 'predict' and 'fit' not in outputs:
+            self._output(node, 'fit')
+
+        data = self.data_by_stage[stage]
+        if node.nodes_from:
+            parent_nodes = sorted(node.nodes_from, key=lambda parent: parent.descriptive_id)
+            parent_outputs = [self._output(parent, stage) for parent in parent_nodes]
+            target = data.target
+            if any('affects_target' in parent.model_tags for parent in parent_nodes):
+                target = parent_outputs[0].predict
+            data = InputData.from_predictions(outputs=parent_outputs, target=target)
+
+        # only the node itself is fitted or applied, the parents outputs are already obtained
+        if stage == 'fit':
+            output = Node.fit(node, input_data=data)
+        else:
+            output = Node.predict(node, input_data=data)
+
+        outputs[stage] = output
+        return output
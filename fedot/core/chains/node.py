@@ -4,9 +4,11 @@ from copy import copy
 from datetime import timedelta
 from typing import Callable, List, Optional
 
-from fedot.core.data.data import InputData, OutputData
+import numpy as np
+
+from fedot.core.data.data import InputData, OutputData, cast_to_precision
 from fedot.core.data.preprocessing import preprocessing_func_for_data
-from fedot.core.data.transformation import transformation_function_for_data
+from fedot.core.data.transformation import TransformationCache, transformation_function_for_data
 from fedot.core.log import default_log
 from fedot.core.models.model import Model
 
@@ -71,20 +73,28 @@ class Node(ABC):
         return self.model.metadata.tags
 
     def output_from_prediction(self, input_data, prediction):
+        if isinstance(prediction, np.ndarray) and np.issubdtype(prediction.dtype, np.floating):
+            prediction = cast_to_precision(prediction, input_data.precision)
         return OutputData(idx=input_data.idx,
                           features=input_data.features,
-                          predict=prediction, task=input_data.task,
-                          data_type=self.model.output_datatype(input_data.data_type))
+                          predict=prediction,
+                          task=input_data.task,
+                          data_type=self.model.output_datatype(input_data.data_type),
+                          precision=input_data.precision)
 
     def _transform(self, input_data: InputData):
-        transformed_data = transformation_function_for_data(
+        transformation = transformation_function_for_data(
             input_data_type=input_data.data_type,
-            required_data_types=self.model.metadata.input_types)(input_data)
+            required_data_types=self.model.metadata.input_types)
+        transformed_data = TransformationCache().transform(transformation, input_data)
         return transformed_data
 
     def _preprocess(self, data: InputData):
         preprocessing_func = preprocessing_func_for_data(data, self)
 
+        # the preprocessors keep the floating-point type of the features
+        data.features = cast_to_precision(data.features, data.precision)
+
         if not self.cache.actual_cached_state:
             # if fitted preprocessor not found in cache
             preprocessing_strategy = \
@@ -93,17 +103,25 @@ class Node(ABC):
             # if fitted preprocessor already exists
             preprocessing_strategy = self.cache.actual_cached_state.preprocessor
 
-        data.features = preprocessing_strategy.apply(data.features)
+        data.features = cast_to_precision(preprocessing_strategy.apply(data.features), data.precision)
 
         return data, preprocessing_strategy
 
-    def fit(self, input_data: InputData, verbose=False) -> OutputData:
+    def fit(self, input_data: InputData, verbose=False, is_output_required: bool = True) -> Optional[OutputData]:
         """
         Run training process in the node
 
         :param input_data: data used for model training
         :param verbose: flag used for status printing to console, default False
+        :param is_output_required: flag defining whether the prediction on train data
+        is consumed (e.g. by the child nodes) or not. If not, the in-sample prediction is skipped
+        :return: prediction on train data or None if it is not required
         """
+        if not is_output_required and self.cache.actual_cached_state:
+            if verbose:
+                print('Model were obtained from cache')
+            return None
+
         transformed = self._transform(input_data)
         preprocessed_data, preproc_strategy = self._preprocess(transformed)
 
@@ -111,7 +129,8 @@ class Node(ABC):
             if verbose:
                 print('Cache is not actual')
 
-            cached_model, model_predict = self.model.fit(data=preprocessed_data)
+            cached_model, model_predict = self.model.fit(data=preprocessed_data,
+                                                         is_output_required=is_output_required)
             self.cache.append(CachedState(preprocessor=copy(preproc_strategy),
                                           model=cached_model))
         else:
@@ -121,6 +140,8 @@ class Node(ABC):
             model_predict = self.model.predict(fitted_model=self.cache.actual_cached_state.model,
                                                data=preprocessed_data)
 
+        if model_predict is None:
+            return None
         return self.output_from_prediction(input_data, model_predict)
 
     def predict(self, input_data: InputData, output_mode: str = 'default', verbose=False) -> OutputData:
@@ -143,13 +164,17 @@ class Node(ABC):
         return self.output_from_prediction(input_data, model_predict)
 
     def fine_tune(self, input_data: InputData,
-                  max_lead_time: timedelta = timedelta(minutes=5), iterations: int = 30):
+                  max_lead_time: timedelta = timedelta(minutes=5), iterations: int = 30,
+                  tuner_type=None, tuning_store=None, n_jobs: int = 1):
         """
         Run the process of hyperparameter optimization for the node
 
         :param input_data: data used for tuning
         :param iterations: max number of iterations
         :param max_lead_time: max time available for tuning process
+        :param tuner_type: class of the tuner used instead of the default one
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         """
 
         transformed = self._transform(input_data)
@@ -157,7 +182,9 @@ class Node(ABC):
 
         fitted_model, _ = self.model.fine_tune(preprocessed_data,
                                                max_lead_time=max_lead_time,
-                                               iterations=iterations)
+                                               iterations=iterations,
+                                               tuner_type=tuner_type,
+                                               tuning_store=tuning_store, n_jobs=n_jobs)
 
         self.cache.append(CachedState(preprocessor=copy(preproc_strategy),
                                       model=fitted_model))
@@ -239,17 +266,18 @@ class PrimaryNode(Node):
         super().__init__(nodes_from=None, model_type=model_type,
                          manual_preprocessing_func=manual_preprocessing_func, **kwargs)
 
-    def fit(self, input_data: InputData, verbose=False) -> OutputData:
+    def fit(self, input_data: InputData, verbose=False, is_output_required: bool = True) -> Optional[OutputData]:
         """
         Fit the model located in the primary node
 
         :param input_data: data used for model training
         :param verbose: flag used for status printing to console, default False
+        :param is_output_required: flag defining whether the prediction on train data is consumed or not
         """
         if verbose:
             self.log.info(f'Trying to fit primary node with model: {self.model}')
 
-        return super().fit(input_data, verbose)
+        return super().fit(input_data, verbose, is_output_required)
 
     def predict(self, input_data: InputData,
                 output_mode: str = 'default', verbose=False) -> OutputData:
@@ -283,20 +311,26 @@ class SecondaryNode(Node):
         super().__init__(nodes_from=nodes_from, model_type=model_type,
                          manual_preprocessing_func=manual_preprocessing_func, **kwargs)
 
-    def fit(self, input_data: InputData, verbose=False) -> OutputData:
+    def fit(self, input_data: InputData, verbose=False, is_output_required: bool = True) -> Optional[OutputData]:
         """
         Fit the model located in the secondary node
 
         :param input_data: data used for model training
         :param verbose: flag used for status printing to console, default False
+        :param is_output_required: flag defining whether the prediction on train data is consumed or not.
+        The outputs of parents are always consumed by the node, but they are not required
+        if the models of the whole subtree are cached
         """
         if verbose:
             self.log.info(f'Trying to fit secondary node with model: {self.model}')
 
+        if not is_output_required and all(node.cache.actual_cached_state for node in self.ordered_subnodes_hierarchy):
+            return None
+
         secondary_input = self._input_from_parents(input_data=input_data,
                                                    parent_operation='fit',
                                                    verbose=verbose)
-        return super().fit(input_data=secondary_input)
+        return super().fit(input_data=secondary_input, is_output_required=is_output_required)
 
     def predict(self, input_data: InputData, output_mode: str = 'default', verbose=False) -> OutputData:
         """
@@ -317,15 +351,20 @@ class SecondaryNode(Node):
 
     def fine_tune(self, input_data: InputData, recursive: bool = True,
                   max_lead_time: timedelta = timedelta(minutes=5), iterations: int = 30,
-                  verbose: bool = False):
+                  verbose: bool = False, tuner_type=None, tuning_store=None, n_jobs: int = 1):
         """
-        Run the process of hyperparameter optimization for the node
+        Run the process of hyperparameter optimization for the node.
+        The max_lead_time and iterations limit the tuning of the model of this node as well
+        (the default limits were used for it before)
 
         :param recursive: flag to initiate the tuning in the parent nodes or not, default: True
         :param input_data: data used for tuning
         :param max_lead_time: max time available for tuning process
         :param iterations: max number of iterations
         :param verbose: flag used for status printing to console, default True
+        :param tuner_type: class of the tuner used instead of the default one
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         """
         if verbose:
             self.log.info(f'Tune all parent nodes in secondary node with model: {self.model}')
@@ -333,13 +372,15 @@ class SecondaryNode(Node):
         if recursive:
             secondary_input = self._input_from_parents(input_data=input_data,
                                                        parent_operation='fine_tune',
-                                                       max_tune_time=max_lead_time, verbose=verbose)
+                                                       max_tune_time=max_lead_time, verbose=verbose,
+                                                       tuner_type=tuner_type, tuning_store=tuning_store, n_jobs=n_jobs)
         else:
             secondary_input = self._input_from_parents(input_data=input_data,
                                                        parent_operation='fit',
                                                        max_tune_time=max_lead_time, verbose=verbose)
 
-        return super().fine_tune(input_data=secondary_input)
+        return super().fine_tune(input_data=secondary_input, max_lead_time=max_lead_time,
+                                 iterations=iterations, tuner_type=tuner_type, tuning_store=tuning_store, n_jobs=n_jobs)
 
     def _nodes_from_with_fixed_order(self):
         if self.nodes_from is not None:
@@ -348,7 +389,7 @@ class SecondaryNode(Node):
     def _input_from_parents(self, input_data: InputData,
                             parent_operation: str,
                             max_tune_time: Optional[timedelta] = None,
-                            verbose=False) -> InputData:
+                            verbose=False, tuner_type=None, tuning_store=None, n_jobs: int = 1) -> InputData:
         if len(self.nodes_from) == 0:
             raise ValueError()
 
@@ -365,7 +406,8 @@ class SecondaryNode(Node):
                                                                           parent_operation)
         else:
             parent_results, target = _combine_parents_simple(parent_nodes, input_data,
-                                                             parent_operation, max_tune_time)
+                                                             parent_operation, max_tune_time, tuner_type,
+                                                             tuning_store, n_jobs)
 
         secondary_input = InputData.from_predictions(outputs=parent_results,
                                                      target=target)
@@ -393,7 +435,8 @@ def _combine_parents_that_affects_target(parent_nodes: List[Node],
 def _combine_parents_simple(parent_nodes: List[Node],
                             input_data: InputData,
                             parent_operation: str,
-                            max_tune_time: Optional[timedelta]):
+                            max_tune_time: Optional[timedelta],
+                            tuner_type=None, tuning_store=None, n_jobs: int = 1):
     target = input_data.target
     parent_results = []
     for parent in parent_nodes:
@@ -404,7 +447,8 @@ def _combine_parents_simple(parent_nodes: List[Node],
             prediction = parent.fit(input_data=input_data)
             parent_results.append(prediction)
         elif parent_operation == 'fine_tune':
-            parent.fine_tune(input_data=input_data, max_lead_time=max_tune_time)
+            parent.fine_tune(input_data=input_data, max_lead_time=max_tune_time, tuner_type=tuner_type,
+                             tuning_store=tuning_store, n_jobs=n_jobs)
             prediction = parent.predict(input_data=input_data)
             parent_results.append(prediction)
         else:
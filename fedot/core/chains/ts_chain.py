@@ -2,9 +2,15 @@ from copy import copy
 
 import numpy as np
 
+from fedot.core.algorithms.time_series.history_buffer import TsHistoryBuffer
+from fedot.core.algorithms.time_series.lagged_features import panel_lagged_rows
 from fedot.core.chains.chain import Chain
+from fedot.core.chains.node import Node, PrimaryNode
 from fedot.core.data.data import InputData, OutputData
-from fedot.core.repository.tasks import TaskTypesEnum
+from fedot.core.data.transformation import transformation_function_for_data, ts_to_lagged_table
+from fedot.core.models.evaluation.prediction_session import prediction_session
+from fedot.core.repository.dataset_types import DataTypesEnum
+from fedot.core.repository.tasks import Task, TaskTypesEnum, TsForecastingParams
 
 
 class TsForecastingChain(Chain):
@@ -36,37 +42,61 @@ class TsForecastingChain(Chain):
         # check if predict features contains additional (exogenous) variables
         with_exog = supplementary_data_for_forecast.features is not None
 
+        window_len = initial_data_for_forecast.task.task_params.max_window_size
+        forecast_steps_num = int(np.ceil(len(supplementary_data_for_forecast.idx) / forecast_length))
+
         # initial data for the first prediction
-        pre_history_start = (len(initial_data_for_forecast.idx) -
-                             initial_data_for_forecast.task.task_params.max_window_size)
+        pre_history_start = len(initial_data_for_forecast.idx) - window_len
         pre_history_end = len(initial_data_for_forecast.idx)
-
         data_for_forecast = initial_data_for_forecast.subset(start=pre_history_start, end=pre_history_end)
 
+        # the last forecast_length rows of the lagged table are used for the prediction, so the ring buffers
+        # for the last window_len + forecast_length - 1 values are enough for the lagged models,
+        # otherwise the whole history is kept in the preallocated buffers
+        capacity = None
+        if self._is_window_sufficient_for_forecast(initial_data_for_forecast.task.task_params):
+            capacity = window_len + forecast_length - 1
+        max_history_len = window_len + forecast_steps_num * forecast_length
+        dtype = initial_data_for_forecast.precision or np.float64
+
+        target_history = TsHistoryBuffer(data_for_forecast.target, capacity, max_history_len, dtype)
+        exog_history = None
+        if with_exog:
+            exog_history = TsHistoryBuffer(data_for_forecast.features, capacity, max_history_len, dtype)
+
+        # the idx of the history is the initial idx extended by the consecutive idx of the forecasted values
+        initial_idx = np.asarray(data_for_forecast.idx)
+        forecasted_len = 0
+
         full_prediction = []
-        forecast_steps_num = int(np.ceil(len(supplementary_data_for_forecast.idx) / forecast_length))
-        for forecast_step in range(forecast_steps_num):
-            stepwise_prediction = self.predict(data_for_forecast).predict
-            if len(stepwise_prediction.shape) > 1:
-                # multi-dim prediction
-                stepwise_prediction = stepwise_prediction[-1, :-forecast_length]
-                full_prediction.extend(stepwise_prediction)
-            else:
-                # single-dim prediction
-                stepwise_prediction = list(stepwise_prediction[-forecast_length:])
+        # the state restored for the prediction (e.g. the networks) is reused by all steps
+        with prediction_session():
+            for forecast_step in range(forecast_steps_num):
+                data_for_forecast.target = target_history.values
+                data_for_forecast.features = exog_history.values if with_exog else data_for_forecast.target
+                data_for_forecast.idx = _history_idx(initial_idx, forecasted_len, len(target_history))
+
+                stepwise_prediction = self.predict(data_for_forecast).predict
+                if len(stepwise_prediction.shape) > 1:
+                    # multi-dim prediction
+                    stepwise_prediction = stepwise_prediction[-1, :-forecast_length]
+                else:
+                    # single-dim prediction
+                    stepwise_prediction = stepwise_prediction[-forecast_length:]
                 full_prediction.extend(stepwise_prediction)
 
-            # add additional variable from external source
-            if with_exog:
-                data_for_forecast = _prepare_exog_features(data_for_forecast, supplementary_data_for_forecast,
-                                                           stepwise_prediction,
-                                                           forecast_step, forecast_length)
-            else:
-                predicted_ts = np.append(data_for_forecast.target, stepwise_prediction)
-                data_for_forecast.target = np.stack(predicted_ts)
-                data_for_forecast.features = data_for_forecast.target
+                if forecast_step == forecast_steps_num - 1:
+                    break
 
-            data_for_forecast.idx = _extend_idx_for_prediction(data_for_forecast.idx, forecast_length)
+                if with_exog:
+                    # add additional variable from external source
+                    new_exog_values = supplementary_data_for_forecast.features[forecast_step * forecast_length:
+                                                                               (forecast_step + 1) * forecast_length]
+                    exog_history.extend(new_exog_values)
+                    # the prediction is cut if it's too long
+                    stepwise_prediction = stepwise_prediction[:len(new_exog_values)]
+                target_history.extend(stepwise_prediction)
+                forecasted_len += len(stepwise_prediction)
 
         full_prediction = full_prediction[0:len(supplementary_data_for_forecast.idx)]
 
@@ -77,60 +107,116 @@ class TsForecastingChain(Chain):
 
         return output_data
 
+    def forecast_batch(self, initial_panel: np.array, supplementary_data: InputData) -> OutputData:
+        """Generates the forecasts for the panel of time series at once using pre-fitted chain.
+        The lagged features for all series are built together and each fitted model predicts for the stacked
+        matrix, so the forecasts are the same as the forecasts of the series one by one.
+        :param initial_panel: 2d array with the initial conditions for the forecasting in rows
+            (the series should be greater or equals to max_window_size)
+        :param supplementary_data: the data with idx for the forecasted steps, that are shared by all series
+            (the exogenous variables are not supported)
+        :return: forecasted time series in the rows of prediction
+        """
+        if not self.is_all_cache_actual():
+            raise ValueError('Chain for the time series forecasting was not fitted yet.')
 
-def _extend_idx_for_prediction(exiting_idx, forecast_length):
-    if forecast_length > 1:
-        indices_for_forecast = (exiting_idx[-1] +
-                                list(range(1, forecast_length + 1)))
+        if supplementary_data.task.task_type is not TaskTypesEnum.ts_forecasting:
+            raise ValueError('TsForecastingChain can be used for the ts_forecasting task only.')
 
-    else:
-        indices_for_forecast = exiting_idx[-1] + 1
+        task_params = supplementary_data.task.task_params
+        if not self._is_window_sufficient_for_forecast(task_params):
+            raise ValueError('Batch forecast is available for the chains with lagged models '
+                             'predicting all forecasted steps only.')
 
-    new_idx = np.append(exiting_idx, indices_for_forecast)
-    return new_idx
+        window_len, forecast_length = task_params.max_window_size, task_params.forecast_length
+        initial_panel = np.asarray(initial_panel)
+        series_num = initial_panel.shape[0]
+        forecast_steps_num = int(np.ceil(len(supplementary_data.idx) / forecast_length))
 
+        # the series are placed in columns of the buffer
+        history = TsHistoryBuffer(initial_panel[:, -window_len:].T,
+                                  capacity=window_len + forecast_length - 1)
 
-def _prepare_exog_features(data_for_prediction: InputData,
-                           exog_data: InputData,
-                           last_prediction: np.array,
-                           forecast_step: int, forecast_length: int) -> InputData:
-    new_features = []
-    if len(data_for_prediction.features.shape) == 1:
-        # if one exog feature
-        exog_features_num = 1
-    else:
-        # if several exog features
-        exog_features_num = data_for_prediction.features.shape[1]
-
-    new_part_len = 0
-    if exog_features_num > 1:
-        for exog_feat_id in range(exog_features_num):
-            exog_feature = data_for_prediction.features[:, exog_feat_id]
-            new_exog_values = \
-                exog_data.features[forecast_step * forecast_length:
-                                   ((forecast_step + 1) * forecast_length), exog_feat_id]
-            new_feature = np.append(exog_feature, new_exog_values)
-            new_features.append(new_feature)
-            new_part_len = len(new_features[0])
+        full_prediction = np.empty((series_num, forecast_steps_num * forecast_length))
+        for forecast_step in range(forecast_steps_num):
+            rows_num = len(history) - window_len + 1
+            lagged_rows = panel_lagged_rows(history.values, window_len, rows_num)
+
+            values_by_node = {}
+            stepwise_prediction = _panel_prediction_from_node(self.root_node, lagged_rows, supplementary_data.task,
+                                                              series_num, forecast_length, values_by_node)
+
+            full_prediction[:, forecast_step * forecast_length:(forecast_step + 1) * forecast_length] = \
+                stepwise_prediction
+            history.extend(stepwise_prediction.T)
+
+        output_data = OutputData(idx=supplementary_data.idx,
+                                 features=None,
+                                 predict=full_prediction[:, :len(supplementary_data.idx)],
+                                 task=supplementary_data.task,
+                                 data_type=supplementary_data.data_type)
+
+        return output_data
+
+    def _is_window_sufficient_for_forecast(self, task_params: TsForecastingParams) -> bool:
+        """
+        Checks if the forecast depends on the last values of the history only,
+        i.e. all primary nodes use the lagged tables and all forecasted steps are available
+        """
+        if not task_params.return_all_steps and task_params.forecast_length > 1:
+            return False
+        return all(transformation_function_for_data(DataTypesEnum.ts,
+                                                    node.model.metadata.input_types) is ts_to_lagged_table
+                   for node in self.nodes if isinstance(node, PrimaryNode))
+
+
+def _history_idx(initial_idx: np.array, forecasted_len: int, history_len: int) -> np.array:
+    """
+    Returns the idx of the last history_len values of the initial time series
+    extended by forecasted_len forecasted values
+    """
+    forecasted_idx_len = min(forecasted_len, history_len)
+    forecasted_idx = initial_idx[-1] + np.arange(forecasted_len - forecasted_idx_len + 1, forecasted_len + 1)
+    initial_idx_len = history_len - forecasted_idx_len
+    if initial_idx_len == 0:
+        return forecasted_idx
+    return np.concatenate((initial_idx[-initial_idx_len:], forecasted_idx))
+
+
+def _panel_prediction_from_node(node: Node, lagged_rows: np.array, task: Task,
+                                series_num: int, forecast_length: int,
+                                values_by_node: dict) -> np.array:
+    """
+    Obtains the forecasted values of the node for all series of panel at once
+
+    :param lagged_rows: the last rows of the lagged tables for all series (used by the primary nodes)
+    :param values_by_node: already obtained values of the nodes (used to share the parent nodes)
+    :return: 2d array with forecast_length values for each series in rows
+    """
+    if id(node) in values_by_node:
+        return values_by_node[id(node)]
+
+    if isinstance(node, PrimaryNode):
+        features, data_type = lagged_rows, DataTypesEnum.ts_lagged_table
     else:
-        exog_feature = data_for_prediction.features
-        new_exog_values = \
-            exog_data.features[forecast_step * forecast_length:
-                               ((forecast_step + 1) * forecast_length)]
-        new_features = np.append(exog_feature, new_exog_values)
-        new_part_len = len(new_features)
-
-    # add predicted time series to features for next prediction
-    predicted_ts = np.append(data_for_prediction.target,
-                             last_prediction)
-
-    # cut the prediction if it's too long (actual for the last forecast step)
-    predicted_ts = predicted_ts[0: new_part_len]
-    # new_features.append(predicted_ts)
-    data_for_prediction.target = predicted_ts
-    data_for_prediction.features = np.stack(np.asarray(new_features)).T
-
-    return data_for_prediction
+        parents_values = [_panel_prediction_from_node(parent, lagged_rows, task, series_num,
+                                                      forecast_length, values_by_node).reshape(-1)
+                          for parent in node._nodes_from_with_fixed_order()]
+        features, data_type = np.column_stack(parents_values), DataTypesEnum.table
+
+    data = InputData(idx=np.arange(len(features)), features=features, target=None,
+                     task=task, data_type=data_type)
+    preprocessed_data, _ = node._preprocess(data)
+    prediction = node.model.predict_for_rows(fitted_model=node.cache.actual_cached_state.model,
+                                             data=preprocessed_data)
+    prediction = np.asarray(prediction)
+    prediction = prediction.reshape(series_num, -1, prediction.shape[1] if prediction.ndim > 1 else 1)
+
+    # the same as the time series obtained from the multi-step forecasts for rows:
+    # the early steps of the first row and the last step of each row
+    values = np.concatenate((prediction[:, 0, :-1], prediction[:, :, -1]), axis=1)[:, -forecast_length:]
+    values_by_node[id(node)] = values
+    return values
 
 
 def convert_to_tschain(chain):
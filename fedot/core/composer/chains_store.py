@@ -0,0 +1,122 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, List, Optional
+
+import numpy as np
+
+from fedot.core.data.meta_features import best_of_nearest_datasets
+from fedot.core.log import default_log
+from fedot.core.repository.model_types_repository import atomized_model_type
+from fedot.core.utils import default_fedot_data_dir
+
+CHAINS_STORE_FILE_NAME = 'composing_history.db'
+
+
+class ChainsStore:
+    """
+    Persistent knowledge base of the best chains found by the composer, stored in the local SQLite database.
+    Each record contains the meta-features of the dataset, the structure of chain
+    (the model types and the edges) and its fitness (the lower is the better).
+    The best chains found for the most similar datasets are used to seed the initial population.
+    The errors of the database are logged and never interrupt the composition
+
+    :param db_path: path to the database file (the file in the default FEDOT data dir if None)
+    :param max_records: max number of the latest records of task considered in the search of similar datasets
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_records: int = 1000):
+        self._db_path = db_path
+        self.max_records = max_records
+        self.log = default_log(__name__)
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path is None:
+            self._db_path = os.path.join(default_fedot_data_dir(), CHAINS_STORE_FILE_NAME)
+        return self._db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.execute('CREATE TABLE IF NOT EXISTS best_chains ('
+                           'task_type TEXT, meta_features TEXT, chain TEXT, fitness REAL, created REAL)')
+        connection.execute('CREATE INDEX IF NOT EXISTS task_idx ON best_chains (task_type)')
+        return connection
+
+    def record(self, meta_features: dict, chain: Any, fitness: float):
+        """
+        Saves the chain found by the composer
+
+        :param meta_features: meta-features of the dataset (see dataset_meta_features)
+        :param chain: the found chain
+        :param fitness: fitness of the chain (the lower is the better)
+        """
+        structure = chain_structure(chain)
+        if structure is None or fitness is None or not np.isfinite(fitness):
+            return
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute('INSERT INTO best_chains VALUES (?, ?, ?, ?, ?)',
+                                   (meta_features['task_type'], json.dumps(meta_features, sort_keys=True),
+                                    json.dumps(structure), float(fitness), time.time()))
+        except sqlite3.Error as ex:
+            self.log.warn(f'Composed chain can not be saved: {ex}')
+
+    def best_chains(self, meta_features: dict, chain_generation_params, chains_num: int = 5) -> List[Any]:
+        """
+        Returns the best chains found for the datasets most similar to the described one
+
+        :param meta_features: meta-features of the dataset (see dataset_meta_features)
+        :param chain_generation_params: parameters defining the classes of chain and nodes to create
+        :param chains_num: max number of chains (one chain for each similar dataset)
+        :return: list of chains starting from the most similar dataset
+        """
+        try:
+            with closing(self._connect()) as connection, connection:
+                records = connection.execute('SELECT meta_features, chain, -fitness FROM best_chains '
+                                             'WHERE task_type = ? ORDER BY created DESC LIMIT ?',
+                                             (meta_features['task_type'], self.max_records)).fetchall()
+        except sqlite3.Error as ex:
+            self.log.warn(f'Composing history can not be loaded: {ex}')
+            return []
+
+        structures = []
+        for structure in best_of_nearest_datasets(meta_features, records, chains_num):
+            structure = json.loads(structure)
+            if structure not in structures:
+                structures.append(structure)
+        return [chain_from_structure(structure, chain_generation_params) for structure in structures]
+
+
+def chain_structure(chain: Any) -> Optional[List[dict]]:
+    """
+    Returns the nodes of chain as the list of the model types and the ids of parents
+    or None if the chain contains the nested (e.g. atomized) models
+    """
+    structure = []
+    for node in chain.nodes:
+        if node.model.model_type == atomized_model_type():
+            return None
+        structure.append({'model_type': node.model.model_type,
+                          'nodes_from': [chain.nodes.index(parent) for parent in node.nodes_from or []]})
+    return structure
+
+
+def chain_from_structure(structure: List[dict], chain_generation_params) -> Any:
+    """ Creates the chain with the nodes of structure (see chain_structure) """
+    nodes = []
+    for node_structure in structure:
+        if node_structure['nodes_from']:
+            nodes.append(chain_generation_params.secondary_node_func(model_type=node_structure['model_type']))
+        else:
+            nodes.append(chain_generation_params.primary_node_func(model_type=node_structure['model_type']))
+    for node, node_structure in zip(nodes, structure):
+        for parent_id in node_structure['nodes_from']:
+            node.nodes_from.append(nodes[parent_id])
+
+    chain = chain_generation_params.chain_class()
+    for node in nodes:
+        chain.add_node(node)
+    return chain
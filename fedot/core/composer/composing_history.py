@@ -3,7 +3,10 @@ import os
 import itertools
 from typing import (Any, List)
 
+from fedot.core.chains.chain import Chain
 from fedot.core.chains.chain_template import ChainTemplate
+from fedot.core.chains.node import CachedState, PrimaryNode, SecondaryNode
+from fedot.core.models.model_template import ModelTemplate
 from fedot.core.utils import default_fedot_data_dir
 
 
@@ -26,6 +29,17 @@ class ComposingHistory:
             new_individuals.append(self._convert_chain_to_template(chain))
         self.chains.append(new_individuals)
 
+    def population(self, generation: int = -1, with_fitted_models: bool = False) -> List[Chain]:
+        """
+        Restores the chains of generation (e.g. to continue the composition)
+
+        :param generation: number of generation (the last one by default)
+        :param with_fitted_models: flag defining whether to restore the fitted models of nodes or not
+        :return: the chains of generation (the chains with the atomized models are skipped)
+        """
+        return [chain_from_template(chain_template, with_fitted_models)
+                for chain_template in self.chains[generation] if not _has_atomized_models(chain_template)]
+
     def write_composer_history_to_csv(self, file='history.csv'):
         history_dir = os.path.join(default_fedot_data_dir(), 'composing_history')
         file = os.path.join(history_dir, file)
@@ -57,3 +71,37 @@ class ComposingHistory:
     @property
     def historical_chains(self):
         return list(itertools.chain(*self.chains))
+
+
+def chain_from_template(chain_template: ChainTemplate, with_fitted_models: bool) -> Chain:
+    """
+    Creates the chain from the template of chain without the atomized models.
+    The custom params of models are used, so the descriptive ids of nodes are the same as in the source chain
+
+    :param chain_template: the template of chain
+    :param with_fitted_models: flag defining whether to add the fitted models of template to the cache of nodes
+    """
+    nodes = {}
+    for model_template in chain_template.model_templates:
+        if model_template.nodes_from:
+            node = SecondaryNode(model_template.model_type)
+        else:
+            node = PrimaryNode(model_template.model_type)
+        node.model.params = model_template.custom_params
+        nodes[model_template.model_id] = node
+    for model_template in chain_template.model_templates:
+        if model_template.nodes_from:
+            nodes[model_template.model_id].nodes_from.extend(nodes[parent_id]
+                                                             for parent_id in model_template.nodes_from)
+
+    chain = Chain(nodes[0])
+    if with_fitted_models:
+        for model_template in chain_template.model_templates:
+            if model_template.fitted_model is not None:
+                nodes[model_template.model_id].cache.append(CachedState(preprocessor=model_template.preprocessor,
+                                                                        model=model_template.fitted_model))
+    return chain
+
+
+def _has_atomized_models(chain_template: ChainTemplate) -> bool:
+    return not all(isinstance(model_template, ModelTemplate) for model_template in chain_template.model_templates)
@@ -1,21 +1,30 @@
+from copy import deepcopy
 from dataclasses import dataclass
 from functools import partial
 from sys import maxsize as max_int_value
 from typing import (
     Callable,
-    Optional
+    List,
+    Optional,
+    Union
 )
 
+from fedot.core.algorithms.time_series.scale import TsDecompositionCache
 from fedot.core.chains.chain import Chain, SharedChain
+from fedot.core.chains.chain_template import ChainTemplate
 from fedot.core.chains.chain_validation import validate
 from fedot.core.chains.node import PrimaryNode, SecondaryNode
+from fedot.core.composer.chains_store import ChainsStore
 from fedot.core.composer.composer import Composer, ComposerRequirements
+from fedot.core.composer.composing_history import ComposingHistory, chain_from_template
 from fedot.core.composer.optimisers.gp_optimiser import GPChainOptimiser, GPChainOptimiserParameters
 from fedot.core.composer.optimisers.inheritance import GeneticSchemeTypesEnum
 from fedot.core.composer.optimisers.mutation import MutationStrengthEnum
 from fedot.core.composer.optimisers.param_free_gp_optimiser import GPChainParameterFreeOptimiser
 from fedot.core.data.data import InputData, train_test_data_setup
-from fedot.core.repository.model_types_repository import ModelTypesRepository
+from fedot.core.data.meta_features import dataset_meta_features
+from fedot.core.data.transformation import TransformationCache
+from fedot.core.repository.model_types_repository import ModelTypesRepository, atomized_model_type
 from fedot.core.repository.quality_metrics_repository import ClassificationMetricsEnum, MetricsRepository, \
     RegressionMetricsEnum
 from fedot.core.repository.tasks import Task, TaskTypesEnum
@@ -66,19 +75,44 @@ class GPComposer(Composer):
     :param metrics: metrics used to define the quality of found solution
     :param composer_requirements: requirements for composition process
     :param initial_chain: defines the initial state of the population. If None then initial population is random.
+    :param chains_store: store of the best chains found for the previous datasets. The part of random initial
+    population is replaced by the chains found for the most similar datasets. The history is not used if None
+    (by default), the store is set with GPComposerBuilder.with_chains_store
+    :param meta_population_share: max share of the initial population seeded from the chains store
     """
 
     def __init__(self, optimiser=None,
                  composer_requirements: Optional[GPComposerRequirements] = None,
                  metrics: Optional[Callable] = None,
-                 initial_chain: Optional[Chain] = None):
+                 initial_chain: Optional[Chain] = None,
+                 chains_store: Optional[ChainsStore] = None,
+                 meta_population_share: float = 0.3):
 
         super().__init__(metrics=metrics, composer_requirements=composer_requirements, initial_chain=initial_chain)
         self.shared_cache = {}
         self.optimiser = optimiser
+        self.chains_store = chains_store
+        self.meta_population_share = meta_population_share
 
     def compose_chain(self, data: InputData, is_visualise: bool = False,
-                      is_tune: bool = False, on_next_iteration_callback: Optional[Callable] = None) -> Chain:
+                      is_tune: bool = False, on_next_iteration_callback: Optional[Callable] = None,
+                      initial_population: Optional[Union[ComposingHistory, List[Chain], List[str]]] = None,
+                      reuse_fitted_models: bool = False) -> Chain:
+        """
+        Composes the chain for the data
+
+        :param data: data used for the composition
+        :param is_visualise: flag defining whether to visualise the composition or not
+        :param is_tune: flag defining whether to tune the found chain or not
+        :param on_next_iteration_callback: function called for each generation
+        :param initial_population: the chains used instead of the random ones in the initial population
+        to continue the previous composition: the history of the previous run (its last generation is used),
+        the list of chains (e.g. the previous population) or the list of paths to the chain JSON files
+        :param reuse_fitted_models: flag defining whether to reuse the fitted models of the initial population
+        (if they are available) or not. The reused models are fitted on the previous data, so the fitness
+        of their chains is approximate
+        :return: the best found chain
+        """
 
         if not self.optimiser:
             raise AttributeError(f'Optimiser for chain composition is not defined')
@@ -87,17 +121,35 @@ class GPComposer(Composer):
                                                       sample_split_ration_for_tasks[data.task.task_type],
                                                       task=data.task)
         self.shared_cache.clear()
-        metric_function_for_nodes = partial(self.metric_for_nodes,
-                                            self.metrics, train_data, test_data, True)
-
-        best_chain = self.optimiser.optimise(metric_function_for_nodes,
-                                             on_next_iteration_callback=on_next_iteration_callback)
-
-        self.log.info('GP composition finished')
-
-        if is_tune:
-            self.tune_chain(best_chain, data, self.composer_requirements.max_lead_time)
-        return best_chain
+        # the lagged tables and decompositions of time series are built once per composition run
+        TransformationCache().clear()
+        TsDecompositionCache().clear()
+        try:
+            metric_function_for_nodes = partial(self.metric_for_nodes,
+                                                self.metrics, train_data, test_data, True)
+
+            meta_features = dataset_meta_features(data)
+            self.optimiser.population_seeds = []
+            if initial_population is not None:
+                self.optimiser.population_seeds = self._warm_start_chains(initial_population, reuse_fitted_models)
+            if self.chains_store is not None:
+                self.optimiser.population_seeds += self._meta_learned_chains(meta_features)
+
+            best_chain = self.optimiser.optimise(metric_function_for_nodes,
+                                                 on_next_iteration_callback=on_next_iteration_callback)
+
+            self.log.info('GP composition finished')
+            if self.chains_store is not None:
+                # the best evolved chain is saved instead of the best single model chain (if it is better)
+                best_evolved_chain = self.optimiser.best_individual
+                self.chains_store.record(meta_features, best_evolved_chain, best_evolved_chain.fitness)
+
+            if is_tune:
+                self.tune_chain(best_chain, data, self.composer_requirements.max_lead_time)
+            return best_chain
+        finally:
+            TransformationCache().clear()
+            TsDecompositionCache().clear()
 
     def metric_for_nodes(self, metric_function, train_data: InputData,
                          test_data: InputData, is_chain_shared: bool,
@@ -106,12 +158,63 @@ class GPComposer(Composer):
             validate(chain)
             if is_chain_shared:
                 chain = SharedChain(base_chain=chain, shared_cache=self.shared_cache)
-            chain.fit(input_data=train_data)
+            # the fitness is computed on the test data, so the prediction on train data is not required
+            chain.fit(input_data=train_data, is_output_required=False)
             return metric_function(chain, test_data)
         except Exception as ex:
             self.log.info(f'Error in chain assessment during composition: {ex}. Continue.')
             return max_int_value
 
+    def _warm_start_chains(self, initial_population: Union[ComposingHistory, List[Chain], List[str]],
+                           reuse_fitted_models: bool) -> List[Chain]:
+        """
+        Returns the chains of the previous composition. The fitted models of chains
+        are added to the shared cache of composer if they are reused
+        """
+        if isinstance(initial_population, ComposingHistory):
+            chains = initial_population.population(with_fitted_models=reuse_fitted_models)
+        else:
+            chains = []
+            for chain in initial_population:
+                if isinstance(chain, str):
+                    chain_path, chain = chain, Chain()
+                    chain.load_chain(chain_path)
+                elif any(node.model.model_type == atomized_model_type() for node in chain.nodes):
+                    chain = deepcopy(chain)
+                else:
+                    # the source chains are not changed by the composition
+                    chain = chain_from_template(ChainTemplate(chain), with_fitted_models=True)
+                chains.append(chain)
+
+        for chain in chains:
+            for node in chain.nodes:
+                fitted_state = node.cache.actual_cached_state
+                if reuse_fitted_models and fitted_state is not None:
+                    self.shared_cache.setdefault(node.descriptive_id, fitted_state)
+                node.cache.clear()
+        self.log.info(f'{len(chains)} chains of the previous composition are added to initial population')
+        return chains
+
+    def _meta_learned_chains(self, meta_features: dict) -> List[Chain]:
+        """
+        Returns the best chains found for the most similar datasets that satisfy the composer requirements
+        """
+        requirements = self.composer_requirements
+        chains_num = int(requirements.pop_size * self.meta_population_share)
+        if chains_num == 0:
+            return []
+        chains = self.chains_store.best_chains(meta_features, self.optimiser.chain_generation_params, chains_num)
+        suitable_chains = []
+        for chain in chains:
+            is_models_suitable = all(node.model.model_type in requirements.secondary if node.nodes_from
+                                     else node.model.model_type in requirements.primary
+                                     for node in chain.nodes)
+            if len(chain.nodes) > 1 and is_models_suitable and chain.depth <= requirements.max_depth:
+                suitable_chains.append(chain)
+        if suitable_chains:
+            self.log.info(f'{len(suitable_chains)} chains of the similar datasets are added to initial population')
+        return suitable_chains
+
     @staticmethod
     def tune_chain(chain: Chain, data: InputData, time_limit):
         chain.fine_tune_all_nodes(input_data=data, max_lead_time=time_limit)
@@ -144,6 +247,11 @@ class GPComposerBuilder:
         self._composer.initial_chain = initial_chain
         return self
 
+    def with_chains_store(self, chains_store: Optional[ChainsStore], meta_population_share: float = 0.3):
+        self._composer.chains_store = chains_store
+        self._composer.meta_population_share = meta_population_share
+        return self
+
     def set_default_composer_params(self):
         if not self._composer.composer_requirements:
             models, _ = ModelTypesRepository().suitable_model(task_type=self.task.task_type)
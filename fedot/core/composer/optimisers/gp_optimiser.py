@@ -99,6 +99,9 @@ class GPChainOptimiser:
         if not self.requirements.pop_size:
             self.requirements.pop_size = 10
 
+        # the chains (e.g. found for the similar datasets) included in the initial population if it is random
+        self.population_seeds = []
+
         if initial_chain and type(initial_chain) != list:
             self.population = [deepcopy(initial_chain) for _ in range(self.requirements.pop_size)]
         else:
@@ -248,7 +251,7 @@ class GPChainOptimiser:
         return new_inds
 
     def _make_population(self, pop_size: int) -> List[Any]:
-        model_chains = []
+        model_chains = [chain for chain in self.population_seeds if constraint_function(chain)][:pop_size]
         while len(model_chains) < pop_size:
             chain = self.chain_generation_function()
             if constraint_function(chain):
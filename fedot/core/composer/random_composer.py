@@ -46,7 +46,7 @@ def nodes_to_chain(nodes: List[Node]) -> Chain:
 
 def metric_for_nodes(metric_function, nodes: List[Node], train_data: InputData, test_data: InputData) -> float:
     chain = nodes_to_chain(nodes)
-    chain.fit(input_data=train_data)
+    chain.fit(input_data=train_data, is_output_required=False)
     return metric_function(chain, test_data)
 
 
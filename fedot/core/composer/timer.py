@@ -72,5 +72,8 @@ class TunerTimer(Timer):
                 print('Tuning completed because of the time limit reached')
         return self.process_terminated
 
+    def remaining_time(self, limit) -> datetime.timedelta:
+        return max(limit - (datetime.datetime.now() - self.start), datetime.timedelta(0))
+
     def __exit__(self, *args):
         return self.process_terminated
@@ -2,10 +2,11 @@ import os
 import warnings
 from copy import copy
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.model_selection import train_test_split
 
 from fedot.core.algorithms.time_series.lagged_features import prepare_lagged_ts_for_prediction
@@ -19,11 +20,16 @@ from fedot.core.repository.tasks import Task, TaskTypesEnum
 class Data:
     """
     Base Data type class
+
+    .. note::
+        precision defines the floating-point type (e.g. np.float32) used for the features and
+        the intermediate outputs of the nodes. If None, the types are used as is
     """
     idx: np.array
     features: np.array
     task: Task
     data_type: DataTypesEnum
+    precision: Optional[type] = None
 
     @staticmethod
     def from_csv(file_path=None,
@@ -31,7 +37,8 @@ class Data:
                  task: Task = Task(TaskTypesEnum.classification),
                  data_type: DataTypesEnum = DataTypesEnum.table,
                  columns_to_drop: Optional[List] = None,
-                 target_column: Optional[str] = ''):
+                 target_column: Optional[str] = '',
+                 precision: Optional[type] = None):
         """
         :param file_path: the path to the CSV with data
         :param columns_to_drop: the names of columns that should be dropped
@@ -39,6 +46,7 @@ class Data:
         :param task: the task that should be solved with data
         :param data_type: the type of data interpretation
         :param target_column: name of target column (last column if empty and no target if None)
+        :param precision: floating-point type of the features (float64 if None)
         :return:
         """
 
@@ -61,9 +69,11 @@ class Data:
             features = data_array[1:].T
             target = None
 
+        features = cast_to_precision(features, precision)
         features = ImputationStrategy().fit(features).apply(features)
 
-        return InputData(idx=idx, features=features, target=target, task=task, data_type=data_type)
+        return InputData(idx=idx, features=features, target=target, task=task, data_type=data_type,
+                         precision=precision)
 
     @staticmethod
     def from_text_meta_file(meta_file_path: str = None,
@@ -94,14 +104,30 @@ class Data:
         if os.path.isfile(files_path):
             raise ValueError("""Path to the directory expected but got file""")
 
-        df_text = TextBatchLoader(path=files_path).extract()
+        df_text = TextBatchLoader(path=files_path).extract(export=False)
 
-        features = df_text['text']
-        target = df_text[label]
-        idx = [index for index in range(len(target))]
+        return _text_data_from_data_frame(df_text, label, task, data_type)
 
-        return InputData(idx=idx, features=features,
-                         target=target, task=task, data_type=data_type)
+    @staticmethod
+    def from_text_files_by_batches(files_path: str,
+                                   label: str = 'label',
+                                   task: Task = Task(TaskTypesEnum.classification),
+                                   data_type: DataTypesEnum = DataTypesEnum.text,
+                                   batch_size: int = 1000) -> Iterator['InputData']:
+        """
+        Generator that lazily reads the text files and yields the data by chunks
+
+        :param files_path: path to the directory with text files
+        :param label: name of the target column
+        :param task: the task that should be solved with data
+        :param data_type: the type of data interpretation
+        :param batch_size: number of files in chunk
+        """
+        if os.path.isfile(files_path):
+            raise ValueError("""Path to the directory expected but got file""")
+
+        for df_text in TextBatchLoader(path=files_path).extract_by_batches(batch_size):
+            yield _text_data_from_data_frame(df_text, label, task, data_type)
 
 
 @dataclass
@@ -126,6 +152,7 @@ class InputData(Data):
         task = outputs[0].task
         data_type = outputs[0].data_type
         idx = outputs[0].idx
+        precision = outputs[0].precision
 
         dataset_merging_funcs = {
             DataTypesEnum.forecasted_ts: _combine_datasets_ts,
@@ -135,9 +162,11 @@ class InputData(Data):
         dataset_merging_funcs.setdefault(data_type, _combine_datasets_common)
 
         features = dataset_merging_funcs[data_type](outputs)
+        if not isinstance(features, list):
+            features = cast_to_precision(features, precision)
 
         return InputData(idx=idx, features=features, target=target, task=task,
-                         data_type=data_type)
+                         data_type=data_type, precision=precision)
 
     def subset(self, start: int, end: int):
         if not (0 <= start <= end <= len(self.idx)):
@@ -146,7 +175,20 @@ class InputData(Data):
         if self.features is not None:
             new_features = self.features[start:end + 1]
         return InputData(idx=self.idx[start:end + 1], features=new_features,
-                         target=self.target[start:end + 1], task=self.task, data_type=self.data_type)
+                         target=self.target[start:end + 1], task=self.task, data_type=self.data_type,
+                         precision=self.precision)
+
+    def with_precision(self, precision: Optional[type]) -> 'InputData':
+        """
+        Returns the copy of data with the features casted to the required floating-point type.
+        The precision is kept for the intermediate outputs of the nodes in chain.
+
+        :param precision: floating-point type (e.g. np.float32) or None to use the types as is
+        """
+        data = copy(self)
+        data.features = cast_to_precision(self.features, precision)
+        data.precision = precision
+        return data
 
     def prepare_for_modelling(self, is_for_fit: bool = False):
         prepared_data = self
@@ -184,6 +226,16 @@ def split_train_test(data, split_ratio=0.8, with_shuffle=False, task: Task = Non
     return data_train, data_test
 
 
+def _text_data_from_data_frame(df_text: pd.DataFrame, label: str,
+                               task: Task, data_type: DataTypesEnum) -> 'InputData':
+    features = df_text['text']
+    target = df_text[label]
+    idx = [index for index in range(len(target))]
+
+    return InputData(idx=idx, features=features,
+                     target=target, task=task, data_type=data_type)
+
+
 def _convert_dtypes(data_frame: pd.DataFrame):
     objects: pd.DataFrame = data_frame.select_dtypes('object')
     for column_name in objects:
@@ -204,12 +256,35 @@ def train_test_data_setup(data: InputData, split_ratio=0.8,
     train_data_y, test_data_y = split_train_test(data.target, split_ratio, with_shuffle=shuffle_flag, task=task)
     train_idx, test_idx = split_train_test(data.idx, split_ratio, with_shuffle=shuffle_flag, task=task)
     train_data = InputData(features=train_data_x, target=train_data_y,
-                           idx=train_idx, task=data.task, data_type=data.data_type)
+                           idx=train_idx, task=data.task, data_type=data.data_type,
+                           precision=data.precision)
     test_data = InputData(features=test_data_x, target=test_data_y, idx=test_idx, task=data.task,
-                          data_type=data.data_type)
+                          data_type=data.data_type, precision=data.precision)
     return train_data, test_data
 
 
+def cast_to_precision(array, precision: Optional[type]):
+    """
+    Casts the numeric array to the floating-point type without the copy if the type is already the same.
+    Non-numeric arrays (e.g. texts) are returned as is
+
+    :param array: array to cast
+    :param precision: floating-point type (e.g. np.float32) or None to return the array as is
+    """
+    if precision is None:
+        return array
+    if sparse.issparse(array):
+        return array.astype(precision, copy=False)
+    if not isinstance(array, np.ndarray):
+        return array
+    if not (np.issubdtype(array.dtype, np.number) or np.issubdtype(array.dtype, np.bool_)):
+        try:
+            return array.astype(precision)
+        except (TypeError, ValueError):
+            return array
+    return array.astype(precision, copy=False)
+
+
 def _combine_datasets_ts(outputs: List[OutputData]):
     features_list = list()
 
@@ -231,7 +306,10 @@ def _combine_datasets_ts(outputs: List[OutputData]):
 
 def _combine_datasets_table(outputs: List[OutputData]):
     features = list()
-    expected_len = len(outputs[0].predict)
+    expected_len = outputs[0].predict.shape[0]
+
+    if any([sparse.issparse(elem.predict) for elem in outputs]):
+        return _combine_sparse_datasets_table(outputs, expected_len)
 
     for elem in outputs:
         if len(elem.predict) != expected_len:
@@ -249,6 +327,22 @@ def _combine_datasets_table(outputs: List[OutputData]):
     return features
 
 
+def _combine_sparse_datasets_table(outputs: List[OutputData], expected_len: int):
+    features = list()
+
+    for elem in outputs:
+        if elem.predict.shape[0] != expected_len:
+            raise ValueError(f'Non-equal prediction length: {elem.predict.shape[0]} and {expected_len}')
+        predict = elem.predict
+        if not sparse.issparse(predict) and len(predict.shape) == 1:
+            predict = predict[:, None]
+        features.append(predict)
+
+    if len(features) == 1:
+        return sparse.csr_matrix(features[0])
+    return sparse.hstack(features, format='csr')
+
+
 def _combine_datasets_common(outputs: List[OutputData]):
     features = list()
 
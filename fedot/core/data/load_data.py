@@ -1,22 +1,52 @@
+import hashlib
+import json
 import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
 
 import pandas as pd
 
+from fedot.core.utils import default_fedot_data_dir
+
 
 class BatchLoader(ABC):
-    def __init__(self, path: str):
+    """
+    Base class for the loaders of datasets stored as the set of files.
+    The paths of files and the labels (names of parent directories) are indexed
+    and the index is saved to reuse it while the directory tree is unchanged
+
+    :param path: path to the directory with data
+    :param use_index: flag defining whether to use the persistent index of files or not
+    :param index_dir: directory of the index files (the files_index directory in the FEDOT data dir if None)
+    """
+
+    def __init__(self, path: str, use_index: bool = True, index_dir: Optional[str] = None):
         self.path = path
         self.meta_df = None
         self.target_name = 'label'
+        self.use_index = use_index
+        self.index_dir = index_dir
 
     @abstractmethod
     def extract(self) -> pd.DataFrame:
         pass
 
     def _extract_files_paths(self):
+        all_files = self._load_files_index() if self.use_index else None
+
+        if all_files is None:
+            all_files, dirs_state = self._walk_files()
+            if self.use_index:
+                self._save_files_index(all_files, dirs_state)
+
+        self._load_to_meta_df(all_files)
+
+    def _walk_files(self):
         all_files = []
+        dirs_state = {}
         for root, dirs, files in os.walk(self.path):
+            dirs_state[root] = os.stat(root).st_mtime_ns
             files_paths = []
             for name in files:
                 if not name.startswith('.'):
@@ -25,7 +55,32 @@ class BatchLoader(ABC):
 
             if files:
                 all_files.extend(files_paths)
-        self._load_to_meta_df(all_files)
+        return all_files, dirs_state
+
+    def _index_file_path(self) -> str:
+        index_dir = self.index_dir or os.path.join(default_fedot_data_dir(), 'files_index')
+        if not os.path.isdir(index_dir):
+            os.makedirs(index_dir)
+        path_hash = hashlib.md5(os.path.abspath(self.path).encode('utf-8')).hexdigest()
+        return os.path.join(index_dir, f'{path_hash}.json')
+
+    def _load_files_index(self) -> Optional[List[str]]:
+        index_path = self._index_file_path()
+        if not os.path.isfile(index_path):
+            return None
+
+        with open(index_path, 'r') as index_file:
+            index = json.load(index_file)
+
+        # the adding, removing or renaming of the files changes the modification time of directories
+        for dir_path, mtime in index['dirs'].items():
+            if not os.path.isdir(dir_path) or os.stat(dir_path).st_mtime_ns != mtime:
+                return None
+        return index['files']
+
+    def _save_files_index(self, files: List[str], dirs_state: dict):
+        with open(self._index_file_path(), 'w') as index_file:
+            json.dump({'dirs': dirs_state, 'files': files}, index_file)
 
     def _load_to_meta_df(self, files):
         data_rows = []
@@ -39,39 +94,89 @@ class BatchLoader(ABC):
         # shuffle samples
         self.meta_df = self.meta_df.sample(frac=1).reset_index(drop=True)
 
-    def export_to_csv(self, path: str = None):
+    def _export_path(self, path: str, extension: str):
         if not path:
-            path = self.path
-            export_filename = f'meta_{os.path.basename(path)}.csv'
-            export_dirname = os.path.dirname(path)
-            self.meta_df.to_csv(os.path.join(export_dirname, export_filename))
-        else:
-            self.meta_df.to_csv(os.path.abspath(path))
+            export_filename = f'meta_{os.path.basename(self.path)}.{extension}'
+            export_dirname = os.path.dirname(self.path)
+            return os.path.join(export_dirname, export_filename)
+        return os.path.abspath(path)
+
+    def export_to_csv(self, path: str = None):
+        self.meta_df.to_csv(self._export_path(path, 'csv'))
+
+    def export_to_parquet(self, path: str = None):
+        """
+        Exports the data to the binary Parquet format (requires pyarrow or fastparquet)
+        """
+        self.meta_df.to_parquet(self._export_path(path, 'parquet'))
 
 
 class TextBatchLoader(BatchLoader):
-    def __init__(self, path: str):
+    """
+    Loader of the text files, the files are read concurrently by the pool of threads
+
+    :param path: path to the directory with text files
+    :param use_index: flag defining whether to use the persistent index of files or not
+    :param index_dir: directory of the index files (the files_index directory in the FEDOT data dir if None)
+    :param n_threads: number of threads used for the files reading
+    """
+
+    def __init__(self, path: str, use_index: bool = True, index_dir: Optional[str] = None, n_threads: int = 8):
         if os.path.isfile(path):
             raise ValueError('Expected directory path but got file')
-        super().__init__(path)
+        super().__init__(path, use_index, index_dir)
+        self.n_threads = n_threads
 
-    def extract(self, export: bool = True):
-        self._extract_files_paths()
+    def extract(self, export: bool = True, export_format: str = 'csv'):
+        """
+        Reads all files to the DataFrame with text and label columns
 
-        content_list = []
-        for file_path in self.meta_df['file_path'].tolist():
-            with open(file_path, 'r') as text_file:
-                content = text_file.read()
-                content_list.append(content)
+        :param export: flag defining whether to export the DataFrame next to the data or not
+        :param export_format: format of the export file: 'csv' or 'parquet'
+        """
+        self._extract_files_paths()
 
-        new_column = pd.Series(data=content_list, index=self.meta_df.index)
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            content_list = list(executor.map(_read_text_file, self.meta_df['file_path'].tolist()))
 
-        self.meta_df.insert(loc=self.meta_df.columns.get_loc('file_path'),
-                            column='text',
-                            value=new_column)
-        self.meta_df = self.meta_df.drop(['file_path'], axis=1)
+        self.meta_df = self._with_texts(self.meta_df, content_list)
 
         if export:
-            self.export_to_csv()
+            if export_format == 'parquet':
+                self.export_to_parquet()
+            elif export_format == 'csv':
+                self.export_to_csv()
+            else:
+                raise ValueError(f'Export format {export_format} is not supported')
 
         return self.meta_df
+
+    def extract_by_batches(self, batch_size: int = 1000) -> Iterator[pd.DataFrame]:
+        """
+        Generator that reads the files lazily and yields the DataFrames with
+        text and label columns for each batch of files
+
+        :param batch_size: number of files in batch
+        """
+        self._extract_files_paths()
+
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            for batch_start in range(0, len(self.meta_df), batch_size):
+                batch_df = self.meta_df.iloc[batch_start:batch_start + batch_size]
+                content_list = list(executor.map(_read_text_file, batch_df['file_path'].tolist()))
+                yield self._with_texts(batch_df, content_list)
+
+    @staticmethod
+    def _with_texts(meta_df: pd.DataFrame, content_list: List[str]) -> pd.DataFrame:
+        meta_df = meta_df.copy()
+        new_column = pd.Series(data=content_list, index=meta_df.index)
+
+        meta_df.insert(loc=meta_df.columns.get_loc('file_path'),
+                       column='text',
+                       value=new_column)
+        return meta_df.drop(['file_path'], axis=1)
+
+
+def _read_text_file(file_path: str) -> str:
+    with open(file_path, 'r') as text_file:
+        return text_file.read()
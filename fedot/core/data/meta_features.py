@@ -0,0 +1,75 @@
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from fedot.core.data.data import InputData
+from fedot.core.repository.tasks import TaskTypesEnum
+
+# the meta-features compared in the logarithmic scale
+_LOG_SCALED_META_FEATURES = ['samples_num', 'features_num', 'classes_num']
+
+
+def dataset_meta_features(data: InputData) -> dict:
+    """
+    Returns the simple meta-features of the dataset used to find the similar datasets:
+    the numbers of samples, features and classes and the class balance
+    (the ratio of the smallest and the largest classes, 1.0 for the non-classification tasks)
+
+    :param data: the dataset to describe
+    """
+    features = data.features
+    if features is None:
+        features = np.empty((0, 0))
+    elif not sparse.issparse(features):
+        features = np.asarray(features)
+    samples_num = len(data.target) if data.target is not None else features.shape[0]
+    features_num = int(np.prod(features.shape[1:])) if features.ndim > 1 else 1
+
+    classes_num, class_balance = 0, 1.0
+    if data.task.task_type == TaskTypesEnum.classification and data.target is not None:
+        _, class_counts = np.unique(np.asarray(data.target), return_counts=True)
+        classes_num = len(class_counts)
+        class_balance = float(class_counts.min() / class_counts.max())
+
+    return {'task_type': data.task.task_type.name,
+            'samples_num': int(samples_num),
+            'features_num': features_num,
+            'classes_num': classes_num,
+            'class_balance': round(class_balance, 4)}
+
+
+def meta_features_distance(first: dict, second: dict) -> Optional[float]:
+    """
+    Returns the distance between the datasets described by the meta-features
+    or None if the datasets are incomparable (e.g. belong to the different tasks)
+    """
+    if first.get('task_type') != second.get('task_type'):
+        return None
+    squared_diffs = [(np.log1p(first[name]) - np.log1p(second[name])) ** 2
+                     for name in _LOG_SCALED_META_FEATURES]
+    squared_diffs.append((first['class_balance'] - second['class_balance']) ** 2)
+    return float(np.sqrt(np.sum(squared_diffs)))
+
+
+def best_of_nearest_datasets(meta_features: dict, records: Iterable[Tuple[str, Any, float]],
+                             datasets_num: int) -> List[Any]:
+    """
+    Returns the best values (e.g. params or chains) found for the datasets nearest to the described one
+
+    :param meta_features: meta-features of the dataset
+    :param records: the meta-features of datasets as JSON, the values and their scores (the greater is the better)
+    :param datasets_num: max number of the nearest datasets
+    :return: the best values of datasets starting from the nearest one
+    """
+    best_records = {}
+    for dataset_meta_features, value, score in records:
+        if dataset_meta_features not in best_records or best_records[dataset_meta_features][1] < score:
+            best_records[dataset_meta_features] = (value, score)
+
+    distances = [(meta_features_distance(meta_features, json.loads(dataset_meta_features)), value)
+                 for dataset_meta_features, (value, _) in best_records.items()]
+    distances = sorted([(distance, value) for distance, value in distances if distance is not None],
+                       key=lambda item: item[0])
+    return [value for _, value in distances[:datasets_num]]
@@ -1,9 +1,15 @@
+import os
 import re
+from functools import lru_cache, partial
+from itertools import islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List
 
 import nltk
 import numpy as np
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer, WordNetLemmatizer
+from scipy import sparse
 from sklearn import preprocessing
 from sklearn.exceptions import NotFittedError
 from sklearn.impute import SimpleImputer
@@ -45,6 +51,8 @@ class EmptyStrategy(PreprocessingStrategy):
         return self
 
     def apply(self, data):
+        if sparse.issparse(data):
+            return data
         result = np.asarray(data)
         if len(result.shape) == 1:
             result = np.expand_dims(result, axis=1)
@@ -57,6 +65,9 @@ class Scaling(PreprocessingStrategy):
 
     def fit(self, data):
         data = _expand_data(data)
+        if sparse.issparse(data):
+            # the centering breaks the sparsity of data
+            self.scaler = _sparse_aware_scaler(self.scaler)
         self.scaler.fit(data)
         return self
 
@@ -65,7 +76,7 @@ class Scaling(PreprocessingStrategy):
         try:
             resulted = self.scaler.transform(data)
         except NotFittedError:
-            resulted = self.scaler.fit_transform(data)
+            resulted = self.fit(data).scaler.transform(data)
 
         return resulted
 
@@ -99,34 +110,50 @@ class NormalizationWithImputation(ScalingWithImputation):
 
 
 class TextPreprocessingStrategy(PreprocessingStrategy):
-    def __init__(self):
+    """
+    Cleans the texts (tokenization, stop words removal, lemmatization) by batches.
+    The NLTK resources are loaded once per process and the lemmas are memoized
+
+    :param n_jobs: number of worker processes used for the batches cleaning
+    :param batch_size: number of documents in batch
+    """
+
+    def __init__(self, n_jobs: int = 1, batch_size: int = 1000):
         self.stemmer = PorterStemmer()
-        self.lemmanizer = WordNetLemmatizer()
         self.lang = 'english'
-        self._download_nltk_resources()
+        self.n_jobs = n_jobs
+        self.batch_size = batch_size
+        _download_nltk_resources()
 
     def fit(self, data_to_fit):
         return self
 
     def apply(self, data):
         clean_data = []
-        for text in data:
-            words = set(self._word_vectorize(text))
-            without_stop_words = self._remove_stop_words(words)
-            words = self._lemmatization(without_stop_words)
-            words = [word for word in words if word.isalpha()]
-            new_text = ' '.join(words)
-            new_text = self._clean_html_text(new_text)
-            clean_data.append(new_text)
+        for clean_batch in self.apply_by_batches(data):
+            clean_data.extend(clean_batch)
         return np.array(clean_data)
 
-    @staticmethod
-    def _download_nltk_resources():
-        for resource in ['punkt', 'stopwords', 'wordnet']:
-            try:
-                nltk.data.find(f'tokenizers/{resource}')
-            except LookupError:
-                nltk.download(f'{resource}')
+    def apply_by_batches(self, data: Iterable[str]) -> Iterator[List[str]]:
+        """
+        Generator that lazily reads the documents and yields the cleaned batches,
+        so the corpus is not required to fit in memory
+
+        :param data: iterable with the documents
+        """
+        batches = _split_to_batches(data, self.batch_size)
+        if self.n_jobs == 1:
+            for batch in batches:
+                yield _clean_texts(batch, self.lang)
+        else:
+            clean_func = partial(_clean_texts, lang=self.lang)
+            with Pool(processes=self.n_jobs) as pool:
+                # only n_jobs batches are kept in memory at the same time
+                batches_group = list(islice(batches, self.n_jobs))
+                while batches_group:
+                    for clean_batch in pool.map(clean_func, batches_group):
+                        yield clean_batch
+                    batches_group = list(islice(batches, self.n_jobs))
 
     def _word_vectorize(self, text):
         words = nltk.word_tokenize(text)
@@ -134,10 +161,7 @@ class TextPreprocessingStrategy(PreprocessingStrategy):
         return words
 
     def _remove_stop_words(self, words: set):
-        stop_words = set(stopwords.words(self.lang))
-        cleared_words = [word for word in words if word not in stop_words]
-
-        return cleared_words
+        return _text_cleaner(self.lang).remove_stop_words(words)
 
     def _stemming(self, words):
         stemmed_words = [self.stemmer.stem(word) for word in words]
@@ -145,16 +169,75 @@ class TextPreprocessingStrategy(PreprocessingStrategy):
         return stemmed_words
 
     def _lemmatization(self, words):
-        # TODO pos
-        lemmas = [self.lemmanizer.lemmatize(word) for word in words]
+        return _text_cleaner(self.lang).lemmatization(words)
+
+    def _clean_html_text(self, raw_text):
+        return _text_cleaner(self.lang).clean_html_text(raw_text)
+
+
+class _TextCleaner:
+    """
+    Holds the NLTK resources and the memoized lemmas for the certain language
+    """
+
+    def __init__(self, lang: str):
+        self.stop_words = set(stopwords.words(lang))
+        self.lemmatizer = WordNetLemmatizer()
+        self.html_pattern = re.compile('<.*?>')
+        self._lemmas = {}
+
+    def clean(self, text: str) -> str:
+        words = set(nltk.word_tokenize(text))
+        without_stop_words = self.remove_stop_words(words)
+        words = self.lemmatization(without_stop_words)
+        words = [word for word in words if word.isalpha()]
+        new_text = ' '.join(words)
+        return self.clean_html_text(new_text)
+
+    def remove_stop_words(self, words):
+        return [word for word in words if word not in self.stop_words]
 
+    def lemmatization(self, words):
+        # TODO pos
+        lemmas = []
+        for word in words:
+            lemma = self._lemmas.get(word)
+            if lemma is None:
+                lemma = self.lemmatizer.lemmatize(word)
+                self._lemmas[word] = lemma
+            lemmas.append(lemma)
         return lemmas
 
-    def _clean_html_text(self, raw_text):
-        clean_pattern = re.compile('<.*?>')
-        text = re.sub(clean_pattern, ' ', raw_text)
+    def clean_html_text(self, raw_text):
+        return re.sub(self.html_pattern, ' ', raw_text)
+
+
+@lru_cache(maxsize=None)
+def _text_cleaner(lang: str) -> _TextCleaner:
+    # the cleaner is created once per process (and once per worker process)
+    return _TextCleaner(lang)
+
+
+def _clean_texts(texts: List[str], lang: str) -> List[str]:
+    cleaner = _text_cleaner(lang)
+    return [cleaner.clean(text) for text in texts]
 
-        return text
+
+def _split_to_batches(data: Iterable, batch_size: int) -> Iterator[List]:
+    data_iterator = iter(data)
+    batch = list(islice(data_iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(data_iterator, batch_size))
+
+
+@lru_cache(maxsize=None)
+def _download_nltk_resources():
+    for resource_path in ['tokenizers/punkt', 'corpora/stopwords', 'corpora/wordnet']:
+        try:
+            nltk.data.find(resource_path)
+        except LookupError:
+            nltk.download(os.path.basename(resource_path))
 
 
 _preprocessing_for_input_data = {
@@ -197,6 +280,14 @@ def preprocessing_func_for_data(data: 'InputData', node: 'Node'):
     return preprocessing_func
 
 
+def _sparse_aware_scaler(scaler):
+    if isinstance(scaler, preprocessing.StandardScaler):
+        return preprocessing.StandardScaler(with_mean=False)
+    if isinstance(scaler, preprocessing.MinMaxScaler):
+        return preprocessing.MaxAbsScaler()
+    return scaler
+
+
 def _expand_data(data):
     if len(data.shape) == 1:
         data = data[:, None]
@@ -1,9 +1,11 @@
+import hashlib
+from collections import OrderedDict
 from copy import copy
-from typing import List
+from typing import Callable, List
 
 import numpy as np
-import pandas as pd
 
+from fedot.core.algorithms.time_series.lagged_features import lagged_features_and_target, lagged_table
 from fedot.core.data.data import (
     InputData,
 )
@@ -15,43 +17,24 @@ def ts_to_lagged_table(input_data: InputData) -> InputData:
     window_len, prediction_len = extract_task_param(input_data.task)
 
     transformed_data = copy(input_data)
+    dtype = input_data.precision or np.float64
 
-    df = pd.DataFrame()
-    df_target = None
-    transformed_data.features = None
-
-    if input_data.target is not None:
-        target = list(input_data.target)
-        target.append(np.nan)
-        df = pd.DataFrame(data={'ts_target': target})
-        df_target = pd.DataFrame(data={'ts_target': target})
-        for lag in range(1, window_len + 1):
-            df[f'lag_{lag}'] = df.ts_target.shift(lag)
-        for lag in range(0, prediction_len):
-            if input_data.task.task_params.return_all_steps or \
-                    lag == prediction_len - 1:
-                df_target[f'new_target_{lag}'] = df.ts_target.shift(-lag)
+    target = np.asarray(input_data.target)
+    features, multistep_target = lagged_features_and_target(target, window_len, prediction_len, dtype)
+
+    if not input_data.task.task_params.return_all_steps:
+        # only the last forecasting step is used as target
+        multistep_target = multistep_target[:, -1:]
 
     if input_data.features is not None and (input_data.features.shape != input_data.target.shape or
                                             not np.allclose(input_data.features,
                                                             input_data.target,
                                                             equal_nan=True)):
-        if len(input_data.features.shape) == 1:
-            input_data.features.shape = input_data.features.shape + (1,)
-
-        # iterate feature array by columns (inidividual features)
-        for feature_id, feature in enumerate(input_data.features.T):
-            feature = list(feature)
-            feature.append(np.nan)
-            df_exog = pd.DataFrame(data={f'exog_feature': feature})
-            for lag in range(1, window_len + 1):
-                df[f'lag_f{feature_id}_{lag}'] = df_exog.exog_feature.shift(lag)
-
-    df = df.drop('ts_target', axis=1)
-    df_target = df_target.drop('ts_target', axis=1)
+        # the lags of target and exogenous features are placed into the single table
+        features = lagged_table(np.column_stack((target, input_data.features)), window_len, dtype)
 
-    transformed_data.features = np.squeeze(df)
-    transformed_data.target = df_target
+    transformed_data.features = np.squeeze(features)
+    transformed_data.target = multistep_target
 
     size_diff = transformed_data.features.shape[0] - len(transformed_data.idx)
     if size_diff:
@@ -76,6 +59,79 @@ _transformation_functions_for_data_types = {
 }
 
 
+class TransformationCache:
+    """
+    Cache of the results of expensive data transformations (e.g. lagged tables for time series)
+    shared between the nodes and chains. The results are keyed by the fingerprint of input data,
+    the transformation function and the task parameters. The cached arrays are read-only and
+    the shallow copies of cached data are returned, so the results can be shared safely.
+    The number of stored results is limited by max_size, the cache is cleared by GPComposer
+    at the start and the end of the composition run
+    """
+    _cached_results = OrderedDict()
+    max_size = 16
+
+    def transform(self, transformation: Callable, input_data: InputData) -> InputData:
+        if transformation is direct:
+            return direct(input_data)
+
+        key = (transformation.__name__, data_fingerprint(input_data), _task_params_key(input_data))
+        transformed_data = TransformationCache._cached_results.get(key, None)
+        if transformed_data is None:
+            transformed_data = transformation(input_data)
+            # the read-only views are cached, so the arrays of the caller (e.g. the unchanged idx) stay writeable
+            transformed_data.features = _read_only_view(transformed_data.features)
+            transformed_data.target = _read_only_view(transformed_data.target)
+            transformed_data.idx = _read_only_view(transformed_data.idx)
+            TransformationCache._cached_results[key] = transformed_data
+            while len(TransformationCache._cached_results) > TransformationCache.max_size:
+                TransformationCache._cached_results.popitem(last=False)
+        else:
+            TransformationCache._cached_results.move_to_end(key)
+
+        return copy(transformed_data)
+
+    def clear(self):
+        TransformationCache._cached_results.clear()
+
+    def __len__(self):
+        return len(TransformationCache._cached_results)
+
+
+def _read_only_view(array):
+    if not isinstance(array, np.ndarray):
+        return array
+    array = array.view()
+    array.setflags(write=False)
+    return array
+
+
+def data_fingerprint(input_data: InputData) -> str:
+    """ Returns the hash of the data arrays, type and precision used as the key of the caches """
+    fingerprint = hashlib.md5()
+    for array in [input_data.idx, input_data.features, input_data.target]:
+        if array is None:
+            fingerprint.update(b'none')
+            continue
+        array = np.asarray(array)
+        fingerprint.update(f'{array.shape}{array.dtype}'.encode('utf-8'))
+        if array.dtype == object:
+            fingerprint.update(repr(array.tolist()).encode('utf-8'))
+        else:
+            fingerprint.update(np.ascontiguousarray(array).data)
+    fingerprint.update(f'{input_data.data_type}{input_data.precision}'.encode('utf-8'))
+    return fingerprint.hexdigest()
+
+
+def _task_params_key(input_data: InputData):
+    params = input_data.task.task_params
+    if params is None:
+        return None
+    return (getattr(params, 'max_window_size', None),
+            getattr(params, 'forecast_length', None),
+            getattr(params, 'return_all_steps', None))
+
+
 def transformation_function_for_data(input_data_type: DataTypesEnum,
                                      required_data_types: List[DataTypesEnum]):
     if input_data_type in required_data_types:
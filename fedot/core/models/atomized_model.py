@@ -17,11 +17,11 @@ class AtomizedModel(Model):
         self.chain = chain
         self.unique_id = uuid4()
 
-    def fit(self, data: InputData, use_cache=True, verbose=False):
-        predicted_train = self.chain.fit(input_data=data, verbose=False)
+    def fit(self, data: InputData, use_cache=True, verbose=False, is_output_required: bool = True):
+        predicted_train = self.chain.fit(input_data=data, verbose=False, is_output_required=is_output_required)
         fitted_atomized_model_head = self.chain.root_node
 
-        return fitted_atomized_model_head, predicted_train.predict
+        return fitted_atomized_model_head, predicted_train.predict if predicted_train is not None else None
 
     def predict(self, fitted_model, data: InputData,  output_mode: str = 'default'):
         prediction = self.chain.predict(input_data=data, output_mode=output_mode)
@@ -29,10 +29,14 @@ class AtomizedModel(Model):
         return prediction.predict
 
     def fine_tune(self, data: InputData, iterations: int,
-                  max_lead_time: timedelta = timedelta(minutes=5)):
+                  max_lead_time: timedelta = timedelta(minutes=5), tuner_type=None, tuning_store=None,
+                  n_jobs: int = 1):
         self.chain = Tune(self.chain, verbose=True).fine_tune_all_nodes(input_data=data,
                                                                         max_lead_time=max_lead_time,
-                                                                        iterations=iterations)
+                                                                        iterations=iterations,
+                                                                        tuner_type=tuner_type,
+                                                                        tuning_store=tuning_store,
+                                                                        n_jobs=n_jobs)
 
     @property
     def metadata(self) -> ModelMetaInfo:
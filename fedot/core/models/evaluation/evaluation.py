@@ -3,6 +3,7 @@ from abc import abstractmethod
 from datetime import timedelta
 from typing import Optional
 
+from scipy import sparse
 from sklearn.cluster import KMeans as SklearnKmeans
 from sklearn.discriminant_analysis import (LinearDiscriminantAnalysis,
                                            QuadraticDiscriminantAnalysis)
@@ -51,6 +52,12 @@ class EvaluationStrategy:
         self.model_type = model_type
 
         self.output_mode = False
+        # the tuner used in fit_tuned instead of the default one
+        self.tuner_type = None
+        # the store of tuning results used to seed and record the tuning (the history is not used if None)
+        self.tuning_store = None
+        # the number of processes used by the tuner to evaluate the candidates
+        self.n_jobs = 1
 
         if not log:
             self.log: Log = default_log(__name__)
@@ -149,7 +156,7 @@ class SkLearnEvaluationStrategy(EvaluationStrategy):
             sklearn_model = self._sklearn_model_impl()
 
         try:
-            sklearn_model.fit(train_data.features, train_data.target)
+            _sparse_aware_call(sklearn_model.fit, train_data.features, train_data.target)
         except ValueError as ex:
             if len(train_data.target.shape) > 1 and train_data.target.shape[1] > 1:
                 # if the prediction requires multivariate target and models do not support it
@@ -183,7 +190,7 @@ class SkLearnEvaluationStrategy(EvaluationStrategy):
         """
         trained_model = self.fit(train_data=train_data)
         params_range = params_range_by_model.get(self.model_type, None)
-        self._tune_strategy = SklearnCustomRandomTuner
+        self._tune_strategy = self.tuner_type or SklearnCustomRandomTuner
         if not params_range:
             self.params_for_fit = None
             return trained_model, trained_model.get_params()
@@ -193,7 +200,10 @@ class SkLearnEvaluationStrategy(EvaluationStrategy):
                                                        params_range=params_range,
                                                        cross_val_fold_num=5,
                                                        time_limit=max_lead_time,
-                                                       iterations=iterations).tune()
+                                                       iterations=iterations,
+                                                       n_jobs=self.n_jobs,
+                                                       model_type=self.model_type,
+                                                       tuning_store=self.tuning_store).tune()
 
         if best_model or tuned_params:
             self.params_for_fit = tuned_params
@@ -228,9 +238,9 @@ class SkLearnClassificationStrategy(SkLearnEvaluationStrategy):
         """
         n_classes = len(trained_model.classes_)
         if self.output_mode == 'labels':
-            prediction = trained_model.predict(predict_data.features)
+            prediction = _sparse_aware_call(trained_model.predict, predict_data.features)
         elif self.output_mode in ['probs', 'full_probs', 'default']:
-            prediction = trained_model.predict_proba(predict_data.features)
+            prediction = _sparse_aware_call(trained_model.predict_proba, predict_data.features)
             if n_classes < 2:
                 raise NotImplementedError()
             elif n_classes == 2 and self.output_mode != 'full_probs':
@@ -249,7 +259,7 @@ class SkLearnRegressionStrategy(SkLearnEvaluationStrategy):
         :param predict_data: data used for prediction
         :return:
         """
-        prediction = trained_model.predict(predict_data.features)
+        prediction = _sparse_aware_call(trained_model.predict, predict_data.features)
         return prediction
 
 
@@ -288,6 +298,19 @@ class SkLearnClusteringStrategy(SkLearnEvaluationStrategy):
         raise NotImplementedError()
 
 
+def _sparse_aware_call(method, features, *args):
+    """
+    Calls the fit/predict method of the model with the features as is.
+    The sparse features are converted to dense only if the model does not support them
+    """
+    try:
+        return method(features, *args)
+    except TypeError:
+        if not sparse.issparse(features):
+            raise
+        return method(features.toarray(), *args)
+
+
 def convert_to_multivariate_model_manually(sklearn_model, train_data: InputData):
     if train_data.task.task_type == TaskTypesEnum.classification:
         multiout_func = MultiOutputClassifier
@@ -1,54 +1,182 @@
+import atexit
+import io
+from collections import OrderedDict
 from copy import copy
 from datetime import timedelta
+from multiprocessing import get_context
 from typing import Optional
 
 import numpy as np
 import tensorflow as tf
 
 from fedot.core.data.data import InputData, OutputData
+from fedot.core.log import default_log
 from fedot.core.models.evaluation.evaluation import EvaluationStrategy
+from fedot.core.models.evaluation.prediction_session import cleanup_after_prediction
 from fedot.core.repository.tasks import extract_task_param
 
-forecast_length = 1
+DEFAULT_LSTM_PARAMS = {
+    'epochs': 10,
+    'batch_size': 32,
+    'learning_rate': 0.02,
+    'early_stopping': True,
+    'patience': 5,
+    # the directory for TensorBoard logs, the instrumentation is disabled if None
+    'log_dir': None,
+    # the numbers of TensorFlow threads, the defaults of TensorFlow are used if None
+    'intra_op_threads': None,
+    'inter_op_threads': None,
+    # clear the Keras session after each fit and predict to release the graph state and the restored networks
+    'clear_session': True,
+    # fit in the separate process that is recycled after fits_per_subprocess fits
+    'fit_in_subprocess': False,
+    'fits_per_subprocess': 10
+}
 
 
 # TODO inherit this and similar from custom strategy
 class KerasForecastingStrategy(EvaluationStrategy):
+    """
+    Strategy for the LSTM-based forecasting model. The hyperparameters of the fit
+    (see DEFAULT_LSTM_PARAMS) are defined by the params. The number of TensorFlow threads
+    should be decreased by the intra_op_threads and inter_op_threads params
+    if the several models are fitted in parallel processes.
+    The fitted networks are returned as the compact KerasModelBlob objects, so the
+    Keras models are not kept in the caches of fitted models
+    """
+
     def __init__(self, model_type: str, params: Optional[dict] = None):
         self._init_lstm_model_functions(model_type)
 
-        self.epochs = 10
+        self.fit_params = dict(DEFAULT_LSTM_PARAMS)
         if params:
-            self.epochs = params.get('epochs', self.epochs)
+            self.fit_params.update(params)
+        self.epochs = self.fit_params['epochs']
 
         super().__init__(model_type, params)
 
+        _configure_tf_threads(self.fit_params['intra_op_threads'], self.fit_params['inter_op_threads'])
+
     def _init_lstm_model_functions(self, model_type):
         if model_type != 'lstm':
             raise ValueError(f'Impossible to obtain forecasting strategy for {model_type}')
 
     def fit(self, train_data: InputData):
-        model = fit_lstm(train_data, epochs=self.epochs)
-        return model
+        fit_params = {**self.fit_params, 'epochs': self.epochs}
+        if fit_params['fit_in_subprocess']:
+            return _fit_lstm_in_subprocess(train_data, fit_params)
+        return _fit_lstm_to_blob(train_data, fit_params)
 
     def predict(self, trained_model, predict_data: InputData):
-        return predict_lstm(trained_model, predict_data)
+        prediction = predict_lstm(trained_model, predict_data, batch_size=self.fit_params['batch_size'])
+        if self.fit_params['clear_session']:
+            # the session is kept until the end of the prediction session (e.g. between the steps of forecast)
+            cleanup_after_prediction(_clear_keras_session)
+        return prediction
 
     def fit_tuned(self, train_data: InputData, iterations: int = 30,
                   max_lead_time: timedelta = timedelta(minutes=5)):
         raise NotImplementedError()
 
 
-def _rmse_only_last(y_true, y_pred):
+class KerasModelBlob:
+    """
+    Compact serialised form of the fitted network: the configuration of
+    the architecture and the compressed weights. The Keras model is restored for the prediction only
+    and kept in the module-level registry until the Keras session is cleared, so the repeated predictions
+    (e.g. the steps of forecast) do not rebuild it and the blobs do not keep the networks alive
+
+    :param model: fitted Keras model
+    """
+
+    def __init__(self, model: tf.keras.Model):
+        self.config = model.get_config()
+        weights_buffer = io.BytesIO()
+        np.savez_compressed(weights_buffer, *model.get_weights())
+        self.weights = weights_buffer.getvalue()
+
+    def restore(self) -> tf.keras.Model:
+        if id(self) in _restored_models:
+            _restored_models.move_to_end(id(self))
+            return _restored_models[id(self)][1]
+
+        model = tf.keras.Model.from_config(self.config)
+        with np.load(io.BytesIO(self.weights)) as weights:
+            model.set_weights([weights[f'arr_{weights_id}'] for weights_id in range(len(weights.files))])
+        # the blob is kept with its network, so its id is not reused while the network is registered
+        _restored_models[id(self)] = (self, model)
+        while len(_restored_models) > _RESTORED_MODELS_MAX_SIZE:
+            _restored_models.popitem(last=False)
+        return model
+
+    def __len__(self):
+        return len(self.weights)
+
+
+def _fit_lstm_to_blob(train_data: InputData, fit_params: dict) -> KerasModelBlob:
+    _configure_tf_threads(fit_params['intra_op_threads'], fit_params['inter_op_threads'])
+    model_blob = KerasModelBlob(fit_lstm(train_data, **fit_params))
+    if fit_params['clear_session']:
+        _clear_keras_session()
+    return model_blob
+
+
+# the networks restored from the blobs by the ids of blobs, released when the Keras session is cleared
+_restored_models = OrderedDict()
+_RESTORED_MODELS_MAX_SIZE = 4
+
+
+def _clear_keras_session():
+    _restored_models.clear()
+    tf.keras.backend.clear_session()
+
+
+# the process for the fits is spawned once and recycled after the several fits to release the memory
+_fit_process_pool = None
+
+
+def _fit_lstm_in_subprocess(train_data: InputData, fit_params: dict) -> KerasModelBlob:
+    global _fit_process_pool
+    if _fit_process_pool is None:
+        # the forked process can not use the TensorFlow runtime of parent process
+        _fit_process_pool = get_context('spawn').Pool(processes=1,
+                                                      maxtasksperchild=fit_params['fits_per_subprocess'])
+        atexit.register(_fit_process_pool.terminate)
+    return _fit_process_pool.apply(_fit_lstm_to_blob, (train_data, fit_params))
+
+
+def _configure_tf_threads(intra_op_threads: Optional[int], inter_op_threads: Optional[int]):
     """
-    Computes rmse only on the last `prediction_len` values - forecasting
+    Sets the numbers of TensorFlow threads. It is possible only before the initialisation
+    of the TensorFlow runtime, so the settings are skipped with the warning after it
     """
-    global forecast_length
-    y_true = y_true[:, -forecast_length:]
-    y_pred = y_pred[:, -forecast_length:]
-    se = tf.keras.backend.square(y_true - y_pred)
-    mse = tf.keras.backend.mean(se)
-    return tf.keras.backend.sqrt(mse)
+    threading = tf.config.threading
+    requested = [(intra_op_threads, threading.get_intra_op_parallelism_threads,
+                  threading.set_intra_op_parallelism_threads),
+                 (inter_op_threads, threading.get_inter_op_parallelism_threads,
+                  threading.set_inter_op_parallelism_threads)]
+    for threads_num, get_threads, set_threads in requested:
+        if threads_num is None or get_threads() == threads_num:
+            continue
+        try:
+            set_threads(threads_num)
+        except RuntimeError as ex:
+            default_log(__name__).warn(f'Number of TensorFlow threads can not be changed: {ex}')
+
+
+def _rmse_only_last(forecast_length: int):
+    """
+    Returns the metric that computes rmse only on the last `forecast_length` values - forecasting
+    """
+
+    def _rmse_only_last(y_true, y_pred):
+        y_true = y_true[:, -forecast_length:]
+        y_pred = y_pred[:, -forecast_length:]
+        se = tf.keras.backend.square(y_true - y_pred)
+        mse = tf.keras.backend.mean(se)
+        return tf.keras.backend.sqrt(mse)
+
+    return _rmse_only_last
 
 
 def _create_lstm(train_data: InputData):
@@ -90,46 +218,95 @@ def _create_lstm(train_data: InputData):
     return tf.keras.Model(inputs=input_layer, outputs=output_layer)
 
 
-# TODO move hyperparameters to params
-def fit_lstm(train_data: InputData, epochs: int = 1):
-    global forecast_length
-
+def fit_lstm(train_data: InputData, epochs: int = 1, batch_size: int = 32,
+             learning_rate: float = 0.02, early_stopping: bool = True, patience: int = 5,
+             log_dir: Optional[str] = None, **kwargs):
+    """
+    Fits the LSTM-based model with the batches of lagged windows from the tf.data pipeline
+
+    :param train_data: lagged time series
+    :param epochs: max number of epochs
+    :param batch_size: number of windows in batch
+    :param learning_rate: learning rate of the Adam optimiser
+    :param early_stopping: flag defining whether to stop the fit if the loss is not improved
+    :param patience: number of epochs without improvement before the early stopping
+    :param log_dir: directory for TensorBoard logs, the logs are not written if None
+    """
     train_data_3d = _lagged_data_to_3d(train_data)
 
-    ts_length = train_data_3d.features.shape[0]
-    # train_data_3d.task.task_params.
     model = _create_lstm(train_data_3d)
 
     forecast_length = train_data_3d.task.task_params.forecast_length
 
-    model.compile(tf.keras.optimizers.Adam(lr=0.02), loss='mse', metrics=[_rmse_only_last])
+    model.compile(tf.keras.optimizers.Adam(learning_rate=learning_rate), loss='mse',
+                  metrics=[_rmse_only_last(forecast_length)])
 
-    percent = 5 * (train_data_3d.target.max() - train_data_3d.target.min()) / 100
-    model.fit(train_data_3d.features, train_data_3d.target, epochs=epochs,
-              callbacks=[
-                  tf.keras.callbacks.EarlyStopping(monitor='loss', min_delta=percent, patience=5),
-                  tf.keras.callbacks.ReduceLROnPlateau(
-                      monitor='_rmse_only_last', factor=0.2, patience=2, min_delta=0.1, verbose=False),
-                  tf.keras.callbacks.TensorBoard(update_freq=ts_length // 10)
-              ], verbose=0)
+    callbacks = [tf.keras.callbacks.ReduceLROnPlateau(
+        monitor='_rmse_only_last', factor=0.2, patience=2, min_delta=0.1, verbose=False)]
+    if early_stopping:
+        percent = 5 * (train_data_3d.target.max() - train_data_3d.target.min()) / 100
+        callbacks.append(tf.keras.callbacks.EarlyStopping(monitor='loss', min_delta=percent, patience=patience))
+    if log_dir is not None:
+        batches_num = int(np.ceil(len(train_data_3d.features) / batch_size))
+        callbacks.append(tf.keras.callbacks.TensorBoard(log_dir=log_dir, update_freq=max(batches_num // 10, 1)))
+
+    model.fit(_windows_dataset(train_data_3d.features, train_data_3d.target, batch_size),
+              epochs=epochs, callbacks=callbacks, verbose=0)
 
     return model
 
 
-def predict_lstm(trained_model, predict_data: InputData) -> OutputData:
+def predict_lstm(trained_model, predict_data: InputData, batch_size: int = 32) -> OutputData:
     window_len, prediction_len = extract_task_param(predict_data.task)
+    if isinstance(trained_model, KerasModelBlob):
+        trained_model = trained_model.restore()
 
     predict_data_3d = _lagged_data_to_3d(predict_data)
 
-    pred = trained_model.predict(predict_data_3d.features)
+    pred = trained_model.predict(_windows_dataset(predict_data_3d.features, batch_size=batch_size,
+                                                  shuffle=False), verbose=0)
     return pred[:, -prediction_len:, 0]
 
 
+def _windows_dataset(features: np.array, target: Optional[np.array] = None,
+                     batch_size: int = 32, shuffle: bool = True) -> tf.data.Dataset:
+    """
+    Builds the tf.data pipeline with the batches of lagged windows. The windows are the views
+    of the lagged table, so only the current batch is materialised instead of the whole 3d array
+
+    :param features: 3d array of windows
+    :param target: 3d array of targets or None for the prediction
+    :param batch_size: number of windows in batch
+    :param shuffle: flag defining whether to shuffle the windows for each epoch or not
+    """
+    samples_num = len(features)
+
+    def _batches():
+        order = np.random.permutation(samples_num) if shuffle else np.arange(samples_num)
+        for batch_start in range(0, samples_num, batch_size):
+            batch_ids = order[batch_start:batch_start + batch_size]
+            if target is None:
+                yield features[batch_ids].astype(np.float32)
+            else:
+                yield features[batch_ids].astype(np.float32), target[batch_ids].astype(np.float32)
+
+    # output_types and output_shapes are used since output_signature is not supported by TF < 2.4
+    features_shape = tf.TensorShape((None, *features.shape[1:]))
+    if target is None:
+        output_types, output_shapes = tf.float32, features_shape
+    else:
+        output_types = (tf.float32, tf.float32)
+        output_shapes = (features_shape, tf.TensorShape((None, *target.shape[1:])))
+    return tf.data.Dataset.from_generator(_batches, output_types=output_types,
+                                          output_shapes=output_shapes).prefetch(tf.data.experimental.AUTOTUNE)
+
+
 def _lagged_data_to_3d(input_data: InputData) -> InputData:
+    """ Adds the axis of variables to the lagged features and target without copying """
     transformed_data = copy(input_data)
 
     # TODO separate proprocessing for exog features
-    transformed_data.features = np.asarray(transformed_data.features)[:, :, np.newaxis]
-    transformed_data.target = np.asarray(transformed_data.target)[:, :, np.newaxis]
+    transformed_data.features = np.expand_dims(np.asarray(transformed_data.features), axis=-1)
+    transformed_data.target = np.expand_dims(np.asarray(transformed_data.target), axis=-1)
 
     return transformed_data
@@ -0,0 +1,37 @@
+from contextlib import contextmanager
+from typing import Callable
+
+# the depth of the nested prediction sessions and the cleanups postponed until the end of the outermost one
+_session_depth = 0
+_postponed_cleanups = []
+
+
+@contextmanager
+def prediction_session():
+    """
+    Scope of the repeated predictions of the same fitted models (e.g. the steps of time series forecast).
+    The cleanups of the evaluation strategies (e.g. the release of the restored networks) are postponed
+    until the end of the session, so the state restored for the prediction is reused between the steps
+    """
+    global _session_depth
+    _session_depth += 1
+    try:
+        yield
+    finally:
+        _session_depth -= 1
+        if _session_depth == 0:
+            cleanups = list(_postponed_cleanups)
+            _postponed_cleanups.clear()
+            for cleanup in cleanups:
+                cleanup()
+
+
+def cleanup_after_prediction(cleanup: Callable):
+    """
+    Runs the cleanup after the prediction: immediately if there is no active prediction session
+    or at the end of the session otherwise
+    """
+    if _session_depth == 0:
+        cleanup()
+    elif cleanup not in _postponed_cleanups:
+        _postponed_cleanups.append(cleanup)
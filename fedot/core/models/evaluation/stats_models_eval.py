@@ -1,10 +1,12 @@
+from collections import OrderedDict
 from datetime import timedelta
 from typing import Optional
 
 import numpy as np
 from statsmodels.tsa.ar_model import AutoReg
-from statsmodels.tsa.arima_model import ARIMA
+from statsmodels.tsa.arima.model import ARIMA
 
+from fedot.core.algorithms.time_series.lagged_features import lagged_windows
 from fedot.core.data.data import InputData, OutputData
 from fedot.core.models.evaluation.evaluation import EvaluationStrategy
 from fedot.core.models.tuning.tuners import ForecastingCustomRandomTuner
@@ -15,50 +17,83 @@ def fit_ar(train_data: InputData, params):
                    exog=train_data.features).fit()
 
 
+# the parameters of the last fitted models by their specification (order, trend, seasonal order), used as
+# the starting point for the fits of the models with the same specification (e.g. on the neighbouring windows)
+_arima_params_for_warm_start = OrderedDict()
+_ARIMA_WARM_START_MAX_SIZE = 32
+
+
 def fit_arima(train_data: InputData, params):
-    return ARIMA(train_data.target, **params).fit(disp=0)
+    params_key = str(sorted(params.items()))
+    model = ARIMA(train_data.target, **params)
 
+    start_params = _arima_params_for_warm_start.get(params_key, None)
+    if start_params is not None and len(start_params) != len(model.param_names):
+        start_params = None
+    fitted_model = model.fit(start_params=start_params)
 
-def predict_ar(trained_model, predict_data: InputData) -> OutputData:
-    prediction = None
+    _arima_params_for_warm_start[params_key] = fitted_model.params
+    _arima_params_for_warm_start.move_to_end(params_key)
+    if len(_arima_params_for_warm_start) > _ARIMA_WARM_START_MAX_SIZE:
+        _arima_params_for_warm_start.popitem(last=False)
+    return fitted_model
 
-    for ts_step_id, target in enumerate(predict_data.features):
-        start, end = trained_model.nobs + ts_step_id, \
-                     trained_model.nobs + ts_step_id + predict_data.task.task_params.forecast_length
-        exog, exog_oos = None, predict_data.features[start:end]
 
-        if trained_model.data.endog is predict_data.target:
-            # if train sample used
-            start, end = 0 + ts_step_id, predict_data.task.task_params.forecast_length + ts_step_id
-            exog, exog_oos = (predict_data.features[start:end],
-                              predict_data.features[start:end])
+def predict_ar(trained_model, predict_data: InputData):
+    forecast_length = predict_data.task.task_params.forecast_length
+    prediction_steps = len(predict_data.features) + 1
+    train_len = len(trained_model.data.endog)
 
-        prediction = trained_model.predict(start=start, end=end,
-                                           exog=exog, exog_oos=exog_oos)
+    # the forecasts for all steps are obtained from the single prediction (see predict_arima)
+    if trained_model.data.endog is predict_data.target:
+        # if train sample used: the row i contains the values for the steps i + 1 ... i + forecast_length
+        start, end = 1, prediction_steps + forecast_length - 1
+        # the exogenous variables are unknown out of the train sample
+        known_exog = np.asarray(predict_data.features)[-1:]
+    else:
+        start, end = train_len, train_len + prediction_steps + forecast_length - 2
+        known_exog = predict_data.features
 
-    return prediction
+    exog_oos = None
+    if trained_model.model.exog is not None:
+        exog_oos = _exog_for_forecast(known_exog, end - max(start, train_len) + 1)
 
+    ts_prediction = np.ascontiguousarray(trained_model.predict(start=start, end=end, exog_oos=exog_oos),
+                                         dtype=np.float64)
 
-def predict_arima(trained_model, predict_data: InputData):
-    prediction = []
+    return lagged_windows(ts_prediction, prediction_steps, forecast_length).copy()
 
+
+def _exog_for_forecast(known_exog: np.array, steps_num: int) -> np.array:
+    """
+    Returns the exogenous variables for the forecasted steps,
+    the unknown values are taken from the last known ones
+    """
+    known_exog = np.asarray(known_exog)
+    known_exog = known_exog.reshape(len(known_exog), -1)[:steps_num]
+    unknown_steps_num = steps_num - len(known_exog)
+    if unknown_steps_num > 0:
+        known_exog = np.concatenate((known_exog, np.repeat(known_exog[-1:], unknown_steps_num, axis=0)))
+    return known_exog
+
+
+def predict_arima(trained_model, predict_data: InputData):
     forecast_length = predict_data.task.task_params.forecast_length
     prediction_steps = len(predict_data.features) + 1
-    for pred_step_id in range(prediction_steps):
-
-        start, end = trained_model.nobs + pred_step_id, \
-                     trained_model.nobs + pred_step_id + forecast_length - 1
 
-        if trained_model.data.endog is predict_data.target:
-            # if train sample used
-            start, end = 0 + pred_step_id, forecast_length + pred_step_id
+    # the in-sample predictions are one-step-ahead and the out-of-sample ones are forecasted from the end
+    # of the train sample, so the predicted values do not depend on the start of the prediction
+    # and the forecasts for all steps are obtained from the single prediction instead of the call for each step
+    if trained_model.data.endog is predict_data.target:
+        # if train sample used: the row i contains the values for the steps i + 1 ... i + forecast_length
+        start, end = 1, prediction_steps + forecast_length - 1
+    else:
+        start, end = trained_model.nobs, trained_model.nobs + prediction_steps + forecast_length - 2
 
-        # TODO take exog into account
-        prediction_for_step = trained_model.predict(start=start, end=end)
-        prediction_for_step = prediction_for_step[-forecast_length:]
-        prediction.append(prediction_for_step)
+    # TODO take exog into account
+    ts_prediction = np.ascontiguousarray(trained_model.predict(start=start, end=end), dtype=np.float64)
 
-    return np.stack(prediction)
+    return lagged_windows(ts_prediction, prediction_steps, forecast_length).copy()
 
 
 class StatsModelsForecastingStrategy(EvaluationStrategy):
@@ -68,7 +103,7 @@ class StatsModelsForecastingStrategy(EvaluationStrategy):
     }
 
     __model_description_by_func = {
-        fit_arima: 'statsmodels.tsa.arima_model.ARIMA',
+        fit_arima: 'statsmodels.tsa.arima.model.ARIMA',
         fit_ar: 'statsmodels.tsa.ar_model import AutoReg'
     }
 
@@ -103,12 +138,13 @@ class StatsModelsForecastingStrategy(EvaluationStrategy):
 
     def fit_tuned(self, train_data: InputData, iterations: int = 10,
                   max_lead_time: timedelta = timedelta(minutes=5)):
-        tuned_params = ForecastingCustomRandomTuner().tune(fit=self._model_specific_fit,
-                                                           predict=self._model_specific_predict,
-                                                           tune_data=train_data,
-                                                           params_range=self._params_range,
-                                                           default_params=self._default_params,
-                                                           iterations=iterations)
+        tuner = ForecastingCustomRandomTuner(model_type=self.model_type, tuning_store=self.tuning_store)
+        tuned_params = tuner.tune(fit=self._model_specific_fit,
+                                  predict=self._model_specific_predict,
+                                  tune_data=train_data,
+                                  params_range=self._params_range,
+                                  default_params=self._default_params,
+                                  iterations=iterations)
 
         stats_model = self._model_specific_fit(train_data, tuned_params)
         self.params_for_fit = tuned_params
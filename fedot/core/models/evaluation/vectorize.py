@@ -23,7 +23,8 @@ class VectorizeStrategy(EvaluationStrategy):
         return vectorizer
 
     def predict(self, trained_model, predict_data: InputData) -> OutputData:
-        return trained_model.transform(list(predict_data.features)).toarray()
+        # the sparse matrix is passed to the next nodes as is
+        return trained_model.transform(list(predict_data.features))
 
     def fit_tuned(self, train_data: InputData, iterations: int,
                   max_lead_time: timedelta = timedelta(minutes=5)):
@@ -58,28 +58,47 @@ class Model:
         model_params = self.params
         return f'n_{model_type}_{model_params}'
 
-    def _init(self, task: Task, **kwargs):
+    def evaluation_strategy(self, task: Task, output_mode: str = 'default'):
+        """
+        Creates the evaluation strategy of the model for the task
+
+        :param task: task solved by the model
+        :param output_mode: desired output of the strategy (e.g. labels, probs, full_probs)
+        :return: new evaluation strategy object
+        """
         params_for_fit = None
         if self.params != DEFAULT_PARAMS_STUB:
             params_for_fit = self.params
 
+        eval_strategy = _eval_strategy_for_task(self.model_type, task.task_type)(self.model_type,
+                                                                                 params_for_fit)
+        eval_strategy.output_mode = output_mode
+        return eval_strategy
+
+    def _init(self, task: Task, **kwargs):
         try:
-            self._eval_strategy = _eval_strategy_for_task(self.model_type, task.task_type)(self.model_type,
-                                                                                           params_for_fit)
+            self._eval_strategy = self.evaluation_strategy(task)
         except Exception as ex:
             self.log.error(f'Can not find evaluation strategy because of {ex}')
             raise ex
 
         if 'output_mode' in kwargs:
             self._eval_strategy.output_mode = kwargs['output_mode']
-
-    def fit(self, data: InputData):
+        if kwargs.get('tuner_type') is not None:
+            self._eval_strategy.tuner_type = kwargs['tuner_type']
+        if kwargs.get('tuning_store') is not None:
+            self._eval_strategy.tuning_store = kwargs['tuning_store']
+        if kwargs.get('n_jobs') is not None:
+            self._eval_strategy.n_jobs = kwargs['n_jobs']
+
+    def fit(self, data: InputData, is_output_required: bool = True):
         """
         This method is used for defining and running of the evaluation strategy
         to train the model with the data provided
 
         :param data: data used for model training
-        :return: tuple of trained model and prediction on train data
+        :param is_output_required: flag defining whether the prediction on train data is used or not
+        :return: tuple of trained model and prediction on train data (None if the prediction is not required)
         """
         self._init(data.task)
 
@@ -87,7 +106,9 @@ class Model:
 
         fitted_model = self._eval_strategy.fit(train_data=prepared_data)
 
-        predict_train = self.predict(fitted_model, data)
+        predict_train = None
+        if is_output_required:
+            predict_train = self.predict(fitted_model, data)
 
         return fitted_model, predict_train
 
@@ -110,16 +131,34 @@ class Model:
 
         return prediction
 
+    def predict_for_rows(self, fitted_model, data: InputData):
+        """
+        This method is used to predict for each row of the features as is,
+        without the preparation of data and the post-processing of prediction
+        (e.g. the multi-step forecasts for the rows of lagged table are not merged to the time series)
+
+        :param fitted_model: trained model object
+        :param data: data used for prediction
+        """
+        self._init(data.task)
+
+        return self._eval_strategy.predict(trained_model=fitted_model,
+                                           predict_data=data)
+
     def fine_tune(self, data: InputData, iterations: int,
-                  max_lead_time: timedelta = timedelta(minutes=5)):
+                  max_lead_time: timedelta = timedelta(minutes=5), tuner_type=None, tuning_store=None,
+                  n_jobs: int = 1):
         """
         This method is used for hyperparameter searching
 
         :param data: data used for hyperparameter searching
         :param iterations: max number of iterations evaluable for hyperparameter optimization
         :param max_lead_time: max time(seconds) for tuning evaluation
+        :param tuner_type: class of the tuner used instead of the default one of evaluation strategy
+        :param tuning_store: store of the tuning results used to seed and record the tuning (not used if None)
+        :param n_jobs: number of processes used by the tuner to evaluate the candidates
         """
-        self._init(data.task)
+        self._init(data.task, tuner_type=tuner_type, tuning_store=tuning_store, n_jobs=n_jobs)
 
         prepared_data = data.prepare_for_modelling(is_for_fit=True)
 
@@ -163,7 +202,7 @@ def _eval_strategy_for_task(model_type: str, task_type_for_data: TaskTypesEnum):
             raise ValueError(f'Model {model_type} can not be used as a part of {task_type_for_model}.')
         task_type_for_model = compatible_task_types_acceptable_for_model[0]
 
-    strategy = models_repo.model_info_by_id(model_type).current_strategy(task_type_for_model)
+    strategy = model_info.current_strategy(task_type_for_model)
     return strategy
 
 
@@ -172,7 +211,8 @@ def _post_process_prediction_using_original_input(prediction, input_data: InputD
     if input_data.task.task_type == TaskTypesEnum.ts_forecasting:
         processed_predict = post_process_forecasted_ts(prediction, input_data)
     else:
-        if np.array([np.isnan(_) for _ in prediction]).any():
+        prediction_array = np.asarray(prediction)
+        if np.issubdtype(prediction_array.dtype, np.floating) and np.isnan(prediction_array).any():
             processed_predict = np.nan_to_num(prediction)
 
     return processed_predict
@@ -1,6 +1,14 @@
+import time
 from copy import deepcopy
+from multiprocessing import Pool, TimeoutError
+from typing import List, Optional
 
-from hyperopt import tpe, fmin, Trials, space_eval, hp
+import numpy as np
+from hyperopt import JOB_STATE_DONE, STATUS_FAIL, STATUS_OK, Trials, fmin, hp, space_eval, tpe
+from hyperopt.base import Domain
+from hyperopt.exceptions import AllTrialsFailed
+from hyperopt.fmin import generate_trial
+from sklearn.base import clone
 from sklearn.model_selection import cross_val_score
 
 
@@ -22,32 +30,141 @@ class TunerAdapter:
 
 
 class HyperoptAdapter(TunerAdapter):
-    def __init__(self, tuner: 'TPE'):
+    """
+    Adapter for the Tree Parzen Estimator from hyperopt library.
+    If n_jobs > 1, the batches of n_jobs TPE suggestions are evaluated concurrently in the pool of processes.
+    The seed params (e.g. the best ones from the previous tunings) are evaluated as the first trials
+
+    :param n_jobs: number of processes used to evaluate the trials
+    :param seed_params: params evaluated before the TPE suggestions
+    """
+
+    def __init__(self, tuner: 'TPE', n_jobs: int = 1, seed_params: Optional[List[dict]] = None):
         super(HyperoptAdapter, self).__init__(tuner)
+        self.n_jobs = n_jobs
+        self.seed_params = seed_params or []
+        # the total time of the trials evaluations and the wall time of tuning (sec),
+        # their ratio estimates the speedup of the parallel evaluation
+        self.evaluation_time, self.tuning_time = 0.0, 0.0
 
     def _objective_function(self, params):
-        self.model_to_adapt.set_params(**params)
-        metric = cross_val_score(self.model_to_adapt,
-                                 self.data.features,
-                                 self.data.target,
-                                 cv=5, scoring=self.scorer).mean()
+        try:
+            self.model_to_adapt.set_params(**params)
+            metric = cross_val_score(self.model_to_adapt,
+                                     self.data.features,
+                                     self.data.target,
+                                     cv=5, scoring=self.scorer).mean()
+        except Exception:
+            return {'status': STATUS_FAIL}
 
         if self.greater_is_better():
-            return -metric
+            return _trial_result(-metric)
         else:
-            return metric
+            return _trial_result(metric)
 
     def tune(self, iterations: int = 100, timeout_sec: int = 60):
-        hyperopt_trials = Trials()
-        best_encrypted = fmin(fn=self._objective_function,
-                              space=self.params, algo=tpe.suggest,
-                              max_evals=iterations,
-                              trials=hyperopt_trials,
-                              timeout=timeout_sec)
-        self.best_params = space_eval(space=self.params,
-                                      hp_assignment=best_encrypted)
+        start_time = time.perf_counter()
+        if self.n_jobs > 1:
+            self.best_params = self._parallel_tune(iterations, timeout_sec)
+        else:
+            hyperopt_trials = Trials()
+            # fmin counts the queued trials as evaluated ones, so the seed trials are evaluated beforehand
+            seed_trials = self._seed_trials(hyperopt_trials, iterations)
+            for trial in seed_trials:
+                trial['state'] = JOB_STATE_DONE
+                trial['result'] = self._objective_function(self._trial_params(trial))
+            hyperopt_trials.insert_trial_docs(seed_trials)
+            hyperopt_trials.refresh()
+            try:
+                best_encrypted = fmin(fn=self._objective_function,
+                                      space=self.params, algo=tpe.suggest,
+                                      max_evals=iterations,
+                                      trials=hyperopt_trials,
+                                      timeout=timeout_sec)
+                self.best_params = space_eval(space=self.params,
+                                              hp_assignment=best_encrypted)
+            except AllTrialsFailed:
+                self.best_params = {}
+        self.tuning_time = time.perf_counter() - start_time
+        if self.n_jobs == 1:
+            self.evaluation_time = self.tuning_time
         return self.best_params, self.best_model
 
+    def _parallel_tune(self, iterations: int, timeout_sec: int) -> dict:
+        """
+        Runs TPE with the trials evaluated by batches in the pool of processes.
+        The evaluations in progress are cancelled when the timeout is reached.
+        The failed trials (and the trials with NaN loss) are recorded as failed ones
+        """
+        hyperopt_trials = Trials()
+        seed_trials = self._seed_trials(hyperopt_trials, iterations)
+        domain = Domain(self._objective_function, self.params)
+        start_time = time.perf_counter()
+        with Pool(processes=self.n_jobs, initializer=_init_trials_process,
+                  initargs=(self.model_to_adapt, self.data.features, self.data.target,
+                            self.scorer, self.greater_is_better())) as pool:
+            while len(hyperopt_trials.trials) < iterations:
+                batch_size = min(self.n_jobs, iterations - len(hyperopt_trials.trials))
+                if seed_trials:
+                    new_trials, seed_trials = seed_trials[:batch_size], seed_trials[batch_size:]
+                else:
+                    new_ids = hyperopt_trials.new_trial_ids(batch_size)
+                    hyperopt_trials.refresh()
+                    new_trials = tpe.suggest(new_ids, domain, hyperopt_trials, np.random.randint(2 ** 31 - 1))
+
+                evaluations = [pool.apply_async(_trial_loss, (self._trial_params(trial),))
+                               for trial in new_trials]
+                try:
+                    for trial, evaluation in zip(new_trials, evaluations):
+                        remaining_time = max(timeout_sec - (time.perf_counter() - start_time), 0)
+                        try:
+                            loss, evaluation_time = evaluation.get(timeout=remaining_time)
+                            self.evaluation_time += evaluation_time
+                            trial['result'] = _trial_result(loss)
+                        except TimeoutError:
+                            raise
+                        except Exception:
+                            # the failed trial does not abort the tuning
+                            trial['result'] = {'status': STATUS_FAIL}
+                        trial['state'] = JOB_STATE_DONE
+                except TimeoutError:
+                    # the pool is terminated with the evaluations in progress
+                    break
+                finally:
+                    hyperopt_trials.insert_trial_docs([trial for trial in new_trials
+                                                       if trial['state'] == JOB_STATE_DONE])
+                    hyperopt_trials.refresh()
+
+        if not any(trial['result']['status'] == STATUS_OK for trial in hyperopt_trials.trials):
+            return {}
+        return self._trial_params(hyperopt_trials.best_trial)
+
+    def _seed_trials(self, hyperopt_trials: Trials, iterations: int) -> List[dict]:
+        """
+        Returns the new trials for the seed params with the ids reserved in the trials.
+        The params out of the search space are skipped
+        """
+        points = []
+        for params in self.seed_params:
+            point = {}
+            for param_name, param_space in self.tuner.params_range.items():
+                # the choice is encoded by the index of the value
+                value_ids = [value_id for value_id, value in enumerate(param_space)
+                             if param_name in params and value == params[param_name]]
+                if not value_ids:
+                    break
+                point[param_name] = value_ids[0]
+            else:
+                if point not in points:
+                    points.append(point)
+        points = points[:iterations]
+        trial_ids = hyperopt_trials.new_trial_ids(len(points))
+        return [generate_trial(trial_id, point) for trial_id, point in zip(trial_ids, points)]
+
+    def _trial_params(self, trial: dict) -> dict:
+        encoded_params = {label: values[0] for label, values in trial['misc']['vals'].items() if values}
+        return space_eval(space=self.params, hp_assignment=encoded_params)
+
     @property
     def best_model(self):
         return self.model_to_adapt.set_params(**self.best_params)
@@ -59,3 +176,27 @@ class HyperoptAdapter(TunerAdapter):
         """
         is_greater = True if self.scorer._sign == 1 else False
         return is_greater
+
+
+def _trial_result(loss: float) -> dict:
+    if np.isnan(loss):
+        return {'status': STATUS_FAIL}
+    return {'loss': loss, 'status': STATUS_OK}
+
+
+# the model, the data and the scorer for the trials evaluation in the worker process
+_process_trials_context = None
+
+
+def _init_trials_process(model, features, target, scorer, greater_is_better: bool):
+    global _process_trials_context
+    _process_trials_context = (model, features, target, scorer, greater_is_better)
+
+
+def _trial_loss(params: dict):
+    start_time = time.perf_counter()
+    model, features, target, scorer, greater_is_better = _process_trials_context
+    model = clone(model).set_params(**params)
+    metric = cross_val_score(model, features, target, cv=5, scoring=scorer).mean()
+    loss = -metric if greater_is_better else metric
+    return loss, time.perf_counter() - start_time
@@ -1,16 +1,25 @@
 import operator
+import time
+from collections import OrderedDict
 from datetime import timedelta
-from typing import Callable, Tuple, Union
+from multiprocessing import Pool, TimeoutError
+from typing import Callable, List, Optional, Tuple, Union
 
+import numpy as np
 from numpy.random import choice as nprand_choice, randint
+from sklearn.base import clone, is_classifier
 from sklearn.metrics import make_scorer, mean_squared_error, mean_squared_error as mse, roc_auc_score
-from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, cross_val_score
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, check_cv, cross_val_score
 from skopt import BayesSearchCV
 
+from fedot.core.algorithms.time_series.prediction import multistep_prediction_to_ts
 from fedot.core.composer.timer import TunerTimer
 from fedot.core.data.data import InputData, train_test_data_setup
+from fedot.core.data.meta_features import dataset_meta_features
+from fedot.core.data.transformation import data_fingerprint
 from fedot.core.log import Log, default_log
 from fedot.core.models.tuning.tuner_adapter import HyperoptAdapter
+from fedot.core.models.tuning.tuning_store import TuningStore
 from fedot.core.repository.tasks import TaskTypesEnum
 
 TUNER_ERROR_PREFIX = 'Unsuccessful fit because of'
@@ -27,7 +36,14 @@ class Tuner:
     :param time_limit: max time available for tuning process
     :param int iterations: max number of iterations
     :param Log log: Log object to record messages
+    :param int n_jobs: number of processes used to evaluate the candidates
+    :param str model_type: type of the model used in the tuning store (the name of model class if None)
+    :param tuning_store: store of the tuning results used to seed the search (the history is not used if None)
     """
+    # the scores of default models by the model, its params and the data
+    _default_scores = OrderedDict()
+    _default_scores_max_size = 64
+
     __tuning_metric_by_type = {
         TaskTypesEnum.classification:
             make_scorer(roc_auc_score, greater_is_better=True, needs_proba=True),
@@ -40,7 +56,10 @@ class Tuner:
                  cross_val_fold_num: int,
                  time_limit,
                  iterations: int,
-                 log: Log = None):
+                 log: Log = None,
+                 n_jobs: int = 1,
+                 model_type: Optional[str] = None,
+                 tuning_store: Optional[TuningStore] = None):
         self.time_limit: timedelta \
             = time_limit
         self.trained_model = trained_model
@@ -49,8 +68,10 @@ class Tuner:
         self.cross_val_fold_num = cross_val_fold_num
         self.scorer = self.__tuning_metric_by_type.get(self.tune_data.task.task_type, None)
         self.max_iterations = iterations
-        self.default_score, self.default_params = \
-            self.get_cross_val_score_and_params(self.trained_model)
+        self.n_jobs = n_jobs
+        self.model_type = model_type or type(trained_model).__name__
+        self.tuning_store = tuning_store
+        self.default_score, self.default_params = self._default_score_and_params()
 
         if not log:
             self.log = default_log(__name__)
@@ -89,6 +110,42 @@ class Tuner:
 
         return score, params
 
+    def _default_score_and_params(self):
+        """
+        The score of the default model is reused for the same model and data
+        """
+        params = self.trained_model.get_params()
+        key = (type(self.trained_model).__name__, _params_key(params), data_fingerprint(self.tune_data),
+               self.cross_val_fold_num, repr(self.scorer))
+        cached_scores = Tuner._default_scores
+        if key in cached_scores:
+            cached_scores.move_to_end(key)
+            return cached_scores[key], params
+
+        score, params = self.get_cross_val_score_and_params(self.trained_model)
+        cached_scores[key] = score
+        if len(cached_scores) > Tuner._default_scores_max_size:
+            cached_scores.popitem(last=False)
+        return score, params
+
+    def _historical_params(self) -> List[dict]:
+        """
+        Returns the best tuned params of the model from the tuning store found for the similar datasets
+        """
+        if self.tuning_store is None:
+            return []
+        historical_params = []
+        for params in self.tuning_store.best_params(self.model_type, dataset_meta_features(self.tune_data)):
+            params = _tuned_params(params, self.params_range)
+            if params and params not in historical_params:
+                historical_params.append(params)
+        return historical_params
+
+    def _record_tuning_result(self, params: dict, score: float, tuning_time: float):
+        if self.tuning_store is not None and params:
+            self.tuning_store.record(self.model_type, dataset_meta_features(self.tune_data),
+                                     _tuned_params(params, self.params_range), score, tuning_time)
+
 
 class SklearnTuner(Tuner):
     """
@@ -100,13 +157,14 @@ class SklearnTuner(Tuner):
     def __init__(self, trained_model, tune_data: InputData,
                  params_range: dict,
                  cross_val_fold_num: int,
-                 time_limit, iterations):
+                 time_limit, iterations, **kwargs):
         super().__init__(trained_model=trained_model,
                          tune_data=tune_data,
                          params_range=params_range,
                          cross_val_fold_num=cross_val_fold_num,
                          time_limit=time_limit,
-                         iterations=iterations)
+                         iterations=iterations,
+                         **kwargs)
         self.search_strategy = None
 
     def tune(self) -> Union[Tuple[dict, object], Tuple[None, None]]:
@@ -168,34 +226,204 @@ class SklearnBayesSearchCV(SklearnTuner):
 
 class SklearnCustomRandomTuner(Tuner):
     """
-    Sklearn tuning strategy using customized version of RandomSearch with cross validation
+    Sklearn tuning strategy using customized version of RandomSearch with cross validation.
+    If n_jobs > 1, the folds of the candidates are evaluated concurrently in the pool of processes
+    and the evaluations in progress are cancelled when the time limit is reached.
+    The best params from the tuning store are evaluated before the random candidates
     """
 
     def tune(self) -> Union[Tuple[dict, object], Tuple[None, None]]:
         try:
+            start_time = time.perf_counter()
+            candidates = self._historical_params()[:self.max_iterations]
+            candidates.extend({k: nprand_choice(v) for k, v in self.params_range.items()}
+                              for _ in range(self.max_iterations - len(candidates)))
+            if self.n_jobs > 1:
+                scores = self._parallel_cross_val_scores(candidates)
+            else:
+                scores = self._cross_val_scores(candidates)
+
+            best_score, best_params = self.default_score, self.default_params
+            is_default_best = True
+            for params, score in zip(candidates, scores):
+                if self._is_score_better(previous=best_score, current=score):
+                    best_params, best_score = params, score
+                    is_default_best = False
+            self._record_tuning_result(best_params, best_score, time.perf_counter() - start_time)
+
+            if is_default_best:
+                return best_params, self.trained_model
+            best_model = clone(self.trained_model).set_params(**best_params)
+            best_model.fit(self.tune_data.features, self.tune_data.target)
+            return best_params, best_model
+        except Exception as ex:
+            self.log.error(f'{TUNER_ERROR_PREFIX} {ex}')
+            return None, None
+
+    def _cross_val_scores(self, candidates: list) -> list:
+        scores = []
+        with TunerTimer() as timer:
+            for params in candidates:
+                model = clone(self.trained_model).set_params(**params)
+                score, _ = self.get_cross_val_score_and_params(model)
+                scores.append(score)
+
+                if timer.is_time_limit_reached(self.time_limit):
+                    break
+        return scores
+
+    def _parallel_cross_val_scores(self, candidates: list) -> list:
+        features, target = self.tune_data.features, self.tune_data.target
+        cv = check_cv(self.cross_val_fold_num, target, classifier=is_classifier(self.trained_model))
+        folds = list(cv.split(features, target))
+
+        # the scores for the folds of each candidate
+        fold_scores = [[] for _ in candidates]
+        with TunerTimer() as timer, \
+                Pool(processes=self.n_jobs, initializer=_init_tuning_process,
+                     initargs=(self.trained_model, features, target, self.scorer)) as pool:
+            evaluations = [(candidate_id, pool.apply_async(_fold_score, (params, train_ids, test_ids)))
+                           for candidate_id, params in enumerate(candidates)
+                           for train_ids, test_ids in folds]
+            for candidate_id, evaluation in evaluations:
+                remaining_time = timer.remaining_time(self.time_limit).total_seconds()
+                try:
+                    fold_scores[candidate_id].append(evaluation.get(timeout=remaining_time))
+                except TimeoutError:
+                    # the pool is terminated with the evaluations in progress
+                    break
+
+        # only the candidates with all folds evaluated are compared
+        scores = []
+        for candidate_fold_scores in fold_scores:
+            if len(candidate_fold_scores) < len(folds):
+                break
+            scores.append(np.mean(candidate_fold_scores))
+        return scores
+
+
+# the model, the data and the scorer for the tuning in the worker process
+_process_tuning_context = None
+
+
+def _init_tuning_process(model, features, target, scorer):
+    global _process_tuning_context
+    _process_tuning_context = (model, features, target, scorer)
+
+
+def _fold_score(params: dict, train_ids: np.array, test_ids: np.array) -> float:
+    model, features, target, scorer = _process_tuning_context
+    try:
+        model = clone(model).set_params(**params)
+        model.fit(features[train_ids], target[train_ids])
+        return scorer(model, features[test_ids], target[test_ids])
+    except Exception:
+        # the failed fold is scored as in cross_val_score, so the candidate is not chosen
+        return np.nan
+
+
+class SklearnHyperbandTuner(Tuner):
+    """
+    Sklearn tuning strategy using Hyperband: the brackets of successive halving over the number of samples.
+    Many random candidates are evaluated with the cross validation on the small subsamples of data,
+    and only the best 1 / eta of them are evaluated on the eta times larger subsamples up to the full data.
+    The budget defined by the iterations is the number of cross validations on the full data
+
+    :param eta: reduction factor of the candidates number between the rounds of successive halving
+    :param min_samples: number of samples for the first round of the most exploratory bracket
+    """
+
+    def __init__(self, trained_model, tune_data: InputData, params_range: dict, cross_val_fold_num: int,
+                 time_limit, iterations: int, log: Log = None, n_jobs: int = 1,
+                 eta: int = 3, min_samples: int = 100, **kwargs):
+        super().__init__(trained_model=trained_model, tune_data=tune_data, params_range=params_range,
+                         cross_val_fold_num=cross_val_fold_num, time_limit=time_limit,
+                         iterations=iterations, log=log, n_jobs=n_jobs, **kwargs)
+        self.eta = eta
+        self.min_samples = min_samples
+        # the budget spent in the numbers of cross validations on the full data
+        self._spent_budget = 0.0
+
+    def tune(self) -> Union[Tuple[dict, object], Tuple[None, None]]:
+        try:
+            samples_num = len(self.tune_data.target)
+            min_samples = max(min(self.min_samples, samples_num), self.cross_val_fold_num * 2)
+            # the data smaller than the first round subsample is evaluated by the single bracket of full data
+            max_bracket = max(int(np.floor(np.log(samples_num / min_samples) / np.log(self.eta) + 1e-9)), 0)
+
+            # the samples are shuffled once, so the subsamples of rounds are nested
+            samples_order = np.random.permutation(samples_num)
+            best_score, best_params = self.default_score, self.default_params
+            is_default_best = True
+            self._spent_budget = 0.0
             with TunerTimer() as timer:
-                best_model = self.trained_model
-                best_score, best_params = self.default_score, self.default_params
-                for _ in range(self.max_iterations):
-                    params = {k: nprand_choice(v) for k, v in self.params_range.items()}
-                    self.trained_model.set_params(**params)
-                    score, _ = self.get_cross_val_score_and_params(self.trained_model)
-                    if self._is_score_better(previous=best_score, current=score):
-                        best_params = params
-                        best_model = self.trained_model
-                        best_score = score
-
-                    if timer.is_time_limit_reached(self.time_limit):
-                        break
-                return best_params, best_model
+                while not (self._is_budget_exhausted(timer) or timer.is_time_limit_reached(self.time_limit)):
+                    for bracket in range(max_bracket, -1, -1):
+                        bracket_result = self._successive_halving(bracket, max_bracket, samples_order,
+                                                                  min_samples, timer)
+                        if bracket_result is not None:
+                            score, params = bracket_result
+                            if self._is_score_better(previous=best_score, current=score):
+                                best_score, best_params = score, params
+                                is_default_best = False
+                        if self._is_budget_exhausted(timer):
+                            break
+
+            if is_default_best:
+                return best_params, self.trained_model
+            best_model = clone(self.trained_model).set_params(**best_params)
+            best_model.fit(self.tune_data.features, self.tune_data.target)
+            return best_params, best_model
         except Exception as ex:
             self.log.error(f'{TUNER_ERROR_PREFIX} {ex}')
             return None, None
 
+    def _successive_halving(self, bracket: int, max_bracket: int, samples_order: np.array,
+                            min_samples: int, timer: TunerTimer) -> Optional[Tuple[float, dict]]:
+        """
+        Runs the bracket of successive halving
+
+        :return: the score and the params of the best candidate on the full data
+        or None if the bracket is interrupted
+        """
+        samples_num = len(samples_order)
+        candidates_num = int(np.ceil((max_bracket + 1) / (bracket + 1) * self.eta ** bracket))
+        candidates = [{k: nprand_choice(v) for k, v in self.params_range.items()}
+                      for _ in range(candidates_num)]
+        scores = []
+        for halving_round in range(bracket + 1):
+            samples_fraction = self.eta ** (halving_round - bracket)
+            subsample = samples_order[:max(int(samples_num * samples_fraction), min_samples)]
+            scores = []
+            for params in candidates:
+                scores.append(self._subsample_score(params, subsample))
+                self._spent_budget += samples_fraction
+                if timer.is_time_limit_reached(self.time_limit):
+                    return None
+            ranking = np.argsort(scores)[::-1]
+            candidates = [candidates[idx] for idx in ranking[:max(len(candidates) // self.eta, 1)]]
+        return max(scores), candidates[0]
+
+    def _is_budget_exhausted(self, timer: TunerTimer) -> bool:
+        return timer.process_terminated or self._spent_budget >= self.max_iterations
+
+    def _subsample_score(self, params: dict, subsample: np.array) -> float:
+        model = clone(self.trained_model).set_params(**params)
+        try:
+            score = cross_val_score(model, self.tune_data.features[subsample], self.tune_data.target[subsample],
+                                    scoring=self.scorer, cv=self.cross_val_fold_num).mean()
+        except ValueError:
+            # the subsample may be unsuitable for the model (e.g. contain the single class)
+            score = np.nan
+        return -np.inf if np.isnan(score) else score
+
 
 class ForecastingCustomRandomTuner:
     """
-    Tuning strategy used for forecasting models
+    Tuning strategy used for forecasting models.
+    The candidates are fitted on the first part of data and evaluated on the second one.
+    If the model_type and the tuning_store are passed, the best params from the store are evaluated
+    before the random candidates
     """
 
     def __init__(self, **kwargs):
@@ -203,6 +431,8 @@ class ForecastingCustomRandomTuner:
             self.logger = default_log(__name__)
         else:
             self.logger = kwargs['log']
+        self.model_type = kwargs.get('model_type', None)
+        self.tuning_store = kwargs.get('tuning_store', None)
 
     # TODO discuss
     def tune(self,
@@ -221,29 +451,59 @@ class ForecastingCustomRandomTuner:
         :return: best parameters found via tuning
         :rtype: dict
         """
+        start_time = time.perf_counter()
         tune_train_data, tune_test_data = train_test_data_setup(tune_data, 0.5)
 
-        trained_model_default = fit(tune_test_data, default_params)
-        prediction_default = predict(trained_model_default, tune_test_data)
-        best_quality_metric = _regression_prediction_quality(prediction=prediction_default,
-                                                             real=tune_test_data.target)
+        # the repeated candidates (frequent for the small discrete search spaces) are not refitted
+        quality_by_params = {}
+
+        def quality_for_params(params: dict) -> float:
+            params_key = _params_key(params)
+            if params_key not in quality_by_params:
+                trained_model = fit(tune_train_data, params)
+                prediction = predict(trained_model, tune_test_data)
+                quality_by_params[params_key] = _forecasting_prediction_quality(prediction=prediction,
+                                                                                real=tune_test_data.target)
+            return quality_by_params[params_key]
+
+        best_quality_metric = quality_for_params(default_params)
         best_params = default_params
 
-        for _ in range(iterations):
-            random_params = get_random_params(params_range)
+        is_store_used = self.model_type is not None and self.tuning_store is not None
+        historical_params = []
+        if is_store_used:
+            historical_params = [_tuned_params(params, params_range) for params in
+                                 self.tuning_store.best_params(self.model_type, dataset_meta_features(tune_data))]
+            historical_params = [params for params in historical_params if params][:iterations]
+
+        for candidate_id in range(iterations):
             try:
-                trained_model_candidate = fit(tune_train_data, random_params)
-                prediction_candidate = predict(trained_model_candidate,
-                                               tune_test_data)
-                quality_metric = _regression_prediction_quality(prediction=prediction_candidate,
-                                                                real=tune_test_data.target)
+                if candidate_id < len(historical_params):
+                    params = historical_params[candidate_id]
+                else:
+                    params = get_random_params(params_range)
+                quality_metric = quality_for_params(params)
                 if quality_metric < best_quality_metric:
-                    best_params = random_params
+                    best_params, best_quality_metric = params, quality_metric
             except Exception as ex:
                 self.logger.error(f'{TUNER_ERROR_PREFIX} {ex}')
+
+        if is_store_used:
+            # the lower error is the better
+            self.tuning_store.record(self.model_type, dataset_meta_features(tune_data),
+                                     _tuned_params(best_params, params_range), -best_quality_metric,
+                                     time.perf_counter() - start_time)
         return best_params
 
 
+def _params_key(params: dict) -> str:
+    return str(sorted(params.items()))
+
+
+def _tuned_params(params: dict, params_range: dict) -> dict:
+    return {name: value for name, value in params.items() if name in params_range}
+
+
 def get_random_params(params_range):
     candidate_params = {}
     for param in params_range:
@@ -284,21 +544,41 @@ def _regression_prediction_quality(prediction, real):
     return mse(y_true=real, y_pred=prediction, squared=False)
 
 
+def _forecasting_prediction_quality(prediction, real):
+    prediction = np.asarray(prediction)
+    if len(prediction.shape) > 1:
+        # the multi-step forecasts for the steps are merged to the time series
+        prediction = multistep_prediction_to_ts(prediction)
+    real = np.asarray(real)[:len(prediction)]
+    prediction = prediction[:len(real)]
+    is_known = ~np.isnan(prediction)
+    return _regression_prediction_quality(prediction=prediction[is_known], real=real[is_known])
+
+
 class TPETuner(Tuner):
     """
-    Tuning strategy using Tree Parzen Estimator from hyperopt library
+    Tuning strategy using Tree Parzen Estimator from hyperopt library.
+    If n_jobs > 1, the batches of trials are evaluated in parallel and the speedup is logged.
+    The best params from the tuning store are evaluated as the first trials
     """
 
     def tune(self) -> Union[Tuple[dict, object], Tuple[None, None]]:
         try:
-            adapter = HyperoptAdapter(self)
+            start_time = time.perf_counter()
+            adapter = HyperoptAdapter(self, n_jobs=self.n_jobs, seed_params=self._historical_params())
             best_params, best_model = adapter.tune(iterations=self.max_iterations,
                                                    timeout_sec=self.time_limit.seconds)
+            if self.n_jobs > 1 and adapter.tuning_time > 0:
+                self.log.info(f'TPE trials are evaluated in {self.n_jobs} processes with the estimated speedup '
+                              f'{round(adapter.evaluation_time / adapter.tuning_time, 2)}')
             new_score, _ = self.get_cross_val_score_and_params(best_model)
 
             if self.is_better_than_default(new_score):
+                self._record_tuning_result(best_params, new_score, time.perf_counter() - start_time)
                 return best_params, best_model
             else:
+                self._record_tuning_result(self.default_params, self.default_score,
+                                           time.perf_counter() - start_time)
                 return self.default_params, self.trained_model
         except Exception as ex:
             self.log.error(f'{TUNER_ERROR_PREFIX} {ex}')
@@ -0,0 +1,119 @@
+import ast
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import List, Optional
+
+import numpy as np
+
+from fedot.core.data.meta_features import best_of_nearest_datasets
+from fedot.core.log import default_log
+from fedot.core.utils import default_fedot_data_dir
+
+TUNING_STORE_FILE_NAME = 'tuning_history.db'
+
+
+class TuningStore:
+    """
+    Persistent knowledge base of the tuning results stored in the local SQLite database.
+    Each record contains the model type, the meta-features of the dataset, the found params,
+    their score (the greater is the better) and the time of tuning.
+    The best params found for the most similar datasets are used to seed the search of tuners.
+    The errors of the database are logged and never interrupt the tuning
+
+    :param db_path: path to the database file (the file in the default FEDOT data dir if None)
+    :param max_records: max number of the latest records of model considered in the search of similar datasets
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_records: int = 1000):
+        self._db_path = db_path
+        self.max_records = max_records
+        self.log = default_log(__name__)
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path is None:
+            self._db_path = os.path.join(default_fedot_data_dir(), TUNING_STORE_FILE_NAME)
+        return self._db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        # the timeout allows the concurrent tuning processes to wait for the lock
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.execute('CREATE TABLE IF NOT EXISTS tuning_results ('
+                           'model_type TEXT, task_type TEXT, meta_features TEXT, '
+                           'params TEXT, score REAL, tuning_time REAL, created REAL)')
+        connection.execute('CREATE INDEX IF NOT EXISTS model_task_idx '
+                           'ON tuning_results (model_type, task_type)')
+        return connection
+
+    def record(self, model_type: str, meta_features: dict, params: dict,
+               score: float, tuning_time: float):
+        """
+        Saves the result of tuning
+
+        :param model_type: type of the tuned model
+        :param meta_features: meta-features of the dataset (see dataset_meta_features)
+        :param params: found params
+        :param score: score of the params (the greater is the better)
+        :param tuning_time: time of tuning (sec)
+        """
+        if score is None or not np.isfinite(score):
+            return
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute('INSERT INTO tuning_results VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                   (model_type, meta_features['task_type'],
+                                    json.dumps(meta_features, sort_keys=True), _encode_params(params),
+                                    float(score), float(tuning_time), time.time()))
+        except sqlite3.Error as ex:
+            self.log.warn(f'Tuning result can not be saved: {ex}')
+
+    def best_params(self, model_type: str, meta_features: dict, datasets_num: int = 3) -> List[dict]:
+        """
+        Returns the best params found for the model on the datasets most similar to the described one
+
+        :param model_type: type of the model
+        :param meta_features: meta-features of the dataset (see dataset_meta_features)
+        :param datasets_num: max number of the similar datasets
+        :return: list of params starting from the most similar dataset
+        """
+        try:
+            with closing(self._connect()) as connection, connection:
+                records = connection.execute('SELECT meta_features, params, score FROM tuning_results '
+                                             'WHERE model_type = ? AND task_type = ? '
+                                             'ORDER BY created DESC LIMIT ?',
+                                             (model_type, meta_features['task_type'],
+                                              self.max_records)).fetchall()
+        except sqlite3.Error as ex:
+            self.log.warn(f'Tuning history can not be loaded: {ex}')
+            return []
+
+        best_params = []
+        for params in best_of_nearest_datasets(meta_features, records, datasets_num):
+            decoded_params = _decode_params(params)
+            if decoded_params is not None and decoded_params not in best_params:
+                best_params.append(decoded_params)
+        return best_params
+
+
+def _encode_params(params: dict) -> str:
+    return repr({name: _python_value(value) for name, value in params.items()})
+
+
+def _decode_params(params: str) -> Optional[dict]:
+    try:
+        return ast.literal_eval(params)
+    except (ValueError, SyntaxError):
+        # the params with the values of custom types can not be restored
+        return None
+
+
+def _python_value(value):
+    """ Converts the numpy values (e.g. sampled from the params ranges) to the python ones """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (tuple, list)):
+        return type(value)(_python_value(item) for item in value)
+    return value
@@ -2,7 +2,8 @@ import json
 import os
 import warnings
 from dataclasses import dataclass
-from typing import Any, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from fedot.core.repository.dataset_types import DataTypesEnum
 from fedot.core.repository.json_evaluation import eval_field_str, eval_strategy_str, read_field
@@ -20,17 +21,30 @@ class ModelMetaInfo:
     tags: Optional[List[str]] = None
 
     def current_strategy(self, task: TaskTypesEnum):
-        if isinstance(self.supported_strategies, dict):
-            return self.supported_strategies.get(task, None)
-        return self.supported_strategies
+        strategy = self.supported_strategies
+        if isinstance(strategy, dict):
+            strategy = strategy.get(task, None)
+        if isinstance(strategy, tuple):
+            # the strategy class is imported on the first use
+            return _import_strategy(*strategy)
+        return strategy
 
 
 class ModelTypesRepository:
+    """
+    Repository of the meta-information of models. The models are indexed by id, task type and tag,
+    and the classes of evaluation strategies are imported lazily on the first use
+
+    :param repo_path: path to the JSON file of repository (the default repository is used if None)
+    """
     _repo = None
+    _models_by_id: Dict[str, ModelMetaInfo] = {}
+    _models_by_task: Dict[TaskTypesEnum, List[ModelMetaInfo]] = {}
+    _models_by_tag: Dict[str, List[ModelMetaInfo]] = {}
 
     def __init__(self, repo_path=None):
         if repo_path:
-            ModelTypesRepository._repo = self._initialise_repo(repo_path)
+            self._set_repo(self._initialise_repo(repo_path))
         if not repo_path and not ModelTypesRepository._repo:
             self._set_repo_to_default_state()
 
@@ -46,7 +60,24 @@ class ModelTypesRepository:
         repo_folder_path = str(os.path.dirname(__file__))
         file = 'data/model_repository.json'
         repo_path = os.path.join(repo_folder_path, file)
-        ModelTypesRepository._repo = self._initialise_repo(repo_path)
+        self._set_repo(self._initialise_repo(repo_path))
+
+    @staticmethod
+    def _set_repo(models: List[ModelMetaInfo]):
+        models_by_id, models_by_task, models_by_tag = {}, {}, {}
+        for model in models:
+            if model.id in models_by_id:
+                raise ValueError('Several models with same id in repository')
+            models_by_id[model.id] = model
+            for task_type in model.task_type:
+                models_by_task.setdefault(task_type, []).append(model)
+            for tag in model.tags:
+                models_by_tag.setdefault(tag, []).append(model)
+
+        ModelTypesRepository._repo = models
+        ModelTypesRepository._models_by_id = models_by_id
+        ModelTypesRepository._models_by_task = models_by_task
+        ModelTypesRepository._models_by_tag = models_by_tag
 
     def _initialise_repo(self, repo_path: str) -> List[ModelMetaInfo]:
         with open(repo_path) as repository_json_file:
@@ -57,23 +88,22 @@ class ModelTypesRepository:
 
         models_list = []
 
-        for current_model_key in models_json:
-            model_properties = [model_properties for model_key, model_properties in list(models_json.items())
-                                if model_key == current_model_key][0]
+        for current_model_key, model_properties in models_json.items():
             model_metadata = metadata_json[model_properties['meta']]
 
             task_types = eval_field_str(model_metadata['tasks'])
             input_type = eval_field_str(model_metadata['input_type'])
             output_type = eval_field_str(model_metadata['output_type'])
 
+            # the strategies are stored as the (namespace, class name) pairs until the first use
             strategies_json = model_metadata['strategies']
             if isinstance(strategies_json, list):
-                supported_strategies = eval_strategy_str(strategies_json)
+                supported_strategies = tuple(strategies_json)
             else:
                 supported_strategies = {}
                 for strategy_dict_key in strategies_json.keys():
-                    supported_strategies[eval_field_str(strategy_dict_key)] = eval_strategy_str(
-                        strategies_json[strategy_dict_key])
+                    supported_strategies[eval_field_str(strategy_dict_key)] = \
+                        tuple(strategies_json[strategy_dict_key])
 
             accepted_node_types = read_field(model_metadata, 'accepted_node_types', ['any'])
             forbidden_node_types = read_field(model_metadata, 'forbidden_node_types', [])
@@ -104,17 +134,15 @@ class ModelTypesRepository:
         return ModelTypesRepository._repo
 
     def model_info_by_id(self, id: str) -> Optional[ModelMetaInfo]:
-        models_with_id = [m for m in ModelTypesRepository._repo if m.id == id]
-        if len(models_with_id) > 1:
-            raise ValueError('Several models with same id in repository')
-        if len(models_with_id) == 0:
-            warnings.warn('Model {id} not found in the repository')
-            return None
-        return models_with_id[0]
+        model_info = ModelTypesRepository._models_by_id.get(id, None)
+        if model_info is None:
+            warnings.warn(f'Model {id} not found in the repository')
+        return model_info
 
     def models_with_tag(self, tags: List[str], is_full_match: bool = False):
-        models_info = [m for m in ModelTypesRepository._repo if
-                       _is_tags_contains_in_model(tags, m.tags, is_full_match)]
+        models_info = self._models_with_any_tag(tags)
+        if is_full_match:
+            models_info = [m for m in models_info if _is_tags_contains_in_model(tags, m.tags, is_full_match)]
         return [m.id for m in models_info], models_info
 
     def suitable_model(self, task_type: TaskTypesEnum,
@@ -128,11 +156,18 @@ class ModelTypesRepository:
             if not tags or excluded_default_tag not in tags:
                 forbidden_tags.append(excluded_default_tag)
 
-        models_info = [m for m in ModelTypesRepository._repo if task_type in m.task_type and
+        forbidden_ids = {m.id for m in self._models_with_any_tag(forbidden_tags)}
+        models_info = [m for m in ModelTypesRepository._models_by_task.get(task_type, []) if
                        (not tags or _is_tags_contains_in_model(tags, m.tags, is_full_match)) and
-                       (not forbidden_tags or not _is_tags_contains_in_model(forbidden_tags, m.tags, False))]
+                       m.id not in forbidden_ids]
         return [m.id for m in models_info], models_info
 
+    @staticmethod
+    def _models_with_any_tag(tags: List[str]) -> List[ModelMetaInfo]:
+        """ Returns the models with any of the tags in the order of repository """
+        models_ids = {m.id for tag in tags for m in ModelTypesRepository._models_by_tag.get(tag, [])}
+        return [m for m in ModelTypesRepository._models_by_id.values() if m.id in models_ids]
+
 
 def _is_tags_contains_in_model(candidate_tags: List[str], model_tags: List[str], is_full_match: bool):
     matches = ([(tag in model_tags) for tag in candidate_tags])
@@ -142,6 +177,11 @@ def _is_tags_contains_in_model(candidate_tags: List[str], model_tags: List[str],
         return any(matches)
 
 
+@lru_cache(maxsize=None)
+def _import_strategy(namespace: str, strategy_name: str):
+    return eval_strategy_str([namespace, strategy_name])
+
+
 def atomized_model_type():
     return 'atomized_model'
 
@@ -1,3 +1,7 @@
+import time
+from copy import deepcopy
+from multiprocessing import Pool
+
 import numpy as np
 from scipy import interpolate
 
@@ -42,7 +46,11 @@ class SimpleGapFiller:
                                  n_neighbors: int = 5):
         """
         Method allows to restore missing values in an array
-        using Savitzky-Golay filter
+        using Savitzky-Golay filter. Each gap element is approximated
+        by the polynomial fitted on the nearest known elements of the
+        source array. The filled gaps are not used as the neighbours of
+        the next gaps (unlike the previous sequential filling), so the
+        results differ if the gaps are closer to each other than n_neighbors
 
         :param input_data: array with gaps
         :param degree: degree of a polynomial function
@@ -53,34 +61,14 @@ class SimpleGapFiller:
 
         output_data = np.array(input_data)
 
-        i_gaps = np.ravel(np.argwhere(output_data == self.gap_value))
-
-        # Iterately fill in the gaps in the time series
-        for gap_index in i_gaps:
-            # Indexes of known elements (updated at each iteration)
-            i_known = np.argwhere(output_data != self.gap_value)
-            i_known = np.ravel(i_known)
-
-            # Based on the indexes we calculate how far from the gap
-            # the known values are located
-            id_distances = np.abs(i_known - gap_index)
-
-            # Now we know the indices of the smallest values in the array,
-            # so sort indexes
-            sorted_idx = np.argsort(id_distances)
-            nearest_values = []
-            nearest_indices = []
-            for i in sorted_idx[:n_neighbors]:
-                time_index = i_known[i]
-                nearest_values.append(output_data[time_index])
-                nearest_indices.append(time_index)
-            nearest_values = np.array(nearest_values)
-            nearest_indices = np.array(nearest_indices)
-
-            local_coefs = np.polyfit(nearest_indices, nearest_values, degree)
-            est_value = np.polyval(local_coefs, gap_index)
-            output_data[gap_index] = est_value
+        is_gap = output_data == self.gap_value
+        i_gaps = np.flatnonzero(is_gap)
+        i_known = np.flatnonzero(~is_gap)
 
+        output_data[i_gaps] = _local_poly_values(i_known, output_data[i_known],
+                                                 centers=i_gaps, points=i_gaps,
+                                                 points_per_center=np.ones(len(i_gaps), dtype=int),
+                                                 degree=degree, n_neighbors=n_neighbors)
         return output_data
 
     def batch_poly_approximation(self, input_data, degree: int = 3,
@@ -89,7 +77,11 @@ class SimpleGapFiller:
         Method allows to restore missing values in an array using
         batch polynomial approximations.
         Approximation is applied not for individual omissions, but for
-        intervals of omitted values
+        intervals of omitted values: the polynomial is fitted on the
+        nearest known elements of the source array to the center of the
+        interval. The filled intervals are not used as the neighbours of
+        the next intervals (unlike the previous sequential filling), so the
+        results differ if the intervals are closer to each other than n_neighbors
 
         :param input_data: array with gaps
         :param degree: degree of a polynomial function
@@ -100,47 +92,21 @@ class SimpleGapFiller:
 
         output_data = np.array(input_data)
 
-        # Gap indices
-        gap_list = np.ravel(np.argwhere(output_data == self.gap_value))
-        new_gap_list = self._parse_gap_ids(gap_list)
-
-        # Iterately fill in the gaps in the time series
-        for gap in new_gap_list:
-            # Find the center point of the gap
-            center_index = int((gap[0] + gap[-1]) / 2)
-
-            # Indexes of known elements (updated at each iteration)
-            i_known = np.argwhere(output_data != self.gap_value)
-            i_known = np.ravel(i_known)
-
-            # Based on the indexes we calculate how far from the gap
-            # the known values are located
-            id_distances = np.abs(i_known - center_index)
-
-            # Now we know the indices of the smallest values in the array,
-            # so sort indexes
-            sorted_idx = np.argsort(id_distances)
-
-            # Nearest known values to the gap
-            nearest_values = []
-            # And their indexes
-            nearest_indices = []
-            for i in sorted_idx[:n_neighbors]:
-                # Getting the index value for the series - output_data
-                time_index = i_known[i]
-                # Using this index, we get the value of each of the "neighbors"
-                nearest_values.append(output_data[time_index])
-                nearest_indices.append(time_index)
-            nearest_values = np.array(nearest_values)
-            nearest_indices = np.array(nearest_indices)
-
-            # Local approximation by an n-th degree polynomial
-            local_coefs = np.polyfit(nearest_indices, nearest_values, degree)
-
-            # Estimate our interval according to the selected coefficients
-            est_value = np.polyval(local_coefs, gap)
-            output_data[gap] = est_value
-
+        is_gap = output_data == self.gap_value
+        i_gaps = np.flatnonzero(is_gap)
+        i_known = np.flatnonzero(~is_gap)
+
+        # The first and the last indices of the continuous intervals of gaps
+        bounds = np.diff(np.concatenate(([0], is_gap.astype(np.int8), [0])))
+        gap_starts = np.flatnonzero(bounds == 1)
+        gap_ends = np.flatnonzero(bounds == -1) - 1
+        # Find the center points of the gaps
+        centers = (gap_starts + gap_ends) // 2
+
+        output_data[i_gaps] = _local_poly_values(i_known, output_data[i_known],
+                                                 centers=centers, points=i_gaps,
+                                                 points_per_center=gap_ends - gap_starts + 1,
+                                                 degree=degree, n_neighbors=n_neighbors)
         return output_data
 
     def _parse_gap_ids(self, gap_list: list) -> list:
@@ -171,6 +137,77 @@ class SimpleGapFiller:
         return new_gap_list
 
 
+def _nearest_known_windows(i_known: np.array, centers: np.array, n_neighbors: int) -> np.array:
+    """
+    Finds the n_neighbors nearest known elements for each center. The nearest elements
+    form the continuous window in the sorted array of known indices, so the start of the
+    window is found by the binary search between the neighbours of the insertion point
+
+    :param i_known: sorted indices of the known elements
+    :param centers: indices of the points to find neighbours for
+    :param n_neighbors: number of neighbours
+    :return: positions of the first neighbours in i_known
+    """
+    max_start = len(i_known) - n_neighbors
+    insertion_points = np.searchsorted(i_known, centers)
+    low = np.clip(insertion_points - n_neighbors, 0, max_start)
+    high = np.clip(insertion_points, 0, max_start)
+    is_active = low < high
+    while np.any(is_active):
+        middle = (low + high) // 2
+        last_in_window = np.where(is_active, middle + n_neighbors, 0)
+        # the window is shifted right if its first element is farther than the element after the window
+        is_shifted = (centers - i_known[middle]) > (i_known[last_in_window] - centers)
+        low = np.where(is_active & is_shifted, middle + 1, low)
+        high = np.where(is_active & ~is_shifted, middle, high)
+        is_active = low < high
+    return low
+
+
+def _local_poly_values(i_known: np.array, known_values: np.array, centers: np.array,
+                       points: np.array, points_per_center: np.array,
+                       degree: int, n_neighbors: int, chunk_size: int = 2 ** 14) -> np.array:
+    """
+    Fits the polynomials on the nearest known elements for all centers by the batched
+    least squares and estimates the values in the points related to the centers
+
+    :param i_known: sorted indices of the known elements
+    :param known_values: values of the known elements
+    :param centers: indices of the centers of the local approximations
+    :param points: indices of the points to estimate (ordered by the related centers)
+    :param points_per_center: number of the points to estimate for each center
+    :param degree: degree of a polynomial function
+    :param n_neighbors: number of the known elements the approximation is based on
+    :param chunk_size: number of the polynomials fitted at once
+    :return: estimated values in the points
+    """
+    n_neighbors = min(n_neighbors, len(i_known))
+    # the degree is limited by the number of points to get the unique solution
+    powers = np.arange(min(degree, n_neighbors - 1) + 1)
+    estimated = np.empty(len(points), dtype=np.float64)
+    centers_of_points = np.repeat(np.arange(len(centers)), points_per_center)
+    points_bounds = np.concatenate(([0], np.cumsum(points_per_center)))
+
+    for chunk_start in range(0, len(centers), chunk_size):
+        chunk_centers = centers[chunk_start:chunk_start + chunk_size]
+        window_starts = _nearest_known_windows(i_known, chunk_centers, n_neighbors)
+        neighbours = window_starts[:, np.newaxis] + np.arange(n_neighbors)
+
+        # The polynomials are fitted in the shifted and scaled coordinates for stability
+        shifts = i_known[neighbours] - chunk_centers[:, np.newaxis]
+        scales = np.abs(shifts).max(axis=1).astype(np.float64)
+        vander = (shifts / scales[:, np.newaxis])[:, :, np.newaxis] ** powers
+        vander_t = np.transpose(vander, (0, 2, 1))
+        coefs = np.linalg.solve(np.matmul(vander_t, vander),
+                                np.matmul(vander_t, known_values[neighbours][:, :, np.newaxis]))[:, :, 0]
+
+        chunk_points = slice(points_bounds[chunk_start], points_bounds[chunk_start + len(chunk_centers)])
+        point_centers = centers_of_points[chunk_points] - chunk_start
+        scaled_points = (points[chunk_points] - chunk_centers[point_centers]) / scales[point_centers]
+        estimated[chunk_points] = np.sum(coefs[point_centers] * scaled_points[:, np.newaxis] ** powers, axis=1)
+    return estimated
+
+
 class ModelGapFiller(SimpleGapFiller):
     """
     Class used for filling in the gaps in time series
@@ -178,17 +215,36 @@ class ModelGapFiller(SimpleGapFiller):
     :param gap_value: value, which mask gap elements in array
     :param chain: TsForecastingChain object for filling in the gaps
     :param max_window_size: window length
+    :param n_jobs: number of processes used to fill in the gaps. If n_jobs > 1, the gaps
+    are filled in independently in parallel, so the previous gaps in the training parts
+    are filled in by the linear interpolation instead of the chain predictions (see forward_filling).
+    The gaps that can not be filled in this way (e.g. if the known part is too short)
+    are filled in sequentially afterwards
+    :param refit_threshold: the fitted chain is reused for the next gap of the same length
+    if its training part is the extension of the previous one by less than this fraction.
+    The forward and inverse predictions use separate chains. Not used if n_jobs > 1
     """
 
-    def __init__(self, gap_value, chain, max_window_size: int = 50):
+    def __init__(self, gap_value, chain, max_window_size: int = 50,
+                 n_jobs: int = 1, refit_threshold: float = 0.05):
         super().__init__(gap_value)
         self.chain = chain
         self.max_window_size = max_window_size
+        self.n_jobs = n_jobs
+        self.refit_threshold = refit_threshold
+
+        # spent time (sec) for each gap by the index of the first element of the gap
+        self.gaps_time = {}
+        # the chain, its training part and the gap length by the direction of prediction
+        self._fitted_chains = {}
 
     def forward_inverse_filling(self, input_data):
         """
         Method fills in the gaps in the input array using forward and inverse
-        directions of predictions
+        directions of predictions. If n_jobs > 1, the previous gaps in the training
+        parts of forward predictions are filled in by the linear interpolation,
+        so the accuracy can be lower than the accuracy of the sequential filling
+        that uses the chain predictions for them
 
         :param input_data: data with gaps to filling in the gaps in it
         :return: array without gaps
@@ -199,35 +255,25 @@ class ModelGapFiller(SimpleGapFiller):
         # Gap indices
         gap_list = np.ravel(np.argwhere(output_data == self.gap_value))
         new_gap_list = self._parse_gap_ids(gap_list)
+        self.gaps_time = {}
+        self._fitted_chains = {}
+
+        if self.n_jobs > 1:
+            return self._parallel_filling(output_data, new_gap_list, bidirectional=True)
 
         # Iterately fill in the gaps in the time series
         for batch_index in range(len(new_gap_list)):
-
-            preds = []
-            weights = []
-            # Two predictions are generated for each gap - forward and backward
-            for direction_function in [self._forward, self._inverse]:
-
-                weights_list, predicted_list = direction_function(output_data,
-                                                                  batch_index,
-                                                                  new_gap_list)
-                weights.append(weights_list)
-                preds.append(predicted_list)
-
-            preds = np.array(preds)
-            weights = np.array(weights)
-            result = np.average(preds, axis=0, weights=weights)
-
-            gap = new_gap_list[batch_index]
-            # Replace gaps in an array with predicted values
-            output_data[gap] = result
+            self._fill_gap(output_data, batch_index, new_gap_list, bidirectional=True)
 
         return output_data
 
     def forward_filling(self, input_data):
         """
         Method fills in the gaps in the input array using chain with only
-        forward direction (i.e. time series forecasting)
+        forward direction (i.e. time series forecasting). If n_jobs > 1, the previous
+        gaps in the training parts are filled in by the linear interpolation,
+        so the accuracy can be lower than the accuracy of the sequential filling
+        that uses the chain predictions for them
 
         :param input_data: data with gaps to filling in the gaps in it
         :return: array without gaps
@@ -238,21 +284,76 @@ class ModelGapFiller(SimpleGapFiller):
         # Gap indices
         gap_list = np.ravel(np.argwhere(output_data == self.gap_value))
         new_gap_list = self._parse_gap_ids(gap_list)
+        self.gaps_time = {}
+        self._fitted_chains = {}
 
-        # Iterately fill in the gaps in the time series
-        for gap in new_gap_list:
-            # The entire time series is used for training until the gap
-            timeseries_train_part = output_data[:gap[0]]
-
-            # Adaptive prediction interval length
-            len_gap = len(gap)
+        if self.n_jobs > 1:
+            return self._parallel_filling(output_data, new_gap_list, bidirectional=False)
 
-            # Chain for the task of filling in gaps
-            predicted = self.__chain_fit_predict(timeseries_train_part,
-                                                 len_gap)
+        # Iterately fill in the gaps in the time series
+        for batch_index in range(len(new_gap_list)):
+            self._fill_gap(output_data, batch_index, new_gap_list, bidirectional=False)
+        return output_data
 
-            # Replace gaps in an array with predicted values
+    def _fill_gap(self, output_data: np.array, batch_index: int, gaps: list, bidirectional: bool):
+        """
+        Fills in the gap with the forward prediction or with the weighted average
+        of the forward and inverse predictions
+        """
+        start_time = time.perf_counter()
+
+        preds = []
+        weights = []
+        # Two predictions are generated for each gap if bidirectional - forward and backward
+        directions = [self._forward, self._inverse] if bidirectional else [self._forward]
+        for direction_function in directions:
+            weights_list, predicted_list = direction_function(output_data,
+                                                              batch_index,
+                                                              gaps)
+            weights.append(weights_list)
+            preds.append(predicted_list)
+
+        result = np.average(np.array(preds), axis=0, weights=np.array(weights))
+
+        gap = gaps[batch_index]
+        # Replace gaps in an array with predicted values
+        output_data[gap] = result
+        self.gaps_time[gap[0]] = time.perf_counter() - start_time
+
+    def _parallel_filling(self, output_data: np.array, gaps: list, bidirectional: bool):
+        """
+        Fills in the gaps independently in the pool of processes. The forward chains are trained
+        on the whole time series before the gap with the previous gaps filled in by the linear
+        interpolation, the inverse chains are trained on the known parts before the next gap
+        (as in the sequential filling). The gaps failed in the pool are filled in sequentially
+        """
+        is_known = output_data != self.gap_value
+        all_ids = np.arange(len(output_data))
+        interpolated_data = np.interp(all_ids, all_ids[is_known], output_data[is_known])
+
+        tasks = []
+        for batch_index, gap in enumerate(gaps):
+            forward_train_part = interpolated_data[:gap[0]]
+            inverse_train_part = None
+            if bidirectional:
+                next_gap_start = gaps[batch_index + 1][0] if batch_index < len(gaps) - 1 else len(output_data)
+                inverse_train_part = np.flip(output_data[(gap[-1] + 1):next_gap_start])
+            tasks.append((forward_train_part, inverse_train_part, len(gap)))
+
+        with Pool(processes=self.n_jobs, initializer=_init_gap_filling_process,
+                  initargs=(self.chain, self.max_window_size)) as pool:
+            results = pool.map(_fill_gap_in_process, tasks)
+
+        failed_batch_ids = []
+        for batch_index, (gap, (predicted, spent_time)) in enumerate(zip(gaps, results)):
+            if predicted is None:
+                failed_batch_ids.append(batch_index)
+                continue
             output_data[gap] = predicted
+            self.gaps_time[gap[0]] = spent_time
+
+        for batch_index in failed_batch_ids:
+            self._fill_gap(output_data, batch_index, gaps, bidirectional)
         return output_data
 
     def _forward(self, timeseries_data, batch_index, new_gap_list):
@@ -276,8 +377,8 @@ class ModelGapFiller(SimpleGapFiller):
         # Adaptive prediction interval length
         len_gap = len(gap)
         predicted_values = self.__chain_fit_predict(timeseries_train_part,
-                                                    len_gap)
-        weights_list = np.arange(len_gap, 0, -1)
+                                                    len_gap, direction='forward')
+        weights_list = _forward_weights(len_gap)
         return weights_list, predicted_values
 
     def _inverse(self, timeseries_data, batch_index, new_gap_list):
@@ -309,44 +410,105 @@ class ModelGapFiller(SimpleGapFiller):
         len_gap = len(gap)
 
         predicted_values = self.__chain_fit_predict(timeseries_train_part,
-                                                    len_gap)
+                                                    len_gap, direction='inverse')
 
         predicted_values = np.flip(predicted_values)
-        weights_list = np.arange(1, (len_gap + 1), 1)
+        weights_list = _inverse_weights(len_gap)
         return weights_list, predicted_values
 
-    def __chain_fit_predict(self, timeseries_train: np.array, len_gap: int):
+    def __chain_fit_predict(self, timeseries_train: np.array, len_gap: int, direction: str = 'forward'):
         """
         The method makes a prediction as a sequence of elements based on a
         training sample. There are two main parts: fit model and predict.
+        The fitted chain is reused if the training sample is barely changed
 
         :param timeseries_train: part of the time series for training the model
         :param len_gap: number of elements in the gap
+        :param direction: direction of prediction ('forward' or 'inverse'), each one has its own chain
         :return: array without gaps
         """
+        if direction in self._fitted_chains:
+            chain, fitted_part, fitted_len_gap = self._fitted_chains[direction]
+            is_fit_required = not self._is_fitted_chain_reusable(fitted_part, fitted_len_gap,
+                                                                 timeseries_train, len_gap)
+        else:
+            chain = self.chain if direction == 'forward' else deepcopy(self.chain)
+            is_fit_required = True
+        if is_fit_required:
+            self._fitted_chains[direction] = (chain, np.array(timeseries_train), len_gap)
+
+        return _chain_fit_predict(chain, self.max_window_size, timeseries_train, len_gap,
+                                  is_fit_required=is_fit_required)
+
+    def _is_fitted_chain_reusable(self, fitted_part: np.array, fitted_len_gap: int,
+                                  timeseries_train: np.array, len_gap: int) -> bool:
+        if len_gap != fitted_len_gap or len(timeseries_train) < len(fitted_part):
+            return False
+        growth = (len(timeseries_train) - len(fitted_part)) / len(fitted_part)
+        return (growth < self.refit_threshold and
+                np.array_equal(timeseries_train[:len(fitted_part)], fitted_part))
+
+
+def _forward_weights(len_gap: int):
+    return np.arange(len_gap, 0, -1)
+
+
+def _inverse_weights(len_gap: int):
+    return np.arange(1, (len_gap + 1), 1)
+
+
+def _chain_fit_predict(chain, max_window_size: int, timeseries_train: np.array, len_gap: int,
+                       is_fit_required: bool = True):
+    task = Task(TaskTypesEnum.ts_forecasting,
+                TsForecastingParams(forecast_length=len_gap,
+                                    max_window_size=max_window_size,
+                                    return_all_steps=False,
+                                    make_future_prediction=True))
+
+    input_data = InputData(idx=np.arange(0, len(timeseries_train)),
+                           features=None,
+                           target=timeseries_train,
+                           task=task,
+                           data_type=DataTypesEnum.ts)
+
+    # Making predictions for the missing part in the time series
+    if is_fit_required:
+        chain.fit_from_scratch(input_data)
+
+    # "Test data" for making prediction for a specific length
+    test_data = InputData(idx=np.arange(0, len_gap),
+                          features=None,
+                          target=None,
+                          task=task,
+                          data_type=DataTypesEnum.ts)
+
+    predicted_values = chain.forecast(initial_data=input_data,
+                                      supplementary_data=test_data).predict
+    return predicted_values
+
+
+# the chain and the window size for the gap filling in the worker process
+_process_chain, _process_max_window_size = None, None
+
+
+def _init_gap_filling_process(chain, max_window_size: int):
+    global _process_chain, _process_max_window_size
+    _process_chain, _process_max_window_size = chain, max_window_size
+
+
+def _fill_gap_in_process(task: tuple):
+    forward_train_part, inverse_train_part, len_gap = task
+    start_time = time.perf_counter()
+
+    try:
+        predicted = _chain_fit_predict(_process_chain, _process_max_window_size, forward_train_part, len_gap)
+        if inverse_train_part is not None:
+            inverse_predicted = np.flip(_chain_fit_predict(_process_chain, _process_max_window_size,
+                                                           inverse_train_part, len_gap))
+            predicted = np.average(np.array([predicted, inverse_predicted]), axis=0,
+                                   weights=np.array([_forward_weights(len_gap), _inverse_weights(len_gap)]))
+    except Exception:
+        # the gap is filled in sequentially in the main process
+        predicted = None
 
-        task = Task(TaskTypesEnum.ts_forecasting,
-                    TsForecastingParams(forecast_length=len_gap,
-                                        max_window_size=self.max_window_size,
-                                        return_all_steps=False,
-                                        make_future_prediction=True))
-
-        input_data = InputData(idx=np.arange(0, len(timeseries_train)),
-                               features=None,
-                               target=timeseries_train,
-                               task=task,
-                               data_type=DataTypesEnum.ts)
-
-        # Making predictions for the missing part in the time series
-        self.chain.fit_from_scratch(input_data)
-
-        # "Test data" for making prediction for a specific length
-        test_data = InputData(idx=np.arange(0, len_gap),
-                              features=None,
-                              target=None,
-                              task=task,
-                              data_type=DataTypesEnum.ts)
-
-        predicted_values = self.chain.forecast(initial_data=input_data,
-                                               supplementary_data=test_data).predict
-        return predicted_values
+    return predicted, time.perf_counter() - start_time
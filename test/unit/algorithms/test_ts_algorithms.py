@@ -1,6 +1,13 @@
+from unittest.mock import patch
+
 import numpy as np
+from numpy import nan
+from statsmodels.tsa.seasonal import seasonal_decompose
 
-from fedot.core.algorithms.time_series.lagged_features import prepare_lagged_ts_for_prediction
+from fedot.core.algorithms.time_series.history_buffer import TsHistoryBuffer
+from fedot.core.algorithms.time_series.lagged_features import lagged_features_and_target, \
+    prepare_lagged_ts_for_prediction
+from fedot.core.algorithms.time_series.scale import TsDecompositionCache
 from fedot.core.data.transformation import ts_to_lagged_table
 from test.unit.data_operations.test_transform import synthetic_forecasting_problem
 
@@ -22,3 +29,61 @@ def test_lagged_features_preparation():
     assert (len(lagged_data.target) >
             len(prepared_lagged_data_predict.features) >
             len(prepared_lagged_data_fit.features) > 0)
+
+
+def test_lagged_features_and_target_are_views():
+    target = np.arange(0, 6, dtype=float)
+
+    features, multistep_target = lagged_features_and_target(target, window_len=2, forecast_length=2)
+
+    assert np.shares_memory(features, multistep_target)
+    assert not features.flags.writeable
+    assert np.allclose(features, [[nan, nan], [0, nan], [1, 0], [2, 1], [3, 2], [4, 3], [5, 4]],
+                       equal_nan=True)
+    assert np.allclose(multistep_target, [[0, 1], [1, 2], [2, 3], [3, 4], [4, 5], [5, nan], [nan, nan]],
+                       equal_nan=True)
+
+
+def test_ts_history_buffer_keeps_last_values():
+    ring_buffer = TsHistoryBuffer(np.arange(3), capacity=4)
+    ring_buffer.extend([3, 4])
+    assert np.array_equal(ring_buffer.values, [1, 2, 3, 4])
+
+    ring_buffer.extend(np.arange(5, 11))
+    assert np.array_equal(ring_buffer.values, [7, 8, 9, 10])
+    assert ring_buffer.values.flags.c_contiguous
+
+    growing_buffer = TsHistoryBuffer(np.zeros((2, 2)), max_len=5)
+    growing_buffer.extend(np.ones((3, 2)))
+    assert growing_buffer.values.shape == (5, 2)
+
+
+def test_ts_decomposition_cache_extends_trend():
+    np.random.seed(1)
+    time_series = np.cumsum(np.random.randn(500)) + np.sin(np.arange(500) / 4)
+    period = 25
+    cache = TsDecompositionCache()
+    cache.clear()
+
+    trend = cache.trend(time_series[:400], period)
+    assert cache.trend(time_series[:400].copy(), period) is trend
+
+    extended_trend = cache.trend(time_series, period)
+    expected_trend = seasonal_decompose(time_series, period=period, extrapolate_trend='freq').trend
+
+    assert np.allclose(extended_trend, expected_trend)
+    assert np.allclose(extended_trend[:300], trend[:300])
+
+
+def test_ts_decomposition_cache_size_shared_by_instances():
+    np.random.seed(1)
+    first_series, second_series = np.random.randn(2, 100)
+    TsDecompositionCache().clear()
+
+    with patch.object(TsDecompositionCache, 'max_size', 1):
+        first_period = TsDecompositionCache().period(first_series)
+        TsDecompositionCache().period(second_series)
+
+        assert len(TsDecompositionCache._periods) == 1
+        assert TsDecompositionCache().period(first_series) == first_period
+    TsDecompositionCache().clear()
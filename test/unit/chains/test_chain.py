@@ -1,6 +1,7 @@
 import os
 from copy import deepcopy
 from random import seed
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -10,7 +11,9 @@ from sklearn.datasets import load_iris
 from fedot.core.chains.chain import Chain
 from fedot.core.chains.node import PrimaryNode, SecondaryNode
 from fedot.core.data.data import InputData, train_test_data_setup
+from fedot.core.models.model import Model
 from fedot.core.repository.dataset_types import DataTypesEnum
+from fedot.core.repository.model_types_repository import ModelTypesRepository
 from fedot.core.repository.tasks import Task, TaskTypesEnum, TsForecastingParams
 from fedot.core.utils import probs_to_labels
 
@@ -235,3 +238,53 @@ def test_chain_with_wrong_data():
 
     with pytest.raises(ValueError):
         chain.fit(data)
+
+
+def test_chain_fit_skips_unconsumed_train_prediction(data_setup):
+    train, test = train_test_data_setup(data_setup)
+    first = PrimaryNode(model_type='logit')
+    second = PrimaryNode(model_type='lda')
+    final = SecondaryNode(model_type='logit', nodes_from=[first, second])
+    chain = Chain(final)
+
+    with patch.object(Model, 'predict', autospec=True, side_effect=Model.predict) as model_predict:
+        assert chain.fit(input_data=train, is_output_required=False) is None
+        # only the outputs of the primary nodes are consumed
+        assert model_predict.call_count == 2
+
+        model_predict.reset_mock()
+        chain.fit(input_data=train, is_output_required=False)
+        # the models of all nodes are cached
+        assert model_predict.call_count == 0
+
+    assert chain.predict(test).predict.shape[0] == test.target.shape[0]
+    assert chain.fit(input_data=train).predict.shape[0] == train.target.shape[0]
+
+
+def test_compiled_chain_predict_equals_chain_predict(data_setup):
+    train, test = train_test_data_setup(data_setup)
+    shared = PrimaryNode(model_type='pca_data_model')
+    first = SecondaryNode(model_type='logit', nodes_from=[shared])
+    second = SecondaryNode(model_type='lda', nodes_from=[shared])
+    final = SecondaryNode(model_type='knn', nodes_from=[first, second])
+    chain = Chain(final)
+
+    with pytest.raises(ValueError):
+        chain.compile(task=train.task)
+
+    chain.fit(input_data=train)
+    compiled_chain = chain.compile()
+    assert compiled_chain.length == chain.length
+
+    single_row = test.subset(0, 0)
+    output_modes = ['default', 'labels', 'full_probs']
+    expected = [chain.predict(data, output_mode=mode).predict for data in [test, single_row] for mode in output_modes]
+
+    with patch.object(ModelTypesRepository, 'model_info_by_id') as model_info_by_id:
+        actual = [compiled_chain.predict(data, output_mode=mode).predict
+                  for data in [test, single_row] for mode in output_modes]
+        # the model repository is not accessed by the compiled chain
+        assert model_info_by_id.call_count == 0
+
+    assert all(np.array_equal(actual_predict, expected_predict)
+               for actual_predict, expected_predict in zip(actual, expected))
@@ -1,15 +1,17 @@
 import os
 from datetime import timedelta
 from random import seed
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 from sklearn.metrics import mean_squared_error as mse, roc_auc_score as roc
 
 from fedot.core.chains.chain import Chain
-from fedot.core.chains.chain_tune import Tune
+from fedot.core.chains.chain_tune import Tune, _CachedChainEvaluator
 from fedot.core.chains.node import PrimaryNode, SecondaryNode
 from fedot.core.data.data import InputData, train_test_data_setup
+from fedot.core.models.model import Model
 from fedot.core.repository.tasks import Task, TaskTypesEnum
 from test.unit.utilities.test_chain_import_export import create_four_depth_chain
 
@@ -220,3 +222,54 @@ def test_tune_certain_node_with_tune_class_correctly(data_fixture, request):
     print(f'After tune test {aft_tun_roc_auc}', '\n')
 
     assert aft_tun_roc_auc >= bfr_tun_roc_auc
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_fine_tune_jointly_reuses_upstream_outputs(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    train_data, test_data = train_test_data_setup(data=data)
+
+    # only the root node has the search space
+    chain = Chain(SecondaryNode('logit', nodes_from=[PrimaryNode('lda'), PrimaryNode('bernb')]))
+    chain.fit(train_data, use_cache=False)
+    before_tuning_roc = roc(y_true=test_data.target, y_score=chain.predict(test_data).predict)
+
+    fitted_models = []
+    original_fit = Model.fit
+
+    def fit_with_counter(model, data, **kwargs):
+        fitted_models.append(model.model_type)
+        return original_fit(model, data, **kwargs)
+
+    with patch.object(Model, 'fit', fit_with_counter):
+        tuned_chain = Tune(chain).fine_tune_jointly(train_data, iterations=10,
+                                                    max_lead_time=timedelta(minutes=1))
+    after_tuning_roc = roc(y_true=test_data.target, y_score=tuned_chain.predict(test_data).predict)
+
+    # the primary nodes are fitted once during the tuning and once for the final chain
+    assert fitted_models.count('lda') == 2
+    assert fitted_models.count('logit') > 2
+    assert after_tuning_roc >= before_tuning_roc * 0.95
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_cached_chain_evaluator_evicts_outputs_of_both_stages(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    train_data, validation_data = train_test_data_setup(data=data)
+
+    chain = Chain(SecondaryNode('logit', nodes_from=[PrimaryNode('lda'), PrimaryNode('bernb')]))
+    root = chain.root_node
+
+    # only one node is cached, so the outputs of the root are evicted by the outputs of its parents
+    evaluator = _CachedChainEvaluator(chain, train_data, validation_data, max_cached_outputs=1)
+    losses = []
+    for params in [{'C': 0.01}, {'C': 10.0}, {'C': 0.01}]:
+        root.model.params = params
+        losses.append(evaluator.loss())
+
+    chain._clean_model_cache()
+    root.model.params = {'C': 0.01}
+    expected_loss = _CachedChainEvaluator(chain, train_data, validation_data).loss()
+
+    assert np.isclose(losses[0], expected_loss)
+    assert np.isclose(losses[2], expected_loss)
@@ -1,10 +1,13 @@
+from datetime import timedelta
+from unittest.mock import patch
+
 import numpy as np
 import pytest
 from sklearn.datasets import load_iris
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
 
-from fedot.core.chains.node import PrimaryNode
+from fedot.core.chains.node import PrimaryNode, SecondaryNode
 from fedot.core.data.data import InputData, train_test_data_setup
 from fedot.core.models.model import Model
 from fedot.core.repository.dataset_types import DataTypesEnum
@@ -56,3 +59,20 @@ def test_eval_strategy_logreg(data_setup):
     actual_result = test_model_node.predict(input_data=test)
 
     assert len(actual_result.predict) == len(expected_result)
+
+
+def test_secondary_node_fine_tune_passes_limits_to_model(data_setup):
+    train, _ = train_test_data_setup(data=data_setup)
+    node = SecondaryNode('logit', nodes_from=[PrimaryNode('lda')])
+
+    tuning_limits = []
+    original_fine_tune = Model.fine_tune
+
+    def fine_tune_with_limits(model, data, iterations, max_lead_time=timedelta(minutes=5), **kwargs):
+        tuning_limits.append((model.model_type, iterations, max_lead_time))
+        return original_fine_tune(model, data, iterations=iterations, max_lead_time=max_lead_time, **kwargs)
+
+    with patch.object(Model, 'fine_tune', fine_tune_with_limits):
+        node.fine_tune(input_data=train, recursive=False, iterations=5, max_lead_time=timedelta(seconds=10))
+
+    assert tuning_limits == [('logit', 5, timedelta(seconds=10))]
@@ -9,12 +9,14 @@ from sklearn.metrics import roc_auc_score as roc_auc
 
 from fedot.core.chains.chain import Chain
 from fedot.core.chains.node import PrimaryNode, SecondaryNode
+from fedot.core.composer.chains_store import ChainsStore
 from fedot.core.composer.composer import ComposerRequirements
 from fedot.core.composer.gp_composer.fixed_structure_composer import FixedStructureComposerBuilder
 from fedot.core.composer.gp_composer.gp_composer import GPComposerBuilder, GPComposerRequirements
 from fedot.core.composer.optimisers.gp_optimiser import GPChainOptimiserParameters, GeneticSchemeTypesEnum
 from fedot.core.composer.random_composer import RandomSearchComposer
 from fedot.core.data.data import InputData
+from fedot.core.data.meta_features import dataset_meta_features
 from fedot.core.repository.model_types_repository import ModelTypesRepository
 from fedot.core.repository.quality_metrics_repository import ClassificationMetricsEnum, MetricsRepository
 from fedot.core.repository.tasks import Task, TaskTypesEnum
@@ -208,3 +210,63 @@ def test_parameter_free_composer_build_chain_correct(data_fixture, request):
                                        y_score=predicted_gp_composed.predict)
 
     assert roc_on_valid_gp_composed > 0.6
+
+
+@pytest.mark.parametrize('data_fixture', ['file_data_setup'])
+def test_gp_composer_seeds_population_from_chains_store(data_fixture, request, tmp_path):
+    data = request.getfixturevalue(data_fixture)
+    meta_features = dataset_meta_features(data)
+    store = ChainsStore(db_path=str(tmp_path / 'chains.db'))
+    store.record(meta_features, baseline_chain(), -0.9)
+    # the chain with the models out of the requirements is not used
+    store.record({**meta_features, 'samples_num': 10 * meta_features['samples_num']}, get_class_chain(), -0.95)
+
+    req = GPComposerRequirements(primary=['knn', 'logit'], secondary=['xgboost', 'logit'],
+                                 max_arity=2, max_depth=2, pop_size=4, num_of_generations=1)
+    metric_function = MetricsRepository().metric_by_id(ClassificationMetricsEnum.ROCAUC)
+    gp_composer = GPComposerBuilder(Task(TaskTypesEnum.classification)).with_requirements(req). \
+        with_metrics(metric_function).with_chains_store(store, meta_population_share=0.5).build()
+    gp_composer.compose_chain(data=data)
+
+    assert gp_composer.optimiser.population_seeds == [baseline_chain()]
+    first_population_models = [chain_template.total_chain_models for chain_template in gp_composer.history.chains[0]]
+    assert {'xgboost': 1, 'knn': 1, 'logit': 1} in first_population_models
+    # the best evolved chain is saved for the next compositions
+    best_chain = store.best_chains(meta_features, gp_composer.optimiser.chain_generation_params, chains_num=1)[0]
+    assert best_chain == gp_composer.optimiser.best_individual
+
+
+@pytest.mark.parametrize('data_fixture', ['file_data_setup'])
+def test_gp_composer_warm_start_from_previous_composition(data_fixture, request, tmp_path):
+    data = request.getfixturevalue(data_fixture)
+    metric_function = MetricsRepository().metric_by_id(ClassificationMetricsEnum.ROCAUC)
+
+    def composer():
+        req = GPComposerRequirements(primary=['knn', 'logit'], secondary=['xgboost', 'logit'],
+                                     max_arity=2, max_depth=2, pop_size=4, num_of_generations=1)
+        return GPComposerBuilder(Task(TaskTypesEnum.classification)).with_requirements(req). \
+            with_metrics(metric_function).build()
+
+    previous_composer = composer()
+    previous_composer.compose_chain(data=data)
+    previous_population = [chain.root_node.descriptive_id for chain in previous_composer.optimiser.population]
+
+    warm_composer = composer()
+    warm_composer.compose_chain(data=data, initial_population=previous_composer.history, reuse_fitted_models=True)
+    assert [chain.root_node.descriptive_id for chain in warm_composer.optimiser.population_seeds] == \
+           previous_population
+    previous_models = {id(model_template.fitted_model) for chain_template in previous_composer.history.chains[-1]
+                       for model_template in chain_template.model_templates}
+    assert previous_models & {id(fitted_state.model) for fitted_state in warm_composer.shared_cache.values()}
+
+    chain = baseline_chain()
+    chain.fit(data)
+    chain.save_chain(str(tmp_path / 'chain'))
+    chain_paths = [str(path) for path in tmp_path.glob('**/*.json')]
+    warm_composer = composer()
+    # the fitted models are not reused without the flag
+    warm_chain = warm_composer._warm_start_chains(chain_paths, reuse_fitted_models=False)[0]
+    assert warm_chain.length == chain.length
+    assert not warm_chain.is_all_cache_actual() and not warm_composer.shared_cache
+    warm_composer._warm_start_chains(chain_paths, reuse_fitted_models=True)
+    assert len(warm_composer.shared_cache) == chain.length
@@ -37,11 +37,37 @@ def remove_test_data():
     os.remove('meta_loader_test_data_dir.csv')
 
 
-def test_text_batch_loader():
+def test_text_batch_loader(tmp_path):
     path = 'loader_test_data_dir'
-    test_loader = TextBatchLoader(path)
+    test_loader = TextBatchLoader(path, index_dir=str(tmp_path))
     df = test_loader.extract()
     contents = sorted(df['text'].tolist())
 
     assert df.size == 8
     assert contents[0] == '1_subdir_1_file.txt content'
+
+
+def test_text_batch_loader_by_batches(tmp_path):
+    path = 'loader_test_data_dir'
+    test_loader = TextBatchLoader(path, index_dir=str(tmp_path))
+    batches = list(test_loader.extract_by_batches(batch_size=3))
+    contents = sorted([text for batch in batches for text in batch['text'].tolist()])
+
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert contents[0] == '1_subdir_1_file.txt content'
+
+
+def test_text_batch_loader_index_updated(tmp_path):
+    path = 'loader_test_data_dir'
+    df = TextBatchLoader(path, index_dir=str(tmp_path)).extract(export=False)
+    new_file_path = join(path, 'subdir1', 'new_file.txt')
+    with open(new_file_path, 'w') as file:
+        file.write('new content')
+
+    df_updated = TextBatchLoader(path, index_dir=str(tmp_path)).extract(export=False)
+    os.remove(new_file_path)
+
+    assert len(df_updated) == len(df) + 1
+    assert 'new content' in df_updated['text'].tolist()
+    # the index is saved to the given directory only
+    assert len(os.listdir(str(tmp_path))) == 1
@@ -2,12 +2,13 @@ import math
 import numpy as np
 import pandas as pd
 import pytest
-
+from scipy import sparse
 from sklearn.datasets import load_iris, make_regression
 from sklearn.preprocessing import StandardScaler
 
 from fedot.core.chains.node import PrimaryNode
 from fedot.core.data.data import InputData
+from fedot.core.data.meta_features import dataset_meta_features
 from fedot.core.data.preprocessing import Normalization, TextPreprocessingStrategy, ScalingWithImputation
 from fedot.core.repository.dataset_types import DataTypesEnum
 from fedot.core.repository.tasks import Task, TaskTypesEnum
@@ -89,3 +90,50 @@ def test_text_preprocessing_strategy():
 
     assert isinstance(fit_result, TextPreprocessingStrategy)
     assert apply_result[0] != test_text[0]
+
+
+def test_scaling_with_imputation_keeps_sparse_data():
+    np.random.seed(42)
+    dense_data = np.random.rand(100, 10)
+    dense_data[dense_data < 0.7] = 0
+    sparse_data = sparse.csr_matrix(dense_data)
+
+    for strategy in [ScalingWithImputation, Normalization]:
+        scaled_data = strategy().fit_apply(sparse_data)
+
+        assert sparse.issparse(scaled_data)
+        assert scaled_data.nnz == sparse_data.nnz
+
+
+def test_dataset_meta_features_of_sparse_data():
+    np.random.seed(42)
+    dense_data = np.random.rand(100, 10)
+    dense_data[dense_data < 0.7] = 0
+    target = np.random.randint(0, 2, 100)
+    task = Task(TaskTypesEnum.classification)
+
+    dense_meta_features = dataset_meta_features(InputData(idx=np.arange(100), features=dense_data, target=target,
+                                                          task=task, data_type=DataTypesEnum.table))
+    sparse_meta_features = dataset_meta_features(InputData(idx=np.arange(100), features=sparse.csr_matrix(dense_data),
+                                                           target=target, task=task, data_type=DataTypesEnum.table))
+
+    assert sparse_meta_features == dense_meta_features
+    assert sparse_meta_features['features_num'] == 10
+
+
+def test_text_preprocessing_strategy_by_batches():
+    test_text = [
+        'This is the first document.',
+        'This document is the second document.',
+        'And this is the third one.',
+        'Is this the first document?',
+    ]
+
+    sequential_result = TextPreprocessingStrategy(batch_size=3).apply(test_text)
+    parallel_result = TextPreprocessingStrategy(n_jobs=2, batch_size=1).apply(iter(test_text))
+    batches = list(TextPreprocessingStrategy(batch_size=3).apply_by_batches(test_text))
+
+    assert len(sequential_result) == len(parallel_result) == len(test_text)
+    for sequential_text, parallel_text in zip(sequential_result, parallel_result):
+        assert sorted(sequential_text.split()) == sorted(parallel_text.split())
+    assert [len(batch) for batch in batches] == [3, 1]
@@ -1,8 +1,10 @@
 import numpy as np
 from numpy import nan
 
+from fedot.core.chains.chain import Chain
+from fedot.core.chains.node import PrimaryNode
 from fedot.core.data.data import InputData
-from fedot.core.data.transformation import direct, ts_to_lagged_table
+from fedot.core.data.transformation import TransformationCache, direct, ts_to_lagged_table
 from fedot.core.repository.dataset_types import DataTypesEnum
 from fedot.core.repository.tasks import Task, TaskTypesEnum, TsForecastingParams
 
@@ -115,3 +117,52 @@ def test_direct():
                     [ts_len]).all()
     assert np.equal(transformed_data.target, ts_data.target).all()
     print(transformed_data.features.shape)
+
+
+def test_transformation_cache_reuses_lagged_table():
+    task, _, ts_data, _ = synthetic_forecasting_problem()
+    cache = TransformationCache()
+    cache.clear()
+
+    first_data = cache.transform(ts_to_lagged_table, ts_data)
+    second_data = cache.transform(ts_to_lagged_table, ts_data)
+
+    assert len(cache) == 1
+    assert first_data is not second_data
+    assert np.shares_memory(first_data.features, second_data.features)
+    assert not first_data.features.flags.writeable
+
+    other_task = Task(TaskTypesEnum.ts_forecasting,
+                      TsForecastingParams(forecast_length=forecast_length + 1,
+                                          max_window_size=max_window_size,
+                                          return_all_steps=True))
+    other_data = cache.transform(ts_to_lagged_table,
+                                 InputData(idx=ts_data.idx, features=ts_data.features, target=ts_data.target,
+                                           task=other_task, data_type=ts_data.data_type))
+
+    assert len(cache) == 2
+    assert other_data.target.shape[1] == forecast_length + 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_transformation_cache_shared_between_chains():
+    task = Task(TaskTypesEnum.ts_forecasting,
+                TsForecastingParams(forecast_length=forecast_length,
+                                    max_window_size=max_window_size))
+    ts = np.sin(np.arange(100) / 10)
+    ts_data = InputData(idx=np.arange(len(ts)), features=ts, target=ts,
+                        task=task, data_type=DataTypesEnum.ts)
+    TransformationCache().clear()
+
+    Chain(PrimaryNode('ridge')).fit(ts_data)
+    cached_results_num = len(TransformationCache())
+    Chain(PrimaryNode('lasso')).fit(ts_data)
+
+    # the lagged table of the first chain is reused by the second one
+    assert cached_results_num > 0
+    assert len(TransformationCache()) == cached_results_num
+    # the arrays of the caller are not frozen by the cache
+    assert ts_data.idx.flags.writeable and ts_data.target.flags.writeable
+    TransformationCache().clear()
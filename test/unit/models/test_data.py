@@ -4,6 +4,8 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from fedot.core.chains.chain import Chain
+from fedot.core.chains.node import PrimaryNode, SecondaryNode
 from fedot.core.data.data import InputData, OutputData
 from fedot.core.repository.dataset_types import DataTypesEnum
 from fedot.core.repository.tasks import Task, TaskTypesEnum
@@ -92,3 +94,27 @@ def test_string_features_from_csv():
 
     assert expected_features.dtype == float
     assert np.isfinite(expected_features).all()
+
+
+def test_data_with_precision_keeps_float32_in_chain():
+    task = Task(TaskTypesEnum.classification)
+    features = np.random.rand(100, 5)
+    target = np.array([0, 1] * 50)
+    data = InputData(idx=np.arange(0, 100), features=features, target=target,
+                     task=task, data_type=DataTypesEnum.table).with_precision(np.float32)
+
+    assert data.features.dtype == np.float32
+    assert data.features.nbytes == features.nbytes // 2
+
+    first = PrimaryNode('logit')
+    second = PrimaryNode('lda')
+    final = SecondaryNode('logit', nodes_from=[first, second])
+
+    chain = Chain(final)
+    chain.fit(data)
+    secondary_input = final._input_from_parents(input_data=data, parent_operation='predict')
+    prediction = chain.predict(data)
+
+    assert secondary_input.features.dtype == np.float32
+    assert secondary_input.precision == np.float32
+    assert prediction.predict.dtype == np.float32
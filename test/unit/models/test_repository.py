@@ -44,6 +44,20 @@ def test_search_in_repository_by_tag_correct():
         assert len(model_names) == 0
 
 
+def test_model_info_by_id_with_lazy_strategy_correct():
+    with ModelTypesRepository(mocked_path()) as repo:
+        model_info = repo.model_info_by_id('logit')
+        assert model_info.id == 'logit'
+        assert model_info is repo.model_info_by_id('logit')
+        assert repo.model_info_by_id('non_real_model') is None
+
+        # the strategy class is imported on the first use only
+        assert not isinstance(model_info.supported_strategies, type)
+        strategy = model_info.current_strategy(TaskTypesEnum.classification)
+        assert strategy is SkLearnClassificationStrategy
+        assert model_info.current_strategy(TaskTypesEnum.classification) is strategy
+
+
 def test_eval_field_str():
     model_metadata = _model_metadata_example(mocked_path())
     task_types = eval_field_str(model_metadata['tasks'])
@@ -0,0 +1,148 @@
+from copy import copy
+
+import numpy as np
+import pytest
+from statsmodels.tsa.ar_model import AutoReg
+from statsmodels.tsa.arima.model import ARIMA
+
+from fedot.core.chains.chain import Chain
+from fedot.core.chains.node import PrimaryNode
+from fedot.core.data.data import InputData
+from fedot.core.models.evaluation.stats_models_eval import _arima_params_for_warm_start, fit_arima, predict_ar, \
+    predict_arima
+from fedot.core.repository.dataset_types import DataTypesEnum
+from fedot.core.repository.tasks import Task, TaskTypesEnum, TsForecastingParams
+
+
+def get_ts_data(forecast_length: int, with_exog: bool = False):
+    np.random.seed(42)
+    n_steps = 150
+    time_series = np.cumsum(np.random.randn(n_steps)) * 0.1 + np.sin(np.arange(n_steps) / 5)
+    exog = np.arange(n_steps, dtype=float) if with_exog else time_series
+    task = Task(TaskTypesEnum.ts_forecasting,
+                TsForecastingParams(forecast_length=forecast_length, max_window_size=5))
+
+    train_data = InputData(idx=np.arange(0, 100), features=exog[:100], target=time_series[:100],
+                           task=task, data_type=DataTypesEnum.ts)
+    test_data = InputData(idx=np.arange(100, n_steps), features=exog[100:], target=time_series[100:],
+                          task=task, data_type=DataTypesEnum.ts)
+    return train_data, test_data
+
+
+def predict_stepwise(trained_model, predict_data: InputData, train_len: int):
+    # the prediction with the separate call for each step
+    prediction = []
+    forecast_length = predict_data.task.task_params.forecast_length
+    for pred_step_id in range(len(predict_data.features) + 1):
+        start, end = train_len + pred_step_id, train_len + pred_step_id + forecast_length - 1
+        if trained_model.data.endog is predict_data.target:
+            start, end = pred_step_id, forecast_length + pred_step_id
+        prediction.append(trained_model.predict(start=start, end=end)[-forecast_length:])
+    return np.stack(prediction)
+
+
+def previous_predict_arima(trained_model, predict_data: InputData):
+    # the implementation of predict_arima with the separate call for each step
+    prediction = []
+
+    forecast_length = predict_data.task.task_params.forecast_length
+    prediction_steps = len(predict_data.features) + 1
+    for pred_step_id in range(prediction_steps):
+
+        start, end = trained_model.nobs + pred_step_id, \
+                     trained_model.nobs + pred_step_id + forecast_length - 1
+
+        if trained_model.data.endog is predict_data.target:
+            # if train sample used
+            start, end = 0 + pred_step_id, forecast_length + pred_step_id
+
+        prediction_for_step = trained_model.predict(start=start, end=end)
+        prediction_for_step = prediction_for_step[-forecast_length:]
+        prediction.append(prediction_for_step)
+
+    return np.stack(prediction)
+
+
+@pytest.mark.parametrize('forecast_length', [1, 4])
+def test_arima_prediction_equals_stepwise_prediction(forecast_length):
+    train_data, test_data = get_ts_data(forecast_length)
+    _arima_params_for_warm_start.clear()
+    trained_model = fit_arima(train_data, {'order': (2, 1, 1)})
+
+    for data in [train_data, test_data]:
+        expected = previous_predict_arima(trained_model, data)
+        predicted = predict_arima(trained_model, data)
+
+        assert predicted.shape == (len(data.features) + 1, forecast_length)
+        assert np.allclose(predicted, expected)
+
+
+@pytest.mark.parametrize('forecast_length', [1, 4])
+def test_ar_prediction_equals_stepwise_prediction(forecast_length):
+    train_data, test_data = get_ts_data(forecast_length)
+    trained_model = AutoReg(train_data.target, lags=[1, 2, 6]).fit()
+
+    for data in [train_data, test_data]:
+        expected = predict_stepwise(trained_model, data, len(train_data.target))
+        predicted = predict_ar(trained_model, data)
+
+        # the in-sample predictions are not available for the first max lag steps
+        hold_back = trained_model.model.hold_back
+        assert predicted.shape == expected.shape
+        assert np.allclose(predicted[hold_back:], expected[hold_back:])
+
+
+def test_ar_prediction_with_exog():
+    forecast_length = 3
+    train_data, test_data = get_ts_data(forecast_length, with_exog=True)
+    trained_model = AutoReg(train_data.target, lags=[1, 2], exog=train_data.features).fit()
+
+    predicted = predict_ar(trained_model, test_data)
+
+    assert predicted.shape == (len(test_data.features) + 1, forecast_length)
+    assert not np.isnan(predicted).any()
+
+
+def test_arima_fit_warm_started_from_previous_params():
+    train_data, _ = get_ts_data(forecast_length=1)
+    params = {'order': (2, 0, 1)}
+    _arima_params_for_warm_start.clear()
+
+    first_model = fit_arima(train_data, params)
+    second_model = fit_arima(train_data, params)
+
+    assert second_model.mle_retvals['iterations'] < first_model.mle_retvals['iterations']
+    assert np.allclose(second_model.params, first_model.params, atol=1e-3)
+
+
+def test_arima_fit_warm_started_on_other_window():
+    train_data, _ = get_ts_data(forecast_length=1)
+    params = {'order': (2, 0, 1)}
+    _arima_params_for_warm_start.clear()
+
+    fit_arima(train_data, params)
+    next_window = copy(train_data)
+    next_window.target = train_data.target[5:]
+    warm_model = fit_arima(next_window, params)
+    cold_model = ARIMA(next_window.target, order=(2, 0, 1)).fit()
+
+    assert warm_model.mle_retvals['iterations'] < cold_model.mle_retvals['iterations']
+    assert np.allclose(warm_model.params, cold_model.params, atol=1e-2)
+
+    # the params of the model with other order are not used
+    other_model = fit_arima(next_window, {'order': (1, 0, 0)})
+    assert len(other_model.params) == len(ARIMA(next_window.target, order=(1, 0, 0)).param_names)
+
+
+@pytest.mark.parametrize('model_type', ['ar', 'arima'])
+def test_stats_model_chain_prediction_has_length_of_data(model_type):
+    forecast_length = 3
+    train_data, test_data = get_ts_data(forecast_length, with_exog=True)
+
+    chain = Chain(PrimaryNode(model_type))
+    chain.fit(train_data)
+
+    # the (steps, forecast_length) predictions of AR and ARIMA are converted to the time series of data length
+    for data in [train_data, test_data]:
+        assert chain.predict(data).predict.shape == (len(data.idx),)
+    assert not np.isnan(chain.predict(test_data).predict).any()
@@ -1,8 +1,20 @@
-from fedot.core.data.data import InputData
+import pickle
+from unittest.mock import patch
+
+import numpy as np
+import tensorflow as tf
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from fedot.core.algorithms.time_series.lagged_features import lagged_features_and_target
+from fedot.core.data.data import InputData, OutputData
+from fedot.core.models.evaluation import keras_eval
+from fedot.core.models.evaluation.keras_eval import KerasForecastingStrategy, KerasModelBlob
+from fedot.core.models.evaluation.prediction_session import prediction_session
 from fedot.core.models.evaluation.vectorize import VectorizeStrategy
+from fedot.core.models.model import Model
 from fedot.core.repository.dataset_types import DataTypesEnum
-from fedot.core.repository.tasks import TaskTypesEnum, Task
-from sklearn.feature_extraction.text import TfidfVectorizer
+from fedot.core.repository.tasks import TaskTypesEnum, Task, TsForecastingParams
 
 
 def test_vectorize_tfidf_strategy():
@@ -25,4 +37,83 @@ def test_vectorize_tfidf_strategy():
                                    predict_data=test_data)
 
     assert isinstance(vectorizer_fitted, TfidfVectorizer)
-    assert len(predicted[0]) == 7
+    assert predicted.shape[1] == 7
+
+
+def test_sparse_vectorized_features_passed_to_models():
+    text = ['This document first', 'second This document', 'And one third',
+            'Is document first', 'spam found', 'not spam document']
+    task = Task(TaskTypesEnum.classification)
+    text_data = InputData(idx=np.arange(len(text)), features=text,
+                          target=np.array([0, 0, 1, 0, 1, 1]), data_type=DataTypesEnum.text,
+                          task=task)
+
+    vectorizer = VectorizeStrategy(model_type='tfidf', params=None)
+    vectorized = vectorizer.predict(trained_model=vectorizer.fit(text_data),
+                                    predict_data=text_data)
+    output = OutputData(idx=text_data.idx, features=text_data.features, predict=vectorized,
+                        task=task, data_type=DataTypesEnum.table)
+    data = InputData.from_predictions(outputs=[output], target=text_data.target)
+
+    assert sparse.issparse(data.features)
+
+    # lda does not support sparse features, so they are converted to dense
+    for model_type in ['logit', 'lda']:
+        _, prediction = Model(model_type=model_type).fit(data)
+        assert len(prediction) == len(text)
+
+
+def get_lagged_ts_data(forecast_length: int = 5, window_len: int = 5):
+    task = Task(TaskTypesEnum.ts_forecasting,
+                TsForecastingParams(forecast_length=forecast_length, max_window_size=window_len,
+                                    return_all_steps=True))
+    series = np.sin(np.arange(60) / 5)
+    features, target = lagged_features_and_target(series, window_len, forecast_length)
+    return InputData(idx=np.arange(len(features)), features=features[window_len:-forecast_length],
+                     target=target[window_len:-forecast_length], task=task, data_type=DataTypesEnum.ts)
+
+
+def test_keras_forecasting_strategy_fit_with_params():
+    # the network predicts the sequence of the window length
+    data = get_lagged_ts_data(forecast_length=5, window_len=5)
+
+    strategy = KerasForecastingStrategy(model_type='lstm',
+                                        params={'epochs': 1, 'batch_size': 8, 'early_stopping': False})
+    fitted_model = strategy.fit(data)
+    predicted = strategy.predict(fitted_model, data)
+
+    assert isinstance(fitted_model, KerasModelBlob)
+    assert predicted.shape == (len(data.features), 5)
+    # the restored network gives the same prediction
+    assert np.allclose(strategy.predict(pickle.loads(pickle.dumps(fitted_model)), data), predicted)
+
+
+def test_keras_model_blob_restored_once_in_prediction_session():
+    data = get_lagged_ts_data(forecast_length=5, window_len=5)
+
+    strategy = KerasForecastingStrategy(model_type='lstm', params={'epochs': 1, 'early_stopping': False})
+    fitted_model = strategy.fit(data)
+
+    with patch.object(tf.keras.Model, 'from_config', wraps=tf.keras.Model.from_config) as restoring:
+        with prediction_session():
+            first_prediction = strategy.predict(fitted_model, data)
+            second_prediction = strategy.predict(fitted_model, data)
+        assert restoring.call_count == 1
+        # the restored networks are released with the Keras session at the end of the prediction session
+        assert len(keras_eval._restored_models) == 0
+        strategy.predict(fitted_model, data)
+        assert restoring.call_count == 2
+
+    assert np.allclose(first_prediction, second_prediction)
+    assert len(keras_eval._restored_models) == 0
+
+
+def test_keras_forecasting_strategy_fit_in_subprocess():
+    data = get_lagged_ts_data()
+
+    strategy = KerasForecastingStrategy(model_type='lstm',
+                                        params={'epochs': 1, 'fit_in_subprocess': True})
+    fitted_model = strategy.fit(data)
+
+    assert isinstance(fitted_model, KerasModelBlob)
+    assert strategy.predict(fitted_model, data).shape == (len(data.features), 5)
@@ -1,15 +1,24 @@
 import os
+import time
 from datetime import timedelta
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 from sklearn.metrics import mean_squared_error as mse, roc_auc_score as roc_auc
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
 
 from cases.data.data_utils import get_scoring_case_data_paths
+from fedot.core.chains.chain import Chain
+from fedot.core.chains.node import PrimaryNode
 from fedot.core.data.data import InputData, train_test_data_setup
+from fedot.core.data.meta_features import dataset_meta_features
 from fedot.core.models.model import Model
 from fedot.core.data.preprocessing import ScalingWithImputation
-from fedot.core.models.tuning.tuners import get_random_params
+from fedot.core.models.tuning.tuner_adapter import HyperoptAdapter
+from fedot.core.models.tuning.tuners import (ForecastingCustomRandomTuner, SklearnCustomRandomTuner,
+                                             SklearnHyperbandTuner, TPETuner, Tuner, get_random_params)
+from fedot.core.models.tuning.tuning_store import TuningStore
 from fedot.core.repository.tasks import Task, TaskTypesEnum
 from test.unit.tasks.test_forecasting import get_synthetic_ts_data_period
 
@@ -197,3 +206,214 @@ def test_pca_manual_tuning_correct(data_fixture, request):
     test_predicted_tuned = pca_for_tune.predict(fitted_model=model, data=test_data)
 
     assert not np.array_equal(test_predicted, test_predicted_tuned)
+
+
+def test_forecasting_tuner_does_not_refit_repeated_candidates():
+    data, _ = get_synthetic_ts_data_period()
+    fitted_params = []
+
+    def fit(train_data, params):
+        fitted_params.append(params)
+        return params['shift'][0]
+
+    def predict(trained_model, predict_data):
+        return predict_data.target + trained_model
+
+    best_params = ForecastingCustomRandomTuner().tune(fit=fit, predict=predict, tune_data=data,
+                                                      params_range={'shift': ((0,), (1,))},
+                                                      default_params={'shift': (2,)},
+                                                      iterations=20)
+
+    assert best_params == {'shift': (0,)}
+    assert len(fitted_params) == 3
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_parallel_custom_random_tuner_correct(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    data.features = ScalingWithImputation().fit(data.features).apply(data.features)
+    params_range = {'n_neighbors': np.arange(1, 30)}
+
+    model = KNeighborsClassifier().fit(data.features, data.target)
+    tuner = SklearnCustomRandomTuner(trained_model=model, tune_data=data, params_range=params_range,
+                                     cross_val_fold_num=3, time_limit=timedelta(minutes=1),
+                                     iterations=6, n_jobs=2)
+    best_params, best_model = tuner.tune()
+
+    assert best_model.get_params()['n_neighbors'] == (best_params.get('n_neighbors') or model.n_neighbors)
+    # the score of the same default model is not recomputed
+    Tuner._default_scores.clear()
+    with patch.object(Tuner, 'get_cross_val_score_and_params',
+                      wraps=tuner.get_cross_val_score_and_params) as default_scoring:
+        for _ in range(2):
+            SklearnCustomRandomTuner(trained_model=model, tune_data=data, params_range=params_range,
+                                     cross_val_fold_num=3, time_limit=timedelta(minutes=1), iterations=1)
+    assert default_scoring.call_count == 1
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_parallel_cross_val_scores_skip_failed_candidates(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    data.features = ScalingWithImputation().fit(data.features).apply(data.features)
+
+    model = KNeighborsClassifier().fit(data.features, data.target)
+    tuner = SklearnCustomRandomTuner(trained_model=model, tune_data=data, params_range={'n_neighbors': [5]},
+                                     cross_val_fold_num=3, time_limit=timedelta(minutes=1),
+                                     iterations=2, n_jobs=2)
+    # the fit with the negative number of neighbours fails
+    candidates = [{'n_neighbors': -1}, {'n_neighbors': 5}]
+    parallel_scores = tuner._parallel_cross_val_scores(candidates)
+    sequential_scores = tuner._cross_val_scores(candidates)
+
+    assert np.isnan(parallel_scores[0]) and np.isnan(sequential_scores[0])
+    assert np.isclose(parallel_scores[1], sequential_scores[1])
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_chain_fine_tune_evaluates_candidates_in_parallel(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    data.features = ScalingWithImputation().fit(data.features).apply(data.features)
+
+    processes_num = []
+    original_parallel_scores = SklearnCustomRandomTuner._parallel_cross_val_scores
+
+    def parallel_scores_with_counter(tuner, candidates):
+        processes_num.append(tuner.n_jobs)
+        return original_parallel_scores(tuner, candidates)
+
+    with patch.object(SklearnCustomRandomTuner, '_parallel_cross_val_scores', parallel_scores_with_counter):
+        Chain(PrimaryNode('knn')).fine_tune_all_nodes(input_data=data, iterations=4,
+                                                       max_lead_time=timedelta(minutes=0.5), n_jobs=2)
+
+    assert processes_num == [2]
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_chain_fine_tune_with_hyperband_tuner_correct(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    data.features = ScalingWithImputation().fit(data.features).apply(data.features)
+    train_data, test_data = train_test_data_setup(data=data)
+
+    chain = Chain(PrimaryNode('knn'))
+    with patch.object(SklearnHyperbandTuner, '_successive_halving', autospec=True,
+                      side_effect=SklearnHyperbandTuner._successive_halving) as successive_halving:
+        chain.fine_tune_all_nodes(input_data=train_data, iterations=5,
+                                  max_lead_time=timedelta(minutes=0.5),
+                                  tuner_type=SklearnHyperbandTuner)
+
+    assert successive_halving.called
+    assert roc_auc(y_true=test_data.target, y_score=chain.predict(test_data).predict) > 0.6
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_parallel_tpe_tuner_correct(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    data.features = ScalingWithImputation().fit(data.features).apply(data.features)
+
+    model = KNeighborsClassifier().fit(data.features, data.target)
+    tuner = TPETuner(trained_model=model, tune_data=data, params_range={'n_neighbors': list(range(1, 30))},
+                     cross_val_fold_num=5, time_limit=timedelta(minutes=1), iterations=6, n_jobs=2)
+    adapter = HyperoptAdapter(tuner, n_jobs=2)
+    best_params, _ = adapter.tune(iterations=6, timeout_sec=60)
+
+    assert best_params['n_neighbors'] in range(1, 30)
+    assert adapter.evaluation_time > 0
+    assert tuner.tune()[0] is not None
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_parallel_tpe_tuner_skips_failed_trials(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    data.features = ScalingWithImputation().fit(data.features).apply(data.features)
+
+    model = KNeighborsClassifier().fit(data.features, data.target)
+    # the fit with the negative number of neighbours fails
+    tuner = TPETuner(trained_model=model, tune_data=data, params_range={'n_neighbors': [-1, 5]},
+                     cross_val_fold_num=3, time_limit=timedelta(minutes=1), iterations=4, n_jobs=2)
+    best_params, _ = HyperoptAdapter(tuner, n_jobs=2).tune(iterations=4, timeout_sec=60)
+    assert best_params == {'n_neighbors': 5}
+
+    with patch.object(HyperoptAdapter, '_parallel_tune', return_value={}) as parallel_tune:
+        Chain(PrimaryNode('knn')).fine_tune_all_nodes(input_data=data, iterations=2,
+                                                       max_lead_time=timedelta(minutes=0.5),
+                                                       tuner_type=TPETuner, n_jobs=2)
+    assert parallel_tune.called
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_tuners_seeded_from_tuning_store(data_fixture, request, tmp_path):
+    data = request.getfixturevalue(data_fixture)
+    data.features = ScalingWithImputation().fit(data.features).apply(data.features)
+    meta_features = dataset_meta_features(data)
+    other_meta_features = {**meta_features, 'samples_num': 100 * meta_features['samples_num']}
+
+    store = TuningStore(db_path=str(tmp_path / 'tuning.db'))
+    store.record('knn', meta_features, {'n_neighbors': np.int64(7), 'weights': 'distance'}, 0.9, 1.0)
+    store.record('knn', meta_features, {'n_neighbors': 2, 'weights': 'uniform'}, 0.5, 1.0)
+    store.record('knn', other_meta_features, {'n_neighbors': 3, 'weights': 'uniform'}, 0.99, 1.0)
+
+    assert store.best_params('knn', meta_features) == [{'n_neighbors': 7, 'weights': 'distance'},
+                                                       {'n_neighbors': 3, 'weights': 'uniform'}]
+    assert store.best_params('knn', meta_features, datasets_num=1) == [{'n_neighbors': 7, 'weights': 'distance'}]
+
+    model = KNeighborsClassifier().fit(data.features, data.target)
+    tuner_params = dict(trained_model=model, tune_data=data, params_range={'n_neighbors': list(range(1, 30))},
+                        cross_val_fold_num=3, time_limit=timedelta(minutes=1), iterations=1,
+                        model_type='knn', tuning_store=store)
+
+    # the only iteration is spent on the params from the most similar dataset
+    adapter = HyperoptAdapter(TPETuner(**tuner_params), seed_params=[{'n_neighbors': 7}])
+    assert adapter.tune(iterations=1)[0] == {'n_neighbors': 7}
+
+    random_tuner = SklearnCustomRandomTuner(**tuner_params)
+    with patch.object(random_tuner, 'get_cross_val_score_and_params',
+                      wraps=random_tuner.get_cross_val_score_and_params) as scoring:
+        random_tuner.tune()
+    assert scoring.call_args[0][0].n_neighbors == 7
+    assert len(store.best_params('knn', meta_features, datasets_num=10)) == 2
+
+    fitted_params = []
+
+    def fit(train_data, params):
+        fitted_params.append(params)
+        return 0
+
+    ForecastingCustomRandomTuner(model_type='knn', tuning_store=store).tune(
+        fit=fit, predict=lambda trained_model, predict_data: predict_data.target,
+        tune_data=data, params_range={'n_neighbors': ((1,), (30,))}, default_params={'n_neighbors': 5},
+        iterations=1)
+    assert fitted_params == [{'n_neighbors': 5}, {'n_neighbors': 7}]
+
+
+@pytest.mark.parametrize('data_fixture', ['classification_dataset'])
+def test_chain_fine_tune_uses_tuning_store_if_passed(data_fixture, request, tmp_path):
+    data = request.getfixturevalue(data_fixture)
+    data.features = ScalingWithImputation().fit(data.features).apply(data.features)
+
+    with patch.object(TuningStore, '_connect') as connect:
+        Chain(PrimaryNode('knn')).fine_tune_all_nodes(input_data=data, iterations=2,
+                                                       max_lead_time=timedelta(minutes=0.5))
+    # the tuning history is not used by default
+    assert not connect.called
+
+    store = TuningStore(db_path=str(tmp_path / 'tuning.db'))
+    Chain(PrimaryNode('knn')).fine_tune_all_nodes(input_data=data, iterations=2,
+                                                   max_lead_time=timedelta(minutes=0.5), tuning_store=store)
+    assert len(store.best_params('knn', dataset_meta_features(data))) == 1
+
+
+@pytest.mark.parametrize('data_fixture', ['regression_dataset'])
+def test_hyperband_tuner_terminates_on_small_data(data_fixture, request):
+    data = request.getfixturevalue(data_fixture)
+    small_data = data.subset(0, 8)
+    small_data.features = ScalingWithImputation().fit(small_data.features).apply(small_data.features)
+
+    model = KNeighborsRegressor(n_neighbors=2).fit(small_data.features, small_data.target)
+    tuner = SklearnHyperbandTuner(trained_model=model, tune_data=small_data,
+                                  params_range={'n_neighbors': [1, 2, 3]}, cross_val_fold_num=5,
+                                  time_limit=timedelta(seconds=5), iterations=3)
+    start_time = time.perf_counter()
+    best_params, _ = tuner.tune()
+
+    assert best_params['n_neighbors'] in [1, 2, 3]
+    assert time.perf_counter() - start_time < 30
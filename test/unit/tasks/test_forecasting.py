@@ -1,4 +1,6 @@
+from copy import copy
 from random import seed
+from unittest.mock import patch
 
 import numpy as np
 import pytest
@@ -290,3 +292,103 @@ def test_exception_if_incorrect_forecast_length():
     with pytest.raises(ValueError) as exc:
         _, _ = get_synthetic_ts_data_period(forecast_length=0, max_window_size=10)
     assert str(exc.value) == f'Forecast length should be more then 0'
+
+
+def test_ts_chain_batch_forecast_equals_single_forecasts():
+    panel = np.asarray([generate_synthetic_data(100) + shift for shift in range(5)])
+    len_forecast = 3
+
+    task = Task(TaskTypesEnum.ts_forecasting,
+                TsForecastingParams(forecast_length=len_forecast,
+                                    max_window_size=4,
+                                    return_all_steps=True))
+
+    train_data = InputData(idx=np.arange(0, panel.shape[1]),
+                           features=None,
+                           target=panel[0],
+                           task=task,
+                           data_type=DataTypesEnum.ts)
+
+    chain = TsForecastingChain(get_composite_chain(model_first='ridge', model_second='lasso').root_node)
+    chain.fit_from_scratch(train_data)
+
+    test_data = InputData(idx=np.arange(0, 10),
+                          features=None,
+                          target=None,
+                          task=task,
+                          data_type=DataTypesEnum.ts)
+
+    batch_prediction = chain.forecast_batch(initial_panel=panel, supplementary_data=test_data).predict
+
+    assert batch_prediction.shape == (panel.shape[0], len(test_data.idx))
+    for series, series_prediction in zip(panel, batch_prediction):
+        series_data = InputData(idx=np.arange(0, len(series)), features=None, target=series,
+                                task=task, data_type=DataTypesEnum.ts)
+        single_prediction = chain.forecast(initial_data=series_data, supplementary_data=test_data).predict
+        assert np.allclose(series_prediction, single_prediction)
+
+
+def previous_forecast(chain: Chain, initial_data: InputData, supplementary_data: InputData):
+    # the implementation of TsForecastingChain.forecast with the history appended for each step
+    supplementary_data.task.task_params.make_future_prediction = True
+    initial_data.task.task_params.make_future_prediction = True
+    forecast_length = supplementary_data.task.task_params.forecast_length
+    with_exog = supplementary_data.features is not None
+    window_len = initial_data.task.task_params.max_window_size
+    data_for_forecast = initial_data.subset(start=len(initial_data.idx) - window_len, end=len(initial_data.idx))
+
+    full_prediction, idx_for_steps = [], []
+    for forecast_step in range(int(np.ceil(len(supplementary_data.idx) / forecast_length))):
+        idx_for_steps.append(data_for_forecast.idx)
+        stepwise_prediction = chain.predict(data_for_forecast).predict
+        if len(stepwise_prediction.shape) > 1:
+            stepwise_prediction = stepwise_prediction[-1, :-forecast_length]
+        else:
+            stepwise_prediction = list(stepwise_prediction[-forecast_length:])
+        full_prediction.extend(stepwise_prediction)
+
+        if with_exog:
+            new_exog_values = supplementary_data.features[forecast_step * forecast_length:
+                                                          (forecast_step + 1) * forecast_length]
+            new_features = np.concatenate((data_for_forecast.features, new_exog_values))
+            data_for_forecast.target = np.append(data_for_forecast.target,
+                                                 stepwise_prediction)[:len(new_features)]
+            data_for_forecast.features = new_features
+        else:
+            data_for_forecast.target = np.append(data_for_forecast.target, stepwise_prediction)
+            data_for_forecast.features = data_for_forecast.target
+        data_for_forecast.idx = np.append(data_for_forecast.idx,
+                                          data_for_forecast.idx[-1] + np.arange(1, forecast_length + 1))
+
+    return np.asarray(full_prediction[:len(supplementary_data.idx)]), idx_for_steps
+
+
+@pytest.mark.parametrize('with_exog', [False, True])
+def test_ts_chain_forecast_equals_previous_forecast(with_exog):
+    forecast_length, window_len = 2, 3
+    train_data, test_data = get_synthetic_ts_data_period(forecast_length=forecast_length,
+                                                         max_window_size=window_len)
+    if not with_exog:
+        train_data.features, test_data.features = train_data.target, test_data.target
+
+    chain = TsForecastingChain(PrimaryNode('linear'))
+    chain.fit(train_data)
+
+    supplementary_data = InputData(idx=test_data.idx[:11], features=test_data.features[:11] if with_exog else None,
+                                   target=None, task=test_data.task, data_type=DataTypesEnum.ts)
+    expected, expected_idx = previous_forecast(chain, copy(train_data), supplementary_data)
+
+    predicted_idx = []
+    original_predict = chain.predict
+
+    def predict_with_idx(data, **kwargs):
+        predicted_idx.append(np.array(data.idx))
+        return original_predict(data, **kwargs)
+
+    with patch.object(chain, 'predict', predict_with_idx):
+        predicted = chain.forecast(initial_data=copy(train_data), supplementary_data=supplementary_data).predict
+
+    assert np.allclose(predicted, expected)
+    # the idx of history continues the idx of the initial data
+    for step_idx, expected_step_idx in zip(predicted_idx, expected_idx):
+        assert np.array_equal(step_idx, expected_step_idx[-len(step_idx):])
@@ -4,7 +4,7 @@ from sklearn.metrics import mean_squared_error
 from examples.time_series_gapfilling_example import get_array_with_gaps
 from fedot.core.chains.node import PrimaryNode
 from fedot.core.chains.ts_chain import TsForecastingChain
-from fedot.utilities.ts_gapfilling import ModelGapFiller
+from fedot.utilities.ts_gapfilling import ModelGapFiller, SimpleGapFiller
 
 
 def test_get_array_with_gaps():
@@ -59,3 +59,97 @@ def test_gapfilling_forward_ridge_correct():
 
     # The RMSE must be less than the standard deviation of random noise * 2.0
     assert rmse_test < 0.2
+
+
+def test_gapfilling_parallel_ridge_correct():
+    arr_with_gaps, real_values = get_array_with_gaps()
+
+    id_gaps = np.ravel(np.argwhere(arr_with_gaps == -100.0))
+
+    ridge_chain = TsForecastingChain(PrimaryNode('ridge'))
+    gapfiller = ModelGapFiller(gap_value=-100.0, chain=ridge_chain,
+                               max_window_size=150, n_jobs=2)
+    without_gap = gapfiller.forward_inverse_filling(arr_with_gaps)
+
+    rmse_test = mean_squared_error(real_values[id_gaps], without_gap[id_gaps], squared=False)
+
+    assert rmse_test < 0.15
+    # the time is reported for each gap
+    assert len(gapfiller.gaps_time) == len(gapfiller._parse_gap_ids(id_gaps))
+
+
+
+def test_gapfilling_parallel_forward_ridge_correct():
+    arr_with_gaps, real_values = get_array_with_gaps()
+
+    id_gaps = np.ravel(np.argwhere(arr_with_gaps == -100.0))
+
+    ridge_chain = TsForecastingChain(PrimaryNode('ridge'))
+    gapfiller = ModelGapFiller(gap_value=-100.0, chain=ridge_chain,
+                               max_window_size=150, n_jobs=2)
+    without_gap = gapfiller.forward_filling(arr_with_gaps)
+
+    rmse_test = mean_squared_error(real_values[id_gaps], without_gap[id_gaps], squared=False)
+
+    # the same bound as for the sequential forward filling
+    assert rmse_test < 0.2
+
+def test_local_poly_approximation_equals_polyfit_on_nearest_known():
+    arr_with_gaps = np.sin(np.arange(300) / 10)
+    arr_with_gaps[[5, 6, 100, 101, 102, 250, 299]] = -100.0
+    degree, n_neighbors = 2, 6
+
+    without_gap = SimpleGapFiller(gap_value=-100.0).local_poly_approximation(arr_with_gaps, degree, n_neighbors)
+
+    i_known = np.ravel(np.argwhere(arr_with_gaps != -100.0))
+    for gap_index in np.ravel(np.argwhere(arr_with_gaps == -100.0)):
+        nearest = i_known[np.argsort(np.abs(i_known - gap_index), kind='stable')[:n_neighbors]]
+        expected = np.polyval(np.polyfit(nearest, arr_with_gaps[nearest], degree), gap_index)
+        assert np.isclose(without_gap[gap_index], expected)
+
+
+
+def test_batch_poly_approximation_equals_polyfit_on_nearest_known_to_center():
+    arr_with_gaps = np.sin(np.arange(300) / 10)
+    gap_intervals = [[5, 6], [100, 101, 102], [250, 251, 252], [297, 298, 299]]
+    for gap in gap_intervals:
+        arr_with_gaps[gap] = -100.0
+    degree, n_neighbors = 3, 10
+
+    without_gap = SimpleGapFiller(gap_value=-100.0).batch_poly_approximation(arr_with_gaps, degree, n_neighbors)
+
+    # the polynomials are fitted on the originally known elements only
+    i_known = np.ravel(np.argwhere(arr_with_gaps != -100.0))
+    for gap in gap_intervals:
+        center_index = int((gap[0] + gap[-1]) / 2)
+        nearest = i_known[np.argsort(np.abs(i_known - center_index), kind='stable')[:n_neighbors]]
+        expected = np.polyval(np.polyfit(nearest, arr_with_gaps[nearest], degree), gap)
+        assert np.allclose(without_gap[gap], expected)
+
+def test_gapfilling_parallel_fills_closely_spaced_gaps():
+    arr_with_gaps = np.sin(np.arange(600) / 10)
+    # the known part between the gaps is shorter than the window
+    arr_with_gaps[[300, 301, 302, 320, 321, 322]] = -100.0
+
+    ridge_chain = TsForecastingChain(PrimaryNode('ridge'))
+    gapfiller = ModelGapFiller(gap_value=-100.0, chain=ridge_chain,
+                               max_window_size=50, n_jobs=2)
+    without_gap = gapfiller.forward_filling(arr_with_gaps)
+
+    assert not np.any(without_gap == -100.0)
+    assert len(gapfiller.gaps_time) == 2
+
+
+def test_gapfilling_fitted_chain_is_not_reused_for_other_series():
+    first_arr_with_gaps, _ = get_array_with_gaps()
+    second_arr_with_gaps = first_arr_with_gaps * 2
+    second_arr_with_gaps[first_arr_with_gaps == -100.0] = -100.0
+
+    gapfiller = ModelGapFiller(gap_value=-100.0, chain=TsForecastingChain(PrimaryNode('ridge')),
+                               max_window_size=150, refit_threshold=1.0)
+    gapfiller.forward_filling(first_arr_with_gaps)
+    without_gap = gapfiller.forward_filling(second_arr_with_gaps)
+
+    fresh_gapfiller = ModelGapFiller(gap_value=-100.0, chain=TsForecastingChain(PrimaryNode('ridge')),
+                                     max_window_size=150, refit_threshold=1.0)
+    assert np.allclose(without_gap, fresh_gapfiller.forward_filling(second_arr_with_gaps))